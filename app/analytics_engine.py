@@ -3,37 +3,72 @@
 from datetime import datetime, timedelta, date
 from typing import List, Dict, Tuple, Optional
 from decimal import Decimal
-from collections import defaultdict
+import os
 import numpy as np
+from forecast_cache import forecast_cache, series_fingerprint
+from analytics_pool import analytics_pool
 
-# Try to import sklearn - use advanced ML if available
-try:
-    from sklearn.linear_model import LinearRegression
-    from sklearn.preprocessing import PolynomialFeatures
-    from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
-    print("⚠️ Warning: scikit-learn not installed. Using basic linear regression.")
-    print("   Install with: pip install scikit-learn")
+# Regression backend: NumPy least squares by default. scikit-learn is only
+# imported when ANALYTICS_BACKEND=sklearn is set.
+ANALYTICS_BACKEND = os.getenv("ANALYTICS_BACKEND", "numpy").lower()
+SKLEARN_AVAILABLE = False
+if ANALYTICS_BACKEND == "sklearn":
+    try:
+        from sklearn.linear_model import LinearRegression
+        from sklearn.preprocessing import PolynomialFeatures
+        from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+        SKLEARN_AVAILABLE = True
+    except ImportError:
+        ANALYTICS_BACKEND = "numpy"
+        print("⚠️ Warning: ANALYTICS_BACKEND=sklearn but scikit-learn is not installed. Using NumPy.")
+        print("   Install with: pip install scikit-learn")
+
+# Shorter series are fitted with a straight line; a quadratic through a
+# handful of points blows up when extrapolated weeks ahead
+POLYNOMIAL_MIN_POINTS = 14
 
 
 class AnalyticsEngine:
     """Advanced Machine Learning and Statistical Analysis Engine"""
     
+    @staticmethod
+    def moving_average_batch(values, window: int = 7) -> np.ndarray:
+        """
+        Simple moving average along the last axis, one series per row.
+        The first window-1 points keep their raw value.
+        """
+        values = np.asarray(values, dtype=float)
+        result = values.copy()
+        if values.shape[-1] < window:
+            return result
+        
+        csum = np.cumsum(values, axis=-1)
+        window_sums = csum[..., window - 1:].copy()
+        window_sums[..., 1:] -= csum[..., :-window]
+        result[..., window - 1:] = window_sums / window
+        return result
+    
     @staticmethod
     def calculate_moving_average(data: List[float], window: int = 7) -> List[float]:
         """Calculate simple moving average"""
         if len(data) < window:
             return data
-        
-        result = []
-        for i in range(len(data)):
-            if i < window - 1:
-                result.append(data[i])
-            else:
-                avg = sum(data[i-window+1:i+1]) / window
-                result.append(avg)
+        return AnalyticsEngine.moving_average_batch(data, window).tolist()
+    
+    @staticmethod
+    def exponential_moving_average_batch(values, alpha: float = 0.3) -> np.ndarray:
+        """
+        Exponential moving average along the last axis, one series per row.
+        The recurrence steps through time but updates every series at once.
+        """
+        values = np.asarray(values, dtype=float)
+        result = np.empty_like(values)
+        if values.shape[-1] == 0:
+            return result
+        
+        result[..., 0] = values[..., 0]
+        for t in range(1, values.shape[-1]):
+            result[..., t] = alpha * values[..., t] + (1 - alpha) * result[..., t - 1]
         return result
     
     @staticmethod
@@ -44,11 +79,71 @@ class AnalyticsEngine:
         """
         if not data:
             return []
+        return AnalyticsEngine.exponential_moving_average_batch(data, alpha).tolist()
+    
+    @staticmethod
+    def regression_metrics(y: np.ndarray, y_pred: np.ndarray) -> Tuple[float, float, float]:
+        """R², MAE and RMSE of a fit, with sklearn's conventions for constant y"""
+        residuals = y - y_pred
+        ss_res = float(residuals @ residuals)
+        ss_tot = float(((y - y.mean()) ** 2).sum())
+        # lstsq leaves rounding noise on an exact fit; scale the tolerance to y
+        tolerance = 1e-10 * max(1.0, float(y @ y))
+        if ss_tot <= tolerance:
+            r_squared = 1.0 if ss_res <= tolerance else 0.0
+        else:
+            r_squared = 1 - ss_res / ss_tot
+        mae = float(np.abs(residuals).mean())
+        rmse = float(np.sqrt(ss_res / len(y)))
+        return r_squared, mae, rmse
+    
+    @staticmethod
+    def linear_regression_forecast_numpy(x: np.ndarray, y: np.ndarray,
+                                         future_periods: int,
+                                         use_polynomial: bool = False,
+                                         degree: int = 2) -> Dict:
+        """
+        Linear or polynomial least-squares fit with NumPy.
+        Same return shape as linear_regression_forecast_sklearn.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) < 2:
+            return {
+                "predictions": [y[-1]] * future_periods if len(y) > 0 else [0] * future_periods,
+                "r_squared": 0.0,
+                "mae": 0.0,
+                "rmse": 0.0,
+                "model_type": "insufficient_data"
+            }
+        
+        fit_degree = degree if use_polynomial and degree > 1 else 1
+        design = np.vander(x, fit_degree + 1, increasing=True)
+        coefficients, *_ = np.linalg.lstsq(design, y, rcond=None)
         
-        ema = [data[0]]
-        for value in data[1:]:
-            ema.append(alpha * value + (1 - alpha) * ema[-1])
-        return ema
+        y_pred = design @ coefficients
+        future_x = np.arange(len(x), len(x) + future_periods, dtype=float)
+        predictions = np.maximum(np.vander(future_x, fit_degree + 1, increasing=True) @ coefficients, 0)
+        
+        r_squared, mae, rmse = AnalyticsEngine.regression_metrics(y, y_pred)
+        
+        if fit_degree > 1:
+            model_type = f"polynomial_degree_{degree}"
+            # PolynomialFeatures' bias column always gets a zero weight in sklearn
+            coef = [0.0] + coefficients[1:].tolist()
+        else:
+            model_type = "linear"
+            coef = coefficients[1:].tolist()
+        
+        return {
+            "predictions": predictions.tolist(),
+            "r_squared": r_squared,
+            "mae": mae,
+            "rmse": rmse,
+            "model_type": model_type,
+            "coefficients": coef,
+            "intercept": float(coefficients[0])
+        }
     
     @staticmethod
     def linear_regression_forecast_sklearn(x: np.ndarray, y: np.ndarray, 
@@ -56,7 +151,7 @@ class AnalyticsEngine:
                                           use_polynomial: bool = False,
                                           degree: int = 2) -> Dict:
         """
-        Advanced linear regression using scikit-learn
+        Advanced linear regression using scikit-learn (ANALYTICS_BACKEND=sklearn)
         Returns: dict with predictions, r_squared, mae, rmse, and model info
         """
         if len(x) < 2:
@@ -121,86 +216,86 @@ class AnalyticsEngine:
         }
     
     @staticmethod
-    def linear_regression_forecast_basic(x: List[float], y: List[float], 
-                                        future_periods: int) -> Tuple[List[float], float]:
+    def linear_regression_forecast(x: List[float], y: List[float], 
+                                   future_periods: int,
+                                   use_polynomial: bool = False) -> Dict:
         """
-        Fallback: Basic linear regression (when sklearn not available)
-        Returns: (predictions, r_squared)
+        Dispatch to the configured backend (NumPy unless ANALYTICS_BACKEND=sklearn)
         """
-        n = len(x)
-        if n < 2:
-            return [y[-1]] * future_periods if y else [0] * future_periods, 0.0
-        
-        # Calculate slope and intercept
-        x_mean = sum(x) / n
-        y_mean = sum(y) / n
-        
-        numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-        denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-        
-        if denominator == 0:
-            return [y_mean] * future_periods, 0.0
+        using_sklearn = ANALYTICS_BACKEND == "sklearn"
+        fit = (
+            AnalyticsEngine.linear_regression_forecast_sklearn if using_sklearn
+            else AnalyticsEngine.linear_regression_forecast_numpy
+        )
+        result = fit(np.asarray(x, dtype=float), np.asarray(y, dtype=float), future_periods,
+                     use_polynomial=use_polynomial, degree=2)
         
-        slope = numerator / denominator
-        intercept = y_mean - slope * x_mean
+        return {
+            "predictions": result["predictions"],
+            "r_squared": result["r_squared"],
+            "mae": result.get("mae", 0),
+            "rmse": result.get("rmse", 0),
+            "model_type": result.get("model_type", "linear"),
+            "using_sklearn": using_sklearn
+        }
+    
+    @staticmethod
+    def polynomial_forecast_batch(values, future_periods: int, degree: int = 2) -> Dict[str, np.ndarray]:
+        """
+        Fit every row of a (series, days) array against x = 0..n-1 with a single
+        least-squares solve over the shared polynomial design matrix.
+        Returns predictions of shape (series, future_periods), clipped at zero,
+        and r_squared per row.
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        n = values.shape[-1]
+        design = np.vander(np.arange(n + future_periods, dtype=float), degree + 1, increasing=True)
         
-        # Calculate R-squared
-        y_pred = [slope * x[i] + intercept for i in range(n)]
-        ss_res = sum((y[i] - y_pred[i]) ** 2 for i in range(n))
-        ss_tot = sum((y[i] - y_mean) ** 2 for i in range(n))
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+        coefficients, *_ = np.linalg.lstsq(design[:n], values.T, rcond=None)
+        fitted = (design[:n] @ coefficients).T
+        predictions = np.maximum((design[n:] @ coefficients).T, 0)
         
-        # Generate predictions
-        predictions = []
-        for i in range(future_periods):
-            future_x = n + i
-            pred = slope * future_x + intercept
-            predictions.append(max(0, pred))
+        ss_res = ((values - fitted) ** 2).sum(axis=1)
+        ss_tot = ((values - values.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_squared = np.where(ss_tot > 0, 1 - ss_res / ss_tot, 0.0)
         
-        return predictions, r_squared
+        return {"predictions": predictions, "r_squared": r_squared}
     
     @staticmethod
-    def linear_regression_forecast(x: List[float], y: List[float], 
-                                   future_periods: int,
-                                   use_polynomial: bool = False) -> Dict:
+    def demand_forecast_batch(quantities: np.ndarray, days_ahead: int,
+                              start_columns: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
         """
-        Smart wrapper: Uses sklearn if available, falls back to basic implementation
+        EMA-smooth each (variety, day) row and fit it the way forecast_series
+        fits one series: quadratic from POLYNOMIAL_MIN_POINTS days, linear below.
+        start_columns gives each row's first sale column; a row is fitted from
+        there on, so days before a product started selling do not drag its
+        trend. Rows with the same start (and so the same length) share one solve.
         """
-        if SKLEARN_AVAILABLE:
-            x_array = np.array(x)
-            y_array = np.array(y)
-            
-            # Try polynomial regression for better fit if requested
-            if use_polynomial:
-                result = AnalyticsEngine.linear_regression_forecast_sklearn(
-                    x_array, y_array, future_periods, use_polynomial=True, degree=2
-                )
-            else:
-                result = AnalyticsEngine.linear_regression_forecast_sklearn(
-                    x_array, y_array, future_periods
-                )
-            
-            return {
-                "predictions": result["predictions"],
-                "r_squared": result["r_squared"],
-                "mae": result.get("mae", 0),
-                "rmse": result.get("rmse", 0),
-                "model_type": result.get("model_type", "linear"),
-                "using_sklearn": True
-            }
-        else:
-            # Fallback to basic implementation
-            predictions, r_squared = AnalyticsEngine.linear_regression_forecast_basic(
-                x, y, future_periods
-            )
-            return {
-                "predictions": predictions,
-                "r_squared": r_squared,
-                "mae": 0,
-                "rmse": 0,
-                "model_type": "basic_linear",
-                "using_sklearn": False
-            }
+        quantities = np.atleast_2d(np.asarray(quantities, dtype=float))
+        if start_columns is None:
+            start_columns = np.zeros(len(quantities), dtype=np.intp)
+        start_columns = np.asarray(start_columns, dtype=np.intp)
+        
+        predictions = np.zeros((len(quantities), days_ahead))
+        r_squared = np.zeros(len(quantities))
+        for start in np.unique(start_columns):
+            rows = np.flatnonzero(start_columns == start)
+            smoothed = AnalyticsEngine.exponential_moving_average_batch(quantities[rows, start:], alpha=0.3)
+            degree = 2 if smoothed.shape[-1] >= POLYNOMIAL_MIN_POINTS else 1
+            fit = AnalyticsEngine.polynomial_forecast_batch(smoothed, days_ahead, degree=degree)
+            predictions[rows] = fit["predictions"]
+            r_squared[rows] = fit["r_squared"]
+        return {"predictions": predictions, "r_squared": r_squared}
+    
+    @staticmethod
+    def confidence_level(r_squared: float) -> str:
+        """Map a fit's R² to the high/medium/low confidence label"""
+        if r_squared > 0.7:
+            return "high"
+        elif r_squared > 0.4:
+            return "medium"
+        return "low"
     
     @staticmethod
     def calculate_growth_rate(current: float, previous: float) -> float:
@@ -209,44 +304,64 @@ class AnalyticsEngine:
             return 100.0 if current > 0 else 0.0
         return ((current - previous) / previous) * 100
     
+    @staticmethod
+    def linear_trend_batch(values) -> Dict[str, np.ndarray]:
+        """
+        Closed-form least-squares fit of each row against x = 0..n-1.
+        Returns slope, intercept, r_squared and mean arrays (one entry per row).
+        Rows need at least two points; a constant row gets slope and r_squared 0.
+        """
+        values = np.asarray(values, dtype=float)
+        n = values.shape[-1]
+        x = np.arange(n, dtype=float)
+        x_mean = x.mean()
+        x_centered = x - x_mean
+        sxx = x_centered @ x_centered
+        
+        y_mean = values.mean(axis=-1)
+        y_centered = values - y_mean[..., None]
+        sxy = y_centered @ x_centered
+        ss_tot = np.einsum("...i,...i->...", y_centered, y_centered)
+        
+        slope = sxy / sxx
+        # A constant row whose mean is not exact in floating point still
+        # leaves rounding noise in ss_tot; treat it as constant too
+        tolerance = 1e-10 * np.maximum(1.0, np.einsum("...i,...i->...", values, values))
+        constant = ss_tot <= tolerance
+        slope = np.where(constant, 0.0, slope)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_squared = np.where(constant, 0.0, sxy * sxy / (sxx * ss_tot))
+        
+        return {
+            "slope": slope,
+            "intercept": y_mean - slope * x_mean,
+            "r_squared": np.clip(r_squared, 0.0, 1.0),
+            "mean": y_mean,
+        }
+    
+    @staticmethod
+    def detect_trend_batch(values) -> List[Dict]:
+        """detect_trend for every row of a 2-D array (e.g. one row per variety)"""
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        if values.shape[-1] < 2:
+            return [{"trend": "insufficient_data", "strength": 0, "confidence": 0}
+                    for _ in range(values.shape[0])]
+        
+        fit = AnalyticsEngine.linear_trend_batch(values)
+        return [
+            AnalyticsEngine._classify_trend(float(slope), float(r_squared), float(y_mean))
+            for slope, r_squared, y_mean in zip(fit["slope"], fit["r_squared"], fit["mean"])
+        ]
+    
     @staticmethod
     def detect_trend(data: List[float]) -> Dict:
         """Detect if data shows upward, downward, or stable trend"""
         if len(data) < 2:
             return {"trend": "insufficient_data", "strength": 0, "confidence": 0}
-        
-        x = list(range(len(data)))
-        
-        if SKLEARN_AVAILABLE:
-            # Use sklearn for better trend detection
-            X = np.array(x).reshape(-1, 1)
-            y = np.array(data)
-            
-            model = LinearRegression()
-            model.fit(X, y)
-            
-            slope = float(model.coef_[0])
-            r_squared = r2_score(y, model.predict(X))
-            y_mean = np.mean(y)
-        else:
-            # Fallback to basic calculation
-            x_mean = sum(x) / len(x)
-            y_mean = sum(data) / len(data)
-            
-            numerator = sum((x[i] - x_mean) * (data[i] - y_mean) for i in range(len(data)))
-            denominator = sum((x[i] - x_mean) ** 2 for i in range(len(data)))
-            
-            if denominator == 0:
-                return {"trend": "stable", "strength": 0, "confidence": 0}
-            
-            slope = numerator / denominator
-            
-            # Calculate R-squared
-            y_pred = [slope * x[i] + (y_mean - slope * x_mean) for i in range(len(data))]
-            ss_res = sum((data[i] - y_pred[i]) ** 2 for i in range(len(data)))
-            ss_tot = sum((data[i] - y_mean) ** 2 for i in range(len(data)))
-            r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
-        
+        return AnalyticsEngine.detect_trend_batch([data])[0]
+    
+    @staticmethod
+    def _classify_trend(slope: float, r_squared: float, y_mean: float) -> Dict:
         # Determine trend
         threshold = y_mean * 0.01  # 1% of mean as threshold
         
@@ -267,45 +382,72 @@ class AnalyticsEngine:
             "confidence": round(r_squared * 100, 2)  # R² as confidence %
         }
     
+    @staticmethod
+    def weekday_profile_batch(values, weekdays, period: int = 7) -> Dict[str, np.ndarray]:
+        """
+        Per-bucket mean and population std for each row of values, via bincount.
+        weekdays holds the 0..period-1 bucket of every column and is shared by
+        all rows. has_seasonality flags rows whose bucket means vary by more
+        than 10% of their average (empty buckets are ignored).
+        """
+        values = np.asarray(values, dtype=float)
+        single = values.ndim == 1
+        values = np.atleast_2d(values)
+        weekdays = np.asarray(weekdays, dtype=np.intp)
+        n_series = values.shape[0]
+        
+        counts = np.bincount(weekdays, minlength=period)
+        buckets = (np.arange(n_series)[:, None] * period + weekdays).ravel()
+        size = n_series * period
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sums = np.bincount(buckets, weights=values.ravel(), minlength=size)
+            means = sums.reshape(n_series, period) / counts
+            deviations = values - means[:, weekdays]
+            squares = np.bincount(buckets, weights=(deviations ** 2).ravel(), minlength=size)
+            std = np.sqrt(squares.reshape(n_series, period) / counts)
+            
+            present = counts > 0
+            present_means = means[:, present]
+            avg = present_means.mean(axis=1)
+            variation = np.abs(present_means - avg[:, None]).mean(axis=1)
+            has_seasonality = (avg > 0) & (variation / avg > 0.1)
+        
+        if single:
+            means, std, has_seasonality = means[0], std[0], has_seasonality[0]
+        return {"mean": means, "std": std, "count": counts, "has_seasonality": has_seasonality}
+    
     @staticmethod
     def calculate_seasonality(data: List[Dict], period: int = 7) -> Dict:
         """
         Detect seasonal patterns (e.g., day of week patterns)
         data: List of {"date": date_obj, "value": float}
         """
-        if len(data) < period * 2:
+        weekdays = np.fromiter(
+            (
+                (datetime.strptime(item["date"], "%Y-%m-%d").date()
+                 if isinstance(item["date"], str) else item["date"]).weekday()
+                for item in data
+            ),
+            dtype=np.intp, count=len(data)
+        )
+        values = np.fromiter((float(item["value"]) for item in data), dtype=float, count=len(data))
+        return AnalyticsEngine.seasonality_from_arrays(values, weekdays, period)
+    
+    @staticmethod
+    def seasonality_from_arrays(values: np.ndarray, weekdays: np.ndarray, period: int = 7) -> Dict:
+        """calculate_seasonality for a value array and the weekday of each entry"""
+        if len(values) < period * 2:
             return {"has_seasonality": False, "pattern": {}}
         
-        # Group by day of week
-        period_data = defaultdict(list)
-        for item in data:
-            if isinstance(item["date"], str):
-                date_obj = datetime.strptime(item["date"], "%Y-%m-%d").date()
-            else:
-                date_obj = item["date"]
-            
-            day_of_week = date_obj.weekday()
-            period_data[day_of_week].append(item["value"])
-        
-        # Calculate average and std for each day
-        pattern = {}
-        std_pattern = {}
-        for day, values in period_data.items():
-            pattern[day] = sum(values) / len(values)
-            if SKLEARN_AVAILABLE:
-                std_pattern[day] = float(np.std(values))
-            else:
-                mean = pattern[day]
-                variance = sum((v - mean) ** 2 for v in values) / len(values)
-                std_pattern[day] = variance ** 0.5
-        
-        # Check if variation is significant
-        if len(pattern) > 0:
-            avg = sum(pattern.values()) / len(pattern)
-            variation = sum(abs(v - avg) for v in pattern.values()) / len(pattern)
-            has_seasonality = (variation / avg > 0.1) if avg > 0 else False
-        else:
-            has_seasonality = False
+        profile = AnalyticsEngine.weekday_profile_batch(values, weekdays)
+        
+        # Days in order of first appearance, as the old dict grouping produced
+        _, first_seen = np.unique(weekdays, return_index=True)
+        days_seen = [int(day) for day in weekdays[np.sort(first_seen)]]
+        pattern = {day: float(profile["mean"][day]) for day in days_seen}
+        std_pattern = {day: float(profile["std"][day]) for day in days_seen}
+        has_seasonality = bool(profile["has_seasonality"])
         
         days_map = {0: "Monday", 1: "Tuesday", 2: "Wednesday", 3: "Thursday",
                    4: "Friday", 5: "Saturday", 6: "Sunday"}
@@ -318,6 +460,26 @@ class AnalyticsEngine:
             "worst_day": days_map[min(pattern.keys(), key=lambda k: pattern[k])] if pattern else None
         }
     
+    @staticmethod
+    def analyze_trends(revenues: np.ndarray, profits: np.ndarray, weekdays: np.ndarray) -> Dict:
+        """Revenue/profit trends, weekday seasonality and half-over-half growth of a daily series"""
+        revenue_trend, profit_trend = AnalyticsEngine.detect_trend_batch(np.vstack([revenues, profits]))
+        
+        if len(revenues) >= 14:
+            half = len(revenues) // 2
+            growth_rate = AnalyticsEngine.calculate_growth_rate(
+                float(revenues[half:].sum()), float(revenues[:half].sum())
+            )
+        else:
+            growth_rate = 0
+        
+        return {
+            "revenue_trend": revenue_trend,
+            "profit_trend": profit_trend,
+            "seasonality": AnalyticsEngine.seasonality_from_arrays(revenues, weekdays),
+            "growth_rate": growth_rate,
+        }
+    
     @staticmethod
     def calculate_reorder_point(avg_daily_sales: float, lead_time_days: int = 7,
                                safety_stock_factor: float = 1.5) -> int:
@@ -333,12 +495,7 @@ class AnalyticsEngine:
             return 0
         
         reorder_point = (avg_daily_sales * lead_time_days) * safety_stock_factor
-        
-        if SKLEARN_AVAILABLE:
-            return int(np.ceil(reorder_point))
-        else:
-            import math
-            return int(math.ceil(reorder_point))
+        return int(np.ceil(reorder_point))
     
     @staticmethod
     def forecast_revenue(historical_data: List[Dict], days_ahead: int = 30,
@@ -348,33 +505,78 @@ class AnalyticsEngine:
         historical_data: [{"date": "2024-01-01", "revenue": 1000}, ...]
         use_advanced: Use polynomial regression if available
         """
-        if len(historical_data) < 7:
-            return {
-                "forecast": [],
-                "confidence": "low",
-                "r_squared": 0,
-                "total_predicted": 0,
-                "total_predicted_revenue": 0,
-                "avg_daily_predicted": 0,
-                "model_info": {"type": "insufficient_data"},
-                "message": "Insufficient historical data for accurate forecasting (need at least 7 days)"
-            }
+        values = np.fromiter(
+            (float(item["revenue"]) for item in historical_data),
+            dtype=float, count=len(historical_data)
+        )
+        last_date = None
+        if historical_data:
+            last_date = historical_data[-1]["date"]
+            if isinstance(last_date, str):
+                last_date = datetime.strptime(last_date, "%Y-%m-%d").date()
+        return AnalyticsEngine.forecast_series(values, last_date, days_ahead, use_advanced)
+    
+    @staticmethod
+    def insufficient_forecast() -> Dict:
+        """Result returned when there is too little history to fit"""
+        return {
+            "forecast": [],
+            "confidence": "low",
+            "r_squared": 0,
+            "total_predicted": 0,
+            "total_predicted_revenue": 0,
+            "avg_daily_predicted": 0,
+            "model_info": {"type": "insufficient_data"},
+            "message": "Insufficient historical data for accurate forecasting (need at least 7 days)"
+        }
+    
+    @staticmethod
+    def forecast_series(values: np.ndarray, last_date: Optional[date], days_ahead: int = 30,
+                        use_advanced: bool = True) -> Dict:
+        """
+        Forecast a daily series (one value per calendar day, ending at last_date).
+        Same result shape as forecast_revenue. Results are memoized on the
+        series, so an unchanged history is not refit.
+        """
+        values = np.asarray(values, dtype=float)
+        key = series_fingerprint(
+            "forecast_series", values, str(last_date), days_ahead, use_advanced, ANALYTICS_BACKEND
+        )
+        return forecast_cache.get_or_compute(
+            key,
+            lambda: analytics_pool.run(
+                AnalyticsEngine._fit_series_forecast, values, last_date, days_ahead, use_advanced
+            )
+        )
+    
+    @staticmethod
+    async def forecast_series_async(values: np.ndarray, last_date: Optional[date], days_ahead: int = 30,
+                                    use_advanced: bool = True) -> Dict:
+        """forecast_series for async routes: awaits the pool instead of blocking a thread"""
+        values = np.asarray(values, dtype=float)
+        key = series_fingerprint(
+            "forecast_series", values, str(last_date), days_ahead, use_advanced, ANALYTICS_BACKEND
+        )
+        return await forecast_cache.get_or_compute_async(
+            key,
+            lambda: analytics_pool.run_async(
+                AnalyticsEngine._fit_series_forecast, values, last_date, days_ahead, use_advanced
+            )
+        )
+    
+    @staticmethod
+    def _fit_series_forecast(y: np.ndarray, last_date: Optional[date], days_ahead: int,
+                             use_advanced: bool) -> Dict:
+        if len(y) < 7:
+            return AnalyticsEngine.insufficient_forecast()
         
-        # Prepare data
-        x = list(range(len(historical_data)))
-        y = [item["revenue"] for item in historical_data]
+        x = np.arange(len(y), dtype=float)
         
         # Apply smoothing for better trend detection
-        if len(y) >= 7:
-            if SKLEARN_AVAILABLE:
-                y_smoothed = AnalyticsEngine.exponential_moving_average(y, alpha=0.3)
-            else:
-                y_smoothed = AnalyticsEngine.calculate_moving_average(y, window=7)
-        else:
-            y_smoothed = y
+        y_smoothed = AnalyticsEngine.exponential_moving_average_batch(y, alpha=0.3)
         
         # Decide whether to use polynomial regression
-        use_polynomial = use_advanced and SKLEARN_AVAILABLE and len(historical_data) >= 14
+        use_polynomial = use_advanced and len(y) >= POLYNOMIAL_MIN_POINTS
         
         # Generate forecast
         forecast_result = AnalyticsEngine.linear_regression_forecast(
@@ -385,21 +587,10 @@ class AnalyticsEngine:
         r_squared = forecast_result["r_squared"]
         
         # Determine confidence level
-        if r_squared > 0.7:
-            confidence = "high"
-        elif r_squared > 0.4:
-            confidence = "medium"
-        else:
-            confidence = "low"
+        confidence = AnalyticsEngine.confidence_level(r_squared)
         
         # Generate forecast dates
-        if historical_data:
-            last_date_str = historical_data[-1]["date"]
-            if isinstance(last_date_str, str):
-                last_date = datetime.strptime(last_date_str, "%Y-%m-%d").date()
-            else:
-                last_date = last_date_str
-        else:
+        if last_date is None:
             last_date = date.today()
         
         forecast_data = []
@@ -425,6 +616,7 @@ class AnalyticsEngine:
             "avg_daily_predicted": avg_daily,
             "model_info": {
                 "type": forecast_result.get("model_type", "unknown"),
+                "backend": ANALYTICS_BACKEND,
                 "using_sklearn": forecast_result.get("using_sklearn", False),
                 "sklearn_available": SKLEARN_AVAILABLE
             }
@@ -501,7 +693,9 @@ class AnalyticsEngine:
         
         # Insight 5: Seasonality Detection
         if len(sales_data) >= 14:
-            seasonality = AnalyticsEngine.calculate_seasonality(sales_data)
+            seasonality = AnalyticsEngine.calculate_seasonality(
+                [{"date": s["date"], "value": s["revenue"]} for s in sales_data]
+            )
             if seasonality["has_seasonality"] and seasonality["best_day"]:
                 insights.append({
                     "type": "info",
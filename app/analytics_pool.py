@@ -0,0 +1,157 @@
+# app/analytics_pool.py
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict
+
+
+class AnalyticsTimeout(Exception):
+    """An analytics job did not finish within the pool timeout"""
+
+
+class AnalyticsPool:
+    """
+    Process pool for CPU-bound AnalyticsEngine work, so model fitting does not
+    hold the GIL while other requests (sales entry) are being served.
+    Jobs run inline instead when the pool is disabled (workers=0), when
+    max_pending jobs are already queued, or when the pool has broken.
+    Jobs must be module-level functions or static methods with picklable
+    arguments.
+
+    A timeout only stops the caller waiting: a job that has already started
+    cannot be cancelled and keeps its worker busy until it returns. It still
+    counts towards pending until then, so once max_pending is reached new jobs
+    run inline rather than queueing behind stuck ones. Set ANALYTICS_POOL_TIMEOUT
+    well above the slowest normal fit, and ANALYTICS_POOL_WORKERS with headroom
+    for a few overrunning jobs.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.submitted = 0
+        self.inline = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def start(self):
+        with self._lock:
+            if self.workers > 0 and self._executor is None:
+                # spawn: children must not inherit the parent's DB connections or threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _restart_locked(self):
+        print("⚠️ Analytics process pool broke; restarting it")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def _submit(self, fn: Callable, args, kwargs):
+        with self._lock:
+            if self._executor is None or self.pending >= self.max_pending:
+                return None
+            try:
+                future = self._executor.submit(fn, *args, **kwargs)
+            except (BrokenProcessPool, RuntimeError):
+                self.failures += 1
+                self._restart_locked()
+                return None
+            self.pending += 1
+            self.submitted += 1
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._lock:
+            self.pending -= 1
+
+    def _timed_out(self, fn: Callable, future):
+        # Only drops the job if it is still queued; a running job finishes in its worker
+        future.cancel()
+        with self._lock:
+            self.timeouts += 1
+        return AnalyticsTimeout(
+            f"{getattr(fn, '__qualname__', fn)} did not finish within {self.timeout:g}s"
+        )
+
+    def _broken(self):
+        with self._lock:
+            self.failures += 1
+            self._restart_locked()
+
+    def _count_inline(self):
+        with self._lock:
+            self.inline += 1
+
+    def run(self, fn: Callable, *args, **kwargs):
+        """Run fn in the pool and block this thread (not the GIL) until it returns"""
+        future = self._submit(fn, args, kwargs)
+        if future is not None:
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeout:
+                raise self._timed_out(fn, future)
+            except BrokenProcessPool:
+                self._broken()
+
+        self._count_inline()
+        return fn(*args, **kwargs)
+
+    async def run_async(self, fn: Callable, *args, **kwargs):
+        """Same as run, awaited from the event loop"""
+        future = self._submit(fn, args, kwargs)
+        if future is not None:
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            except asyncio.TimeoutError:
+                raise self._timed_out(fn, future)
+            except BrokenProcessPool:
+                self._broken()
+
+        self._count_inline()
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.workers if self._executor is not None else 0,
+                "max_pending": self.max_pending,
+                "timeout_seconds": self.timeout,
+                "pending": self.pending,
+                "submitted": self.submitted,
+                "inline": self.inline,
+                "timeouts": self.timeouts,
+                "failures": self.failures,
+            }
+
+
+_workers = int(os.getenv("ANALYTICS_POOL_WORKERS", "2"))
+
+# Started from the app lifespan; in pool children and scripts it stays off and runs inline
+analytics_pool = AnalyticsPool(
+    workers=_workers,
+    max_pending=int(os.getenv("ANALYTICS_POOL_MAX_PENDING", str(max(_workers * 4, 1)))),
+    timeout=float(os.getenv("ANALYTICS_POOL_TIMEOUT", "30")),
+)
@@ -0,0 +1,80 @@
+# app/change_versions.py
+
+import hashlib
+from typing import Dict, Iterable
+from fastapi import Depends, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from database import get_db, get_async_db
+from models import TableVersion
+
+# Tables whose writes bump a counter in table_versions
+TRACKED_TABLES = (
+    "cloth_varieties",
+    "sales",
+    "supplier_inventory",
+    "supplier_returns",
+    "expenses",
+)
+
+
+class NotModified(Exception):
+    """Raised by an ETag dependency when the client's copy is current"""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+def bump(db: Session, *tables: str):
+    """Increment the change counters for tables written in this transaction"""
+    db.execute(
+        update(TableVersion)
+        .where(TableVersion.table_name.in_(tables))
+        .values(version=TableVersion.version + 1)
+    )
+
+
+def _versions_query(tables: Iterable[str]):
+    return select(TableVersion.table_name, TableVersion.version).where(
+        TableVersion.table_name.in_(tuple(tables))
+    )
+
+
+def current_versions(db: Session, *tables: str) -> Dict[str, int]:
+    """Change counters for tables, as of this session's transaction"""
+    return dict(db.execute(_versions_query(tables)).all())
+
+
+def _etag(request: Request, versions: Dict[str, int]) -> str:
+    state = "|".join(f"{name}:{versions.get(name, 0)}" for name in sorted(versions))
+    digest = hashlib.sha1(f"{request.url.path}?{request.url.query}|{state}".encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def _check(request: Request, response: Response, etag: str):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in candidates or etag in candidates:
+            raise NotModified(etag)
+    response.headers["ETag"] = etag
+
+
+def etag_for(*tables: str):
+    """
+    Dependency for sync routes: answers If-None-Match with 304 before the
+    route body runs, otherwise sets the ETag header on the response.
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)):
+        versions = current_versions(db, *tables)
+        _check(request, response, _etag(request, versions))
+    return dependency
+
+
+def async_etag_for(*tables: str):
+    """Same as etag_for, for routes using the async session"""
+    async def dependency(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+        versions = dict((await db.execute(_versions_query(tables))).all())
+        _check(request, response, _etag(request, versions))
+    return dependency
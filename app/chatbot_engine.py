@@ -3,102 +3,141 @@
 from typing import List, Dict, Optional, Any
 from datetime import datetime, date, timedelta
 from decimal import Decimal
+from functools import partial
+from pydantic import BaseModel, Field
+import asyncio
 import json
 import os
+import time
 
 # LangChain imports
 try:
     from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain.messages import HumanMessage, SystemMessage, AIMessage
+    from langchain.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
+    from langchain_core.tools import StructuredTool
     LANGCHAIN_AVAILABLE = True
 except ImportError:
     LANGCHAIN_AVAILABLE = False
     print("⚠️ Warning: LangChain not installed.")
     print("   Install with: pip install langchain-google-genai")
 
+from llm_clients import llm_clients, CHAT_MODEL
+from change_versions import current_versions
+from report_cache import cached_value
+
+# Tables the business context is built from; their change counters version it
+CONTEXT_TABLES = ("sales", "supplier_inventory", "cloth_varieties")
+
+# Seconds one Gemini call may take before the chat gives up on it
+LLM_TIMEOUT = float(os.getenv("CHATBOT_LLM_TIMEOUT", "30"))
+
+# Tool calling (model fetches data) vs. the full business context in every prompt
+USE_TOOLS = os.getenv("CHATBOT_TOOLS", "1") != "0"
+# Tool-calling turns per message before the model must answer with what it has
+MAX_TOOL_ROUNDS = int(os.getenv("CHATBOT_MAX_TOOL_ROUNDS", "4"))
+
+
+def _new_usage(use_tools: bool) -> Dict:
+    return {
+        "mode": "tools" if use_tools else "context",
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "llm_calls": 0,
+        "tool_calls": [],
+    }
+
+
+def _add_token_usage(usage: Dict, reply):
+    usage["llm_calls"] += 1
+    metadata = getattr(reply, "usage_metadata", None) or {}
+    usage["prompt_tokens"] += metadata.get("input_tokens", 0)
+    usage["completion_tokens"] += metadata.get("output_tokens", 0)
+
+
+def _finish_usage(usage: Dict, started: float) -> Dict:
+    usage["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    llm_clients.record_usage(usage)
+    return usage
+
 
 class BusinessChatbot:
     """AI-powered business assistant using LangChain"""
     
-    def __init__(self, db_session=None):
+    def __init__(self, db_session=None, llm=None):
         self.db = db_session
-        self.llm = self._initialize_llm()
-        
-    def _initialize_llm(self):
-        """Initialize the language model (Google Gemini)"""
-        if not LANGCHAIN_AVAILABLE:
-            return None
-        
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            print("⚠️ Warning: GOOGLE_API_KEY not found in environment variables")
-            return None
-        
-        try:
-            model = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash",
-                google_api_key=api_key,
-                temperature=0.7,
-                convert_system_message_to_human=True
-            )
-            return model
-        except Exception as e:
-            print(f"Error initializing Gemini: {e}")
-            return None
+        # Shared client from the registry; pass llm to override (e.g. a fake in scripts)
+        self.llm = llm if llm is not None else llm_clients.get("chat")
     
     def get_business_context(self) -> str:
-        """Get current business data as context for the AI"""
+        """
+        Get current business data as context for the AI. Snapshots are shared
+        by every chat on this worker and keyed on the sales, supplier inventory
+        and variety change counters, so any write (from any worker) makes the
+        next message rebuild it; the report cache TTL bounds its age otherwise.
+        """
         if not self.db:
             return "No database connection available."
         
         try:
-            from sqlalchemy import func
-            from models import Sale, SupplierInventory, ClothVariety, SupplierReturn
-            
+            versions = current_versions(self.db, *CONTEXT_TABLES)
+            stamp = "v" + ".".join(str(versions.get(table, 0)) for table in CONTEXT_TABLES)
             today = date.today()
-            week_ago = today - timedelta(days=7)
-            month_ago = today - timedelta(days=30)
-            
-            # Get today's sales
-            today_sales = self.db.query(
-                func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-                func.sum(Sale.profit).label('profit'),
-                func.count(Sale.id).label('count')
-            ).filter(Sale.sale_date == today).first()
-            
-            # Get this week's sales
-            week_sales = self.db.query(
-                func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-                func.sum(Sale.profit).label('profit')
-            ).filter(Sale.sale_date >= week_ago).first()
-            
-            # Get this month's sales
-            month_sales = self.db.query(
-                func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-                func.sum(Sale.profit).label('profit')
-            ).filter(Sale.sale_date >= month_ago).first()
-            
-            # Get top products this month
-            top_products = self.db.query(
-                ClothVariety.name,
-                func.sum(Sale.quantity).label('quantity'),
-                func.sum(Sale.selling_price * Sale.quantity).label('revenue')
-            ).join(Sale).filter(
-                Sale.sale_date >= month_ago
-            ).group_by(ClothVariety.name).order_by(
-                func.sum(Sale.selling_price * Sale.quantity).desc()
-            ).limit(5).all()
-            
-            # Get recent suppliers
-            recent_suppliers = self.db.query(
-                SupplierInventory.supplier_name,
-                func.sum(SupplierInventory.total_amount).label('total')
-            ).filter(
-                SupplierInventory.supply_date >= month_ago
-            ).group_by(SupplierInventory.supplier_name).all()
+            return cached_value(
+                ("chatbot-context", today, stamp),
+                lambda: self._query_business_context(today, stamp)
+            )
             
-            context = f"""
-CURRENT BUSINESS DATA (as of {today}):
+        except Exception as e:
+            return f"Error fetching business context: {str(e)}"
+    
+    def _query_business_context(self, today: date, stamp: str) -> str:
+        """Run the context aggregates; errors propagate so they are not cached"""
+        from sqlalchemy import func
+        from models import DailySalesRollup, SupplierInventory, ClothVariety
+        
+        week_ago = today - timedelta(days=7)
+        month_ago = today - timedelta(days=30)
+        
+        # Get today's sales
+        today_sales = self.db.query(
+            func.sum(DailySalesRollup.total_revenue).label('revenue'),
+            func.sum(DailySalesRollup.total_profit).label('profit'),
+            func.sum(DailySalesRollup.sales_count).label('count')
+        ).filter(DailySalesRollup.sale_date == today).first()
+        
+        # Get this week's sales
+        week_sales = self.db.query(
+            func.sum(DailySalesRollup.total_revenue).label('revenue'),
+            func.sum(DailySalesRollup.total_profit).label('profit')
+        ).filter(DailySalesRollup.sale_date >= week_ago).first()
+        
+        # Get this month's sales
+        month_sales = self.db.query(
+            func.sum(DailySalesRollup.total_revenue).label('revenue'),
+            func.sum(DailySalesRollup.total_profit).label('profit')
+        ).filter(DailySalesRollup.sale_date >= month_ago).first()
+        
+        # Get top products this month
+        top_products = self.db.query(
+            ClothVariety.name,
+            func.sum(DailySalesRollup.total_quantity).label('quantity'),
+            func.sum(DailySalesRollup.total_revenue).label('revenue')
+        ).join(DailySalesRollup, DailySalesRollup.variety_id == ClothVariety.id).filter(
+            DailySalesRollup.sale_date >= month_ago
+        ).group_by(ClothVariety.name).order_by(
+            func.sum(DailySalesRollup.total_revenue).desc()
+        ).limit(5).all()
+        
+        # Get recent suppliers
+        recent_suppliers = self.db.query(
+            SupplierInventory.supplier_name,
+            func.sum(SupplierInventory.total_amount).label('total')
+        ).filter(
+            SupplierInventory.supply_date >= month_ago
+        ).group_by(SupplierInventory.supplier_name).all()
+        
+        context = f"""
+CURRENT BUSINESS DATA (as of {today}, snapshot {stamp}):
 
 TODAY'S PERFORMANCE:
 - Revenue: ₹{float(today_sales.revenue) if today_sales.revenue else 0:,.2f}
@@ -119,19 +158,27 @@ TOP 5 PRODUCTS (This Month):
 SUPPLIERS (This Month):
 {chr(10).join([f"- {s.supplier_name}: ₹{float(s.total):,.2f}" for s in recent_suppliers]) if recent_suppliers else "No suppliers"}
 """
-            return context
-            
-        except Exception as e:
-            return f"Error fetching business context: {str(e)}"
+        return context
     
-    def create_system_prompt(self) -> str:
-        """Create the system prompt for the AI"""
-        business_context = self.get_business_context()
+    def create_system_prompt(self, use_tools: bool = False) -> str:
+        """
+        Create the system prompt for the AI. With tools the model fetches the
+        figures it needs, so the prompt carries no business data of its own.
+        """
+        if use_tools:
+            data_section = """DATA ACCESS:
+- You have tools for sales, top products, suppliers, expenses, supplier returns,
+  forecasts and salesperson performance. Call them for any figure you need.
+- Only call the tools the question requires, with the narrowest period that answers it."""
+            data_guideline = "Use numbers returned by your tools; never invent figures"
+        else:
+            data_section = self.get_business_context()
+            data_guideline = "Use numbers and data from the context above"
         
         return f"""You are an intelligent business assistant for a cloth shop management system. 
 Your job is to help the business owner understand their data, make decisions, and answer questions.
 
-{business_context}
+{data_section}
 
 CAPABILITIES:
 - Answer questions about sales, revenue, profit, inventory
@@ -142,7 +189,7 @@ CAPABILITIES:
 
 GUIDELINES:
 - Be concise and direct
-- Use numbers and data from the context above
+- {data_guideline}
 - Format currency as ₹XX,XXX.XX
 - If you don't have specific data, say so honestly
 - Provide actionable advice when relevant
@@ -154,42 +201,104 @@ REMEMBER:
 - The business is a cloth/fabric shop
 """
     
-    async def chat(self, user_message: str, conversation_history: List[Dict] = None) -> Dict:
+    NOT_CONFIGURED = {
+        "response": "AI chatbot is not configured. Please set GOOGLE_API_KEY in your .env file to enable AI features.\n\nYou can still ask simple questions and I'll try to help with basic queries!",
+        "error": "no_api_key",
+        "success": False
+    }
+    
+    async def build_messages(self, user_message: str, conversation_history: List[Dict] = None,
+                             use_tools: bool = USE_TOOLS) -> List:
+        """
+        System prompt, recent history and the new message. Without tools the
+        prompt embeds the business context, whose queries use the sync session
+        and so run off the event loop (not under a timeout: an abandoned thread
+        would keep using the session).
+        """
+        system_prompt = await asyncio.to_thread(self.create_system_prompt, use_tools)
+        
+        messages = [
+            SystemMessage(content=system_prompt)
+        ]
+        
+        # Add conversation history
+        if conversation_history:
+            for msg in conversation_history[-10:]:  # Last 10 messages for context
+                if msg["role"] == "user":
+                    messages.append(HumanMessage(content=msg["content"]))
+                elif msg["role"] == "assistant":
+                    messages.append(AIMessage(content=msg["content"]))
+        
+        # Add current message
+        messages.append(HumanMessage(content=user_message))
+        return messages
+    
+    def _model_for_round(self, tools: List, round_number: int):
+        """LLM with tools bound, or plain once the tool round budget is spent"""
+        if tools and round_number < MAX_TOOL_ROUNDS:
+            return self.llm.bind_tools(tools)
+        return self.llm
+    
+    async def _run_tool_calls(self, reply, tools: List, messages: List, usage: Dict):
+        """Append the model's tool-calling turn and each tool's result to messages"""
+        by_name = {tool.name: tool for tool in tools}
+        messages.append(reply)
+        for call in reply.tool_calls:
+            usage["tool_calls"].append(call["name"])
+            tool = by_name.get(call["name"])
+            if tool is None:
+                result = {"error": f"Unknown tool '{call['name']}'"}
+            else:
+                # One at a time: every tool shares this request's session
+                try:
+                    result = await asyncio.to_thread(tool.invoke, call["args"])
+                except Exception as e:
+                    result = {"error": str(e)}
+            messages.append(ToolMessage(
+                content=json.dumps(result, default=str),
+                tool_call_id=call["id"]
+            ))
+    
+    async def chat(self, user_message: str, conversation_history: List[Dict] = None,
+                   use_tools: bool = USE_TOOLS) -> Dict:
         """
         Process a chat message and return AI response
         """
         if not self.llm:
-            return {
-                "response": "AI chatbot is not configured. Please set GOOGLE_API_KEY in your .env file to enable AI features.\n\nYou can still ask simple questions and I'll try to help with basic queries!",
-                "error": "no_api_key",
-                "success": False
-            }
+            return dict(self.NOT_CONFIGURED)
         
+        started = time.perf_counter()
+        usage = _new_usage(use_tools)
         try:
-            # Create messages
-            messages = [
-                SystemMessage(content=self.create_system_prompt())
-            ]
-            
-            # Add conversation history
-            if conversation_history:
-                for msg in conversation_history[-10:]:  # Last 10 messages for context
-                    if msg["role"] == "user":
-                        messages.append(HumanMessage(content=msg["content"]))
-                    elif msg["role"] == "assistant":
-                        messages.append(AIMessage(content=msg["content"]))
-            
-            # Add current message
-            messages.append(HumanMessage(content=user_message))
+            messages = await self.build_messages(user_message, conversation_history, use_tools)
+            tools = build_chat_tools(self.db) if use_tools else []
             
-            # Get AI response - FIX: Call invoke() method
-            response = self.llm.invoke(messages)
+            # Get AI response without blocking other requests on this worker
+            for round_number in range(MAX_TOOL_ROUNDS + 1):
+                try:
+                    response = await asyncio.wait_for(
+                        self._model_for_round(tools, round_number).ainvoke(messages), LLM_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    return {
+                        "response": f"The AI assistant did not answer within {LLM_TIMEOUT:g} seconds. Please try again.",
+                        "error": "timeout",
+                        "timestamp": datetime.now().isoformat(),
+                        "model": CHAT_MODEL,
+                        "success": False,
+                        "usage": _finish_usage(usage, started)
+                    }
+                _add_token_usage(usage, response)
+                if not getattr(response, "tool_calls", None):
+                    break
+                await self._run_tool_calls(response, tools, messages, usage)
             
             return {
                 "response": response.content,
                 "timestamp": datetime.now().isoformat(),
-                "model": "gemini-2.0-flash-exp",
-                "success": True
+                "model": CHAT_MODEL,
+                "success": True,
+                "usage": _finish_usage(usage, started)
             }
             
         except Exception as e:
@@ -200,6 +309,62 @@ REMEMBER:
                 "success": False
             }
     
+    async def stream_reply(self, messages: List, use_tools: bool = USE_TOOLS):
+        """
+        Yield ("token", text) as the LLM streams, ("tool", name) for each data
+        lookup between rounds, then one ("done", metadata) with timing and
+        token usage. LLM_TIMEOUT bounds the wait for each chunk, not the whole reply.
+        """
+        started = time.perf_counter()
+        first_token_ms = None
+        error = None
+        usage = _new_usage(use_tools)
+        tools = build_chat_tools(self.db) if use_tools else []
+        
+        try:
+            for round_number in range(MAX_TOOL_ROUNDS + 1):
+                reply = None
+                chunks = self._model_for_round(tools, round_number).astream(messages)
+                try:
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), LLM_TIMEOUT)
+                        except StopAsyncIteration:
+                            break
+                        # Chunks add up to the full message, tool calls included
+                        reply = chunk if reply is None else reply + chunk
+                        if not chunk.content:
+                            continue
+                        if first_token_ms is None:
+                            first_token_ms = round((time.perf_counter() - started) * 1000, 1)
+                        yield "token", chunk.content
+                finally:
+                    await chunks.aclose()
+                
+                if reply is None:
+                    break
+                _add_token_usage(usage, reply)
+                if not reply.tool_calls:
+                    break
+                for call in reply.tool_calls:
+                    yield "tool", call["name"]
+                await self._run_tool_calls(reply, tools, messages, usage)
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except Exception as e:
+            print(f"Error in chat stream: {str(e)}")
+            error = str(e)
+        
+        yield "done", {
+            "timestamp": datetime.now().isoformat(),
+            "model": CHAT_MODEL,
+            "success": error is None,
+            "error": error,
+            "time_to_first_token_ms": first_token_ms,
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            "usage": _finish_usage(usage, started)
+        }
+    
     def parse_query_intent(self, user_message: str) -> Dict:
         """
         Parse user intent for direct database queries
@@ -244,15 +409,15 @@ REMEMBER:
         
         try:
             from sqlalchemy import func
-            from models import Sale, ClothVariety
+            from models import DailySalesRollup, ClothVariety
             
             today = date.today()
             
             if intent["intent"] == "sales_today":
                 result = self.db.query(
-                    func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-                    func.count(Sale.id).label('count')
-                ).filter(Sale.sale_date == today).first()
+                    func.sum(DailySalesRollup.total_revenue).label('revenue'),
+                    func.sum(DailySalesRollup.sales_count).label('count')
+                ).filter(DailySalesRollup.sale_date == today).first()
                 
                 revenue = float(result.revenue) if result.revenue else 0
                 count = result.count if result.count else 0
@@ -261,8 +426,8 @@ REMEMBER:
             
             elif intent["intent"] == "profit_today":
                 result = self.db.query(
-                    func.sum(Sale.profit).label('profit')
-                ).filter(Sale.sale_date == today).first()
+                    func.sum(DailySalesRollup.total_profit).label('profit')
+                ).filter(DailySalesRollup.sale_date == today).first()
                 
                 profit = float(result.profit) if result.profit else 0
                 return f"Today's profit: ₹{profit:,.2f}"
@@ -271,12 +436,12 @@ REMEMBER:
                 month_ago = today - timedelta(days=30)
                 products = self.db.query(
                     ClothVariety.name,
-                    func.sum(Sale.quantity).label('quantity'),
-                    func.sum(Sale.selling_price * Sale.quantity).label('revenue')
-                ).join(Sale).filter(
-                    Sale.sale_date >= month_ago
+                    func.sum(DailySalesRollup.total_quantity).label('quantity'),
+                    func.sum(DailySalesRollup.total_revenue).label('revenue')
+                ).join(DailySalesRollup, DailySalesRollup.variety_id == ClothVariety.id).filter(
+                    DailySalesRollup.sale_date >= month_ago
                 ).group_by(ClothVariety.name).order_by(
-                    func.sum(Sale.selling_price * Sale.quantity).desc()
+                    func.sum(DailySalesRollup.total_revenue).desc()
                 ).limit(5).all()
                 
                 if not products:
@@ -302,45 +467,45 @@ class ChatbotTools:
     def get_sales_by_date(db, start_date: date, end_date: date = None) -> Dict:
         """Get sales data for a specific period"""
         from sqlalchemy import func
-        from models import Sale
+        from models import DailySalesRollup
         
         if end_date is None:
             end_date = start_date
         
         result = db.query(
-            func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-            func.sum(Sale.profit).label('profit'),
-            func.sum(Sale.quantity).label('quantity'),
-            func.count(Sale.id).label('transactions')
+            func.sum(DailySalesRollup.total_revenue).label('revenue'),
+            func.sum(DailySalesRollup.total_profit).label('profit'),
+            func.sum(DailySalesRollup.total_quantity).label('quantity'),
+            func.sum(DailySalesRollup.sales_count).label('transactions')
         ).filter(
-            Sale.sale_date >= start_date,
-            Sale.sale_date <= end_date
+            DailySalesRollup.sale_date >= start_date,
+            DailySalesRollup.sale_date <= end_date
         ).first()
         
         return {
             "revenue": float(result.revenue) if result.revenue else 0,
             "profit": float(result.profit) if result.profit else 0,
             "quantity": result.quantity if result.quantity else 0,
-            "transactions": result.transactions if result.transactions else 0
+            "transactions": int(result.transactions) if result.transactions else 0
         }
     
     @staticmethod
     def get_top_products(db, limit: int = 5, days: int = 30) -> List[Dict]:
         """Get top performing products"""
         from sqlalchemy import func
-        from models import Sale, ClothVariety
+        from models import DailySalesRollup, ClothVariety
         
         start_date = date.today() - timedelta(days=days)
         
         products = db.query(
             ClothVariety.name,
-            func.sum(Sale.quantity).label('quantity'),
-            func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-            func.sum(Sale.profit).label('profit')
-        ).join(Sale).filter(
-            Sale.sale_date >= start_date
+            func.sum(DailySalesRollup.total_quantity).label('quantity'),
+            func.sum(DailySalesRollup.total_revenue).label('revenue'),
+            func.sum(DailySalesRollup.total_profit).label('profit')
+        ).join(DailySalesRollup, DailySalesRollup.variety_id == ClothVariety.id).filter(
+            DailySalesRollup.sale_date >= start_date
         ).group_by(ClothVariety.name).order_by(
-            func.sum(Sale.selling_price * Sale.quantity).desc()
+            func.sum(DailySalesRollup.total_revenue).desc()
         ).limit(limit).all()
         
         return [
@@ -374,4 +539,175 @@ class ChatbotTools:
                 "total": float(s.total)
             }
             for s in suppliers
-        ]
\ No newline at end of file
+        ]
+    
+    @staticmethod
+    def get_expense_summary(db, days: int = 30) -> Dict:
+        """Get expenses per category"""
+        from sqlalchemy import func
+        from models import Expense
+        
+        start_date = date.today() - timedelta(days=days)
+        
+        categories = db.query(
+            Expense.category,
+            func.sum(Expense.amount).label('total'),
+            func.count(Expense.id).label('entries')
+        ).filter(
+            Expense.expense_date >= start_date
+        ).group_by(Expense.category).order_by(func.sum(Expense.amount).desc()).all()
+        
+        return {
+            "total": sum(float(c.total) for c in categories),
+            "categories": [
+                {
+                    "category": c.category.value if hasattr(c.category, "value") else c.category,
+                    "total": float(c.total),
+                    "entries": c.entries
+                }
+                for c in categories
+            ]
+        }
+    
+    @staticmethod
+    def get_return_summary(db, days: int = 30) -> List[Dict]:
+        """Get supplier returns per supplier"""
+        from sqlalchemy import func
+        from models import SupplierReturn
+        
+        start_date = date.today() - timedelta(days=days)
+        
+        returns = db.query(
+            SupplierReturn.supplier_name,
+            func.sum(SupplierReturn.quantity).label('quantity'),
+            func.sum(SupplierReturn.total_amount).label('total'),
+            func.count(SupplierReturn.id).label('returns')
+        ).filter(
+            SupplierReturn.return_date >= start_date
+        ).group_by(SupplierReturn.supplier_name).all()
+        
+        return [
+            {
+                "name": r.supplier_name,
+                "quantity": float(r.quantity),
+                "total": float(r.total),
+                "returns": r.returns
+            }
+            for r in returns
+        ]
+    
+    @staticmethod
+    def get_salesperson_stats(db, days: int = 30) -> List[Dict]:
+        """Get sales per salesperson"""
+        from sqlalchemy import func
+        from models import DailySalesRollup
+        
+        start_date = date.today() - timedelta(days=days)
+        
+        people = db.query(
+            DailySalesRollup.salesperson_name,
+            func.sum(DailySalesRollup.total_revenue).label('revenue'),
+            func.sum(DailySalesRollup.total_profit).label('profit'),
+            func.sum(DailySalesRollup.total_quantity).label('quantity'),
+            func.sum(DailySalesRollup.sales_count).label('transactions')
+        ).filter(
+            DailySalesRollup.sale_date >= start_date
+        ).group_by(DailySalesRollup.salesperson_name).order_by(
+            func.sum(DailySalesRollup.total_revenue).desc()
+        ).all()
+        
+        return [
+            {
+                "name": p.salesperson_name,
+                "revenue": float(p.revenue),
+                "profit": float(p.profit),
+                "quantity": float(p.quantity),
+                "transactions": int(p.transactions)
+            }
+            for p in people
+        ]
+    
+    @staticmethod
+    def get_forecast(db, days_ahead: int = 7, variety_name: Optional[str] = None) -> Dict:
+        """Forecast shop revenue, or one product's demand when variety_name is given"""
+        from models import ClothVariety
+        from daily_series import load_daily_series
+        from analytics_engine import AnalyticsEngine
+        
+        end_date = date.today()
+        start_date = end_date - timedelta(days=90)
+        
+        if variety_name:
+            variety = db.query(ClothVariety).filter(ClothVariety.name.ilike(variety_name)).first()
+            if variety is None:
+                return {"error": f"No product named '{variety_name}'"}
+            series = load_daily_series(db, start_date, end_date, "variety", keys=[variety.id])
+            values, measure = series.quantity, "quantity"
+        else:
+            series = load_daily_series(db, start_date, end_date)
+            values, measure = series.revenue, "revenue"
+        
+        if series.days_with_sales()[0] < 7:
+            return {"message": "Insufficient sales history (need at least 7 days)"}
+        
+        result = AnalyticsEngine.forecast_series(values[0, series.first_sale_column():], end_date, days_ahead)
+        return {
+            "measure": measure,
+            "product": variety_name,
+            "total_predicted": round(result["total_predicted"], 2),
+            "avg_daily_predicted": round(result["avg_daily_predicted"], 2),
+            "confidence": result["confidence"],
+            "daily": [
+                {"date": f["date"], "predicted": round(f["predicted_revenue"], 2)}
+                for f in result["forecast"]
+            ]
+        }
+
+
+# Typed arguments for the LLM tools
+class SalesPeriodArgs(BaseModel):
+    start_date: date = Field(description="First day of the period (YYYY-MM-DD)")
+    end_date: Optional[date] = Field(None, description="Last day of the period; defaults to start_date")
+
+
+class TopProductsArgs(BaseModel):
+    limit: int = Field(5, ge=1, le=20, description="Number of products to return")
+    days: int = Field(30, ge=1, le=365, description="Look back this many days from today")
+
+
+class LookbackArgs(BaseModel):
+    days: int = Field(30, ge=1, le=365, description="Look back this many days from today")
+
+
+class ForecastArgs(BaseModel):
+    days_ahead: int = Field(7, ge=1, le=90, description="Days to forecast")
+    variety_name: Optional[str] = Field(None, description="Product name for a demand forecast; omit for shop revenue")
+
+
+def build_chat_tools(db) -> List:
+    """ChatbotTools as LLM function calls, bound to this request's session"""
+    specs = [
+        ("get_sales", ChatbotTools.get_sales_by_date, SalesPeriodArgs,
+         "Revenue, profit, quantity and transaction count for a date range"),
+        ("get_top_products", ChatbotTools.get_top_products, TopProductsArgs,
+         "Best selling products by revenue over recent days"),
+        ("get_supplier_summary", ChatbotTools.get_supplier_summary, LookbackArgs,
+         "Amount bought from each supplier over recent days"),
+        ("get_expense_summary", ChatbotTools.get_expense_summary, LookbackArgs,
+         "Expenses per category over recent days"),
+        ("get_return_summary", ChatbotTools.get_return_summary, LookbackArgs,
+         "Goods returned to each supplier over recent days"),
+        ("get_forecast", ChatbotTools.get_forecast, ForecastArgs,
+         "Forecast of shop revenue, or of one product's daily demand"),
+        ("get_salesperson_stats", ChatbotTools.get_salesperson_stats, LookbackArgs,
+         "Revenue, profit and transactions per salesperson over recent days"),
+    ]
+    return [
+        StructuredTool.from_function(
+            func=partial(method, db),
+            name=name,
+            description=description,
+            args_schema=args_schema
+        )
+        for name, method, args_schema, description in specs
+    ]
@@ -0,0 +1,145 @@
+# app/daily_series.py
+
+from datetime import date, timedelta
+from typing import Hashable, List, Optional, Sequence
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models import DailySalesRollup
+from metrics_store import metrics_store, MEASURES
+
+# Rollup column each dimension groups by (None = one series for the whole shop)
+DIMENSIONS = {
+    "total": None,
+    "variety": DailySalesRollup.variety_id,
+    "salesperson": DailySalesRollup.salesperson_name,
+}
+
+
+class DailySeries:
+    """
+    Dense daily rollup totals: one row per key, one column per calendar day
+    from start to end inclusive, zero on days without sales.
+    """
+
+    def __init__(self, start: date, end: date, keys: List[Hashable], arrays: dict):
+        self.start = start
+        self.end = end
+        self.keys = keys
+        self.revenue = arrays["revenue"]
+        self.profit = arrays["profit"]
+        self.quantity = arrays["quantity"]
+        self.sales_count = arrays["sales_count"]
+        self._row_of = {key: row for row, key in enumerate(keys)}
+
+    @property
+    def n_days(self) -> int:
+        return self.revenue.shape[1]
+
+    def row(self, key: Hashable) -> int:
+        return self._row_of[key]
+
+    def dates(self) -> List[date]:
+        return [self.start + timedelta(days=offset) for offset in range(self.n_days)]
+
+    def weekdays(self) -> np.ndarray:
+        return (self.start.weekday() + np.arange(self.n_days)) % 7
+
+    def days_with_sales(self) -> np.ndarray:
+        """Number of days with at least one sale, per row"""
+        return np.count_nonzero(self.sales_count, axis=1)
+
+    def first_sale_column(self, row: int = 0) -> int:
+        """
+        Column of the row's first sale (n_days if it has none), so series can
+        skip the empty days before a shop or product started selling.
+        """
+        sold = np.flatnonzero(self.sales_count[row])
+        return int(sold[0]) if len(sold) else self.n_days
+
+
+def load_daily_series(
+    db: Session,
+    start: date,
+    end: date,
+    dimension: str = "total",
+    keys: Optional[Sequence[Hashable]] = None,
+) -> DailySeries:
+    """
+    One GROUP BY over daily_sales_rollup, scattered into dense arrays.
+    keys fixes the rows and their order (keys without sales stay zero);
+    by default every key that sold in the range is included, sorted.
+    Total and per-variety series come from the shared metrics store when
+    it is built, without touching the database.
+    """
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown dimension '{dimension}'")
+    key_column = DIMENSIONS[dimension]
+
+    if dimension in ("total", "variety"):
+        series = _from_metrics_store(start, end, dimension, keys)
+        if series is not None:
+            return series
+
+    group_by = [DailySalesRollup.sale_date]
+    columns = [DailySalesRollup.sale_date]
+    if key_column is not None:
+        group_by.append(key_column)
+        columns.append(key_column.label("key"))
+
+    query = db.query(
+        *columns,
+        func.sum(DailySalesRollup.total_revenue).label("revenue"),
+        func.sum(DailySalesRollup.total_profit).label("profit"),
+        func.sum(DailySalesRollup.total_quantity).label("quantity"),
+        func.sum(DailySalesRollup.sales_count).label("sales_count")
+    ).filter(
+        DailySalesRollup.sale_date >= start,
+        DailySalesRollup.sale_date <= end
+    )
+    if key_column is not None and keys is not None:
+        query = query.filter(key_column.in_(list(keys)))
+    rows = query.group_by(*group_by).all()
+
+    if key_column is None:
+        keys = [None]
+    elif keys is None:
+        keys = sorted({row.key for row in rows})
+    else:
+        keys = list(keys)
+
+    shape = (len(keys), (end - start).days + 1)
+    arrays = {measure: np.zeros(shape) for measure in MEASURES}
+    if rows:
+        count = len(rows)
+        cols = np.fromiter(((row.sale_date - start).days for row in rows), dtype=np.intp, count=count)
+        if key_column is None:
+            index = np.zeros(count, dtype=np.intp)
+        else:
+            row_of = {key: row for row, key in enumerate(keys)}
+            index = np.fromiter((row_of[row.key] for row in rows), dtype=np.intp, count=count)
+        for measure in MEASURES:
+            values = np.fromiter((float(getattr(row, measure)) for row in rows), dtype=float, count=count)
+            np.add.at(arrays[measure], (index, cols), values)
+
+    return DailySeries(start, end, keys, arrays)
+
+
+def _from_metrics_store(start: date, end: date, dimension: str,
+                        keys: Optional[Sequence[Hashable]]) -> Optional[DailySeries]:
+    stored = metrics_store.read(start, end, None if dimension == "total" else keys)
+    if stored is None:
+        return None
+    variety_ids, arrays = stored
+
+    if dimension == "total":
+        arrays = {measure: values.sum(axis=0, keepdims=True) for measure, values in arrays.items()}
+        return DailySeries(start, end, [None], arrays)
+
+    if keys is None:
+        # Only varieties that sold in the range, sorted, as the query path returns
+        sold = arrays["sales_count"].any(axis=1)
+        order = sorted(np.flatnonzero(sold), key=lambda row: variety_ids[row])
+        variety_ids = [variety_ids[row] for row in order]
+        arrays = {measure: values[order] for measure, values in arrays.items()}
+    return DailySeries(start, end, list(variety_ids), arrays)
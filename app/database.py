@@ -3,14 +3,54 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import os
+from db_pool import pool_options
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def _async_url(url: str):
+    """Swap the sync driver in DATABASE_URL for its async counterpart"""
+    if not url or "://" not in url:
+        return None
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        return None
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for routes declared with `async def`; these run on the event
+# loop instead of occupying one of Starlette's threadpool workers
+# (SQLAlchemy's asyncio extension needs greenlet; without it or the driver
+# the app still starts, and async routes report the engine as unconfigured)
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, use_async=True)
+    ) if ASYNC_DATABASE_URL else None
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    ) if async_engine else None
+    ASYNC_ENGINE_ERROR = None if async_engine else f"no async driver is known for {DATABASE_URL}"
+except (ImportError, ValueError) as e:
+    async_engine = None
+    AsyncSessionLocal = None
+    ASYNC_ENGINE_ERROR = str(e)
+    print(f"⚠️ Warning: async database support not available ({e}).")
+    print("   Install with: pip install greenlet aiosqlite (or asyncpg / aiomysql)")
+
 Base = declarative_base()
 
 def get_db():
@@ -20,5 +60,22 @@ def get_db():
     finally:
         db.close()
 
+def require_async_engine():
+    """Called at startup: the sales routes cannot run without the async engine"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError(
+            f"Async database engine is not configured ({ASYNC_ENGINE_ERROR}). "
+            "Set ASYNC_DATABASE_URL or install the async driver for DATABASE_URL."
+        )
+
+async def get_async_db():
+    require_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
+    # create_all only adds missing tables; indexes and data changes on
+    # existing tables go through the versioned steps in migrations.py
+    from migrations import run_migrations
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
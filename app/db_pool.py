@@ -0,0 +1,125 @@
+# app/db_pool.py
+
+import os
+import threading
+import time
+from typing import Dict
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolWaitStats:
+    """Thread-safe counters for how long checkouts wait on the pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class _TimedCheckoutMixin:
+    """Times every checkout, including the wait for a free connection"""
+
+    wait_stats: PoolWaitStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return conn
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    wait_stats = PoolWaitStats()
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    wait_stats = PoolWaitStats()
+
+
+def _env_int(name: str):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+
+def pool_options(url: str, use_async: bool = False) -> Dict:
+    """
+    Engine keyword arguments from the DB_POOL_* environment variables:
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE (seconds),
+    DB_POOL_TIMEOUT (seconds) and DB_POOL_PRE_PING (true/false).
+    Unset values keep SQLAlchemy's defaults.
+    """
+    options = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+    recycle = _env_int("DB_POOL_RECYCLE")
+    if recycle is not None:
+        options["pool_recycle"] = recycle
+
+    # SQLite keeps its own single-file/single-thread pools
+    if url and url.startswith("sqlite"):
+        return options
+
+    options["poolclass"] = InstrumentedAsyncQueuePool if use_async else InstrumentedQueuePool
+    for env_name, option in (
+        ("DB_POOL_SIZE", "pool_size"),
+        ("DB_MAX_OVERFLOW", "max_overflow"),
+        ("DB_POOL_TIMEOUT", "pool_timeout"),
+    ):
+        value = _env_int(env_name)
+        if value is not None:
+            options[option] = value
+    return options
+
+
+def pool_status(engine) -> Dict:
+    """Live occupancy and wait statistics for an engine's pool"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # overflow() counts from -pool_size upwards; only positive values are extra connections
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+        })
+    else:
+        status["status"] = pool.status()
+
+    if isinstance(pool, _TimedCheckoutMixin):
+        status["wait"] = pool.wait_stats.snapshot()
+    return status
@@ -0,0 +1,135 @@
+# app/forecast_cache.py
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+import numpy as np
+
+
+def series_fingerprint(namespace: str, *parts: Any) -> str:
+    """
+    Stable hash of a forecast's inputs. Arrays are hashed by dtype, shape
+    and raw bytes; everything else by its JSON form.
+    """
+    digest = hashlib.sha256(namespace.encode())
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            array = np.ascontiguousarray(part)
+            digest.update(f"{array.dtype}{array.shape}".encode())
+            digest.update(array.tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+class ForecastCache:
+    """
+    LRU memo of fitted forecasts keyed by series_fingerprint. The same
+    history, horizon and options always give the same result, so entries
+    never expire; they are only evicted. With a directory set, results
+    are also written there as JSON and survive restarts.
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _remember(self, key: str, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _read_disk(self, key: str):
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, value: Any):
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError) as e:
+            print(f"⚠️ Could not persist forecast {key[:12]}: {e}")
+
+    def _lookup(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+
+        value = self._read_disk(key) if self.directory else None
+        if value is not None:
+            with self._lock:
+                self.disk_hits += 1
+                self._remember(key, value)
+            return copy.deepcopy(value)
+        return None
+
+    def _store(self, key: str, value: Any):
+        with self._lock:
+            self.misses += 1
+            self._remember(key, value)
+        if self.directory:
+            self._write_disk(key, value)
+        return copy.deepcopy(value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]):
+        """Return the cached result for key, computing and storing it on a miss"""
+        value = self._lookup(key)
+        if value is not None:
+            return value
+        return self._store(key, compute())
+
+    async def get_or_compute_async(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        """Same as get_or_compute, awaiting compute() on a miss"""
+        value = self._lookup(key)
+        if value is not None:
+            return value
+        return self._store(key, await compute())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "directory": self.directory,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0,
+                "evictions": self.evictions,
+            }
+
+
+forecast_cache = ForecastCache(
+    max_entries=int(os.getenv("FORECAST_CACHE_MAX_ENTRIES", "256")),
+    directory=os.getenv("FORECAST_CACHE_DIR") or None,
+)
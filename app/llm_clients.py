@@ -0,0 +1,115 @@
+# app/llm_clients.py
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+except ImportError:
+    # chatbot_engine prints the install hint
+    ChatGoogleGenerativeAI = None
+
+CHAT_MODEL = os.getenv("CHATBOT_MODEL", "gemini-2.5-flash")
+CHAT_TEMPERATURE = float(os.getenv("CHATBOT_TEMPERATURE", "0.7"))
+
+
+class LLMClientRegistry:
+    """
+    Process-wide LLM clients, built once and shared by every chat request
+    so their HTTP connections stay pooled between messages. Built from the
+    app lifespan; get() also builds lazily for scripts that skip it.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.setup_seconds: Dict[str, float] = {}
+        self.reuses = 0
+        self.error: Optional[str] = None
+        self._usage: Dict[str, Dict] = {}
+
+    def _build_chat(self):
+        if ChatGoogleGenerativeAI is None:
+            self.error = "langchain_not_installed"
+            return None
+
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            print("⚠️ Warning: GOOGLE_API_KEY not found in environment variables")
+            self.error = "no_api_key"
+            return None
+
+        try:
+            return ChatGoogleGenerativeAI(
+                model=CHAT_MODEL,
+                google_api_key=api_key,
+                temperature=CHAT_TEMPERATURE,
+                convert_system_message_to_human=True
+            )
+        except Exception as e:
+            print(f"Error initializing Gemini: {e}")
+            self.error = str(e)
+            return None
+
+    def start(self):
+        self.get("chat")
+
+    def get(self, name: str = "chat"):
+        """Shared client for name, or None when the LLM is not configured"""
+        with self._lock:
+            if name in self._clients:
+                self.reuses += 1
+                return self._clients[name]
+
+            started = time.perf_counter()
+            client = self._build_chat() if name == "chat" else None
+            self.setup_seconds[name] = round(time.perf_counter() - started, 4)
+            # Unconfigured clients are remembered too, so env lookups are not repeated per message
+            self._clients[name] = client
+            return client
+
+    def record_usage(self, usage: Dict):
+        """Add one reply's token counts and latency to its prompt mode's totals"""
+        with self._lock:
+            totals = self._usage.setdefault(
+                usage["mode"],
+                {"replies": 0, "prompt_tokens": 0, "completion_tokens": 0, "tool_calls": 0, "latency_ms": 0.0}
+            )
+            totals["replies"] += 1
+            totals["prompt_tokens"] += usage["prompt_tokens"]
+            totals["completion_tokens"] += usage["completion_tokens"]
+            totals["tool_calls"] += len(usage["tool_calls"])
+            totals["latency_ms"] += usage["latency_ms"]
+
+    def _usage_summary(self) -> Dict:
+        return {
+            mode: {
+                "replies": totals["replies"],
+                "avg_prompt_tokens": round(totals["prompt_tokens"] / totals["replies"], 1),
+                "avg_completion_tokens": round(totals["completion_tokens"] / totals["replies"], 1),
+                "avg_tool_calls": round(totals["tool_calls"] / totals["replies"], 2),
+                "avg_latency_ms": round(totals["latency_ms"] / totals["replies"], 1),
+            }
+            for mode, totals in self._usage.items()
+        }
+
+    def close(self):
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "model": CHAT_MODEL,
+                "clients": {name: client is not None for name, client in self._clients.items()},
+                "setup_seconds": dict(self.setup_seconds),
+                "reuses": self.reuses,
+                "error": self.error,
+                # Per prompt mode ("context" = full data dump, "tools" = tool calling)
+                "usage": self._usage_summary(),
+            }
+
+
+llm_clients = LLMClientRegistry()
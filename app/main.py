@@ -1,20 +1,41 @@
 # app/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-from database import init_db
-from routes import varieties, supplier, sales, reports, predictions, chatbot, expenses, voice_sales
+from database import init_db, require_async_engine, engine, async_engine, SessionLocal
+from db_pool import pool_status
+from report_cache import report_cache
+from forecast_cache import forecast_cache
+from metrics_store import metrics_store
+from analytics_pool import analytics_pool, AnalyticsTimeout
+from llm_clients import llm_clients
+from change_versions import NotModified
+from routes import varieties, supplier, sales, reports, predictions, chatbot, expenses, voice_sales, export, analytics
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler"""
     # Startup
     print("Starting database initialization...")
+    require_async_engine()
     init_db()
     print("Database initialization complete!")
+    if metrics_store.enabled:
+        db = SessionLocal()
+        try:
+            metrics_store.ensure_built(db)
+        finally:
+            db.close()
+    analytics_pool.start()
+    llm_clients.start()
     yield
-    # Shutdown (if needed)
+    # Shutdown
     print("Application shutting down...")
+    analytics_pool.shutdown()
+    llm_clients.close()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 app = FastAPI(
     title="Cloth Shop Management System with AI",
@@ -30,8 +51,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+@app.exception_handler(NotModified)
+async def not_modified_handler(request: Request, exc: NotModified):
+    """Answer a conditional GET whose ETag still matches"""
+    return Response(status_code=304, headers={"ETag": exc.etag})
+
+@app.exception_handler(AnalyticsTimeout)
+async def analytics_timeout_handler(request: Request, exc: AnalyticsTimeout):
+    """Analytics job exceeded ANALYTICS_POOL_TIMEOUT"""
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
 # Include routers
 app.include_router(varieties.router)
 app.include_router(supplier.router)
@@ -41,6 +73,8 @@ app.include_router(predictions.router)
 app.include_router(chatbot.router)
 app.include_router(expenses.router)
 app.include_router(voice_sales.router)
+app.include_router(export.router)
+app.include_router(analytics.router)
 
 @app.get("/")
 def root():
@@ -69,4 +103,37 @@ def health_check():
         "ai_enabled": True,
         "chatbot_enabled": True,
         "voice_enabled": True  # NEW
-    }
\ No newline at end of file
+    }
+
+@app.get("/health/db-pool")
+def db_pool_health():
+    """Connection pool occupancy and checkout wait times"""
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine) if async_engine is not None else None
+    }
+
+@app.get("/health/cache")
+def report_cache_health():
+    """Report cache size and hit/miss counters for this worker"""
+    return report_cache.stats()
+
+@app.get("/health/forecast-cache")
+def forecast_cache_health():
+    """Forecast memo size and hit rate for this worker"""
+    return forecast_cache.stats()
+
+@app.get("/health/analytics-pool")
+def analytics_pool_health():
+    """Process pool occupancy and inline/timeout counters for this worker"""
+    return analytics_pool.stats()
+
+@app.get("/health/metrics-store")
+def metrics_store_health():
+    """Layout of the shared memory-mapped daily metrics store"""
+    return metrics_store.status()
+
+@app.get("/health/llm-clients")
+def llm_clients_health():
+    """Shared LLM clients, their one-time setup cost and reuse count"""
+    return llm_clients.stats()
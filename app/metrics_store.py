@@ -0,0 +1,411 @@
+# app/metrics_store.py
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models import DailySalesRollup
+
+try:
+    import fcntl
+except ImportError:
+    # No flock on Windows: writes are only serialized within one process
+    fcntl = None
+
+MEASURES = ("revenue", "profit", "quantity", "sales_count")
+
+META_FILE = "meta.json"
+LOCK_FILE = "store.lock"
+
+# Growth steps, so appends rarely have to copy the arrays
+DAY_BLOCK = 366
+VARIETY_BLOCK = 256
+
+
+def _round_up(value: int, block: int) -> int:
+    return max(block, -(-value // block) * block)
+
+
+class MetricsStore:
+    """
+    Per-variety daily totals in np.memmap files, one float64 file per measure,
+    laid out day-major: row = day since meta["epoch"], column = variety slot.
+    A date range is therefore one contiguous block of rows.
+
+    Every worker maps the current generation read-only and remaps when
+    meta.json is replaced. Writers take an flock on store.lock, add committed
+    sale deltas in place and, when a new day or variety does not fit, copy the
+    data into a larger generation. rebuild() recreates the files from
+    daily_sales_rollup and verify() compares the two.
+    """
+
+    def __init__(self, directory: Optional[str]):
+        self.directory = directory
+        self._read_lock = threading.Lock()
+        self._write_mutex = threading.Lock()
+        self._stamp = None
+        self._meta_file = None
+        self._meta = None
+        self._arrays = None
+        self._column_of: Dict[int, int] = {}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _array_path(self, measure: str, generation: int) -> str:
+        return self._path(f"{measure}.{generation}.f8")
+
+    def _load_meta(self) -> Optional[Dict]:
+        try:
+            with open(self._path(META_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, meta: Dict):
+        tmp_path = self._path(f"{META_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path(META_FILE))
+
+    def _map(self, meta: Dict, mode: str) -> Dict[str, np.memmap]:
+        shape = (meta["days"], meta["variety_capacity"])
+        return {
+            measure: np.memmap(self._array_path(measure, meta["generation"]),
+                               dtype=np.float64, mode=mode, shape=shape)
+            for measure in MEASURES
+        }
+
+    def _remove_generation(self, generation: int):
+        # Workers still mapping the old files keep them alive until they remap
+        for measure in MEASURES:
+            try:
+                os.remove(self._array_path(measure, generation))
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def _write_lock(self):
+        with self._write_mutex:
+            if fcntl is None:
+                yield
+                return
+            with open(self._path(LOCK_FILE), "a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _current(self):
+        """Read-only mapping of the latest generation, or None before the first build"""
+        try:
+            stat = os.stat(self._path(META_FILE))
+        except FileNotFoundError:
+            return None
+
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        with self._read_lock:
+            if stamp != self._stamp:
+                try:
+                    meta_file = open(self._path(META_FILE))
+                except FileNotFoundError:
+                    return None
+                with meta_file:
+                    meta = json.load(meta_file)
+                    stat = os.fstat(meta_file.fileno())
+                    if fcntl is not None:
+                        # Two writes can land in the same mtime tick, so only a
+                        # new inode reliably marks a new meta.json. Keeping the
+                        # mapped one open stops a later file from reusing its inode.
+                        # (Windows cannot replace a file that is held open.)
+                        previous, self._meta_file = self._meta_file, os.dup(meta_file.fileno())
+                        if previous is not None:
+                            os.close(previous)
+                self._arrays = self._map(meta, "r")
+                self._column_of = {variety_id: col for col, variety_id in enumerate(meta["varieties"])}
+                self._meta = meta
+                self._stamp = (stat.st_ino, stat.st_mtime_ns)
+            return self._meta, self._arrays, self._column_of
+
+    def is_built(self) -> bool:
+        return self.enabled and self._current() is not None
+
+    def status(self) -> Dict:
+        current = self._current() if self.enabled else None
+        if current is None:
+            return {"enabled": self.enabled, "built": False}
+        meta = current[0]
+        return {
+            "enabled": True,
+            "built": True,
+            "directory": self.directory,
+            "generation": meta["generation"],
+            "epoch": meta["epoch"],
+            "days": meta["days"],
+            "varieties": len(meta["varieties"]),
+            "variety_capacity": meta["variety_capacity"],
+        }
+
+    # Reads
+
+    def read(self, start: date, end: date,
+             variety_ids: Optional[Sequence[int]] = None) -> Optional[Tuple[List[int], Dict[str, np.ndarray]]]:
+        """
+        Daily totals per variety from start to end inclusive as arrays shaped
+        (variety, day), plus the variety ids of the rows. variety_ids=None
+        returns every variety in the store. None when the store is not built.
+        """
+        current = self._current() if self.enabled else None
+        if current is None:
+            return None
+        meta, arrays, column_of = current
+
+        keys = list(meta["varieties"]) if variety_ids is None else list(variety_ids)
+        n_days = (end - start).days + 1
+        result = {measure: np.zeros((len(keys), n_days)) for measure in MEASURES}
+
+        offset = (start - date.fromisoformat(meta["epoch"])).days
+        lo = max(offset, 0)
+        hi = min(offset + n_days, meta["days"])
+        rows = [row for row, key in enumerate(keys) if key in column_of]
+        if lo < hi and rows:
+            cols = np.fromiter((column_of[keys[row]] for row in rows), dtype=np.intp, count=len(rows))
+            for measure in MEASURES:
+                block = arrays[measure][lo:hi]
+                result[measure][rows, lo - offset:hi - offset] = block[:, cols].T
+        return keys, result
+
+    # Writes
+
+    def _grow(self, meta: Dict, first_day: date, last_day: date, new_varieties: List[int]) -> Dict:
+        """Copy the data into a generation that covers the given days and varieties"""
+        epoch = date.fromisoformat(meta["epoch"])
+        covered_end = epoch + timedelta(days=meta["days"] - 1)
+        new_epoch = epoch
+        if first_day < epoch:
+            # Whole blocks back, so a run of older backfilled sales copies once
+            new_epoch = epoch - timedelta(days=_round_up((epoch - first_day).days, DAY_BLOCK))
+        new_end = covered_end if last_day <= covered_end else last_day + timedelta(days=DAY_BLOCK)
+        varieties = meta["varieties"] + new_varieties
+
+        grown = {
+            "generation": meta["generation"] + 1,
+            "epoch": new_epoch.isoformat(),
+            "days": (new_end - new_epoch).days + 1,
+            "varieties": varieties,
+            "variety_capacity": _round_up(len(varieties), VARIETY_BLOCK),
+        }
+        old_arrays = self._map(meta, "r")
+        new_arrays = self._map(grown, "w+")
+        shift = (epoch - new_epoch).days
+        width = len(meta["varieties"])
+        for measure in MEASURES:
+            new_arrays[measure][shift:shift + meta["days"], :width] = old_arrays[measure][:, :width]
+            new_arrays[measure].flush()
+
+        self._write_meta(grown)
+        self._remove_generation(meta["generation"])
+        return grown
+
+    def apply(self, deltas: Iterable[Tuple[date, int, float, float, float, float]]):
+        """
+        Add committed (sale_date, variety_id, revenue, profit, quantity, count)
+        deltas. Before the first build this is a no-op; rebuild() reads the
+        database anyway. Deltas lost to a crash after commit are repaired by
+        ensure_built() on the next start.
+        """
+        deltas = list(deltas)
+        if not self.enabled or not deltas:
+            return
+
+        with self._write_lock():
+            meta = self._load_meta()
+            if meta is None:
+                return
+
+            epoch = date.fromisoformat(meta["epoch"])
+            days = [delta[0] for delta in deltas]
+            known = set(meta["varieties"])
+            new_varieties = sorted({delta[1] for delta in deltas} - known)
+            last_covered = epoch + timedelta(days=meta["days"] - 1)
+            if (min(days) < epoch or max(days) > last_covered
+                    or len(known) + len(new_varieties) > meta["variety_capacity"]):
+                meta = self._grow(meta, min(days), max(days), new_varieties)
+                epoch = date.fromisoformat(meta["epoch"])
+            elif new_varieties:
+                # Spare columns are already zero; only the slot list changes
+                meta["varieties"] = meta["varieties"] + new_varieties
+                self._write_meta(meta)
+
+            column_of = {variety_id: col for col, variety_id in enumerate(meta["varieties"])}
+            rows = np.fromiter(((day - epoch).days for day in days), dtype=np.intp, count=len(deltas))
+            cols = np.fromiter((column_of[delta[1]] for delta in deltas), dtype=np.intp, count=len(deltas))
+            values = np.array([delta[2:] for delta in deltas], dtype=np.float64)
+
+            arrays = self._map(meta, "r+")
+            for i, measure in enumerate(MEASURES):
+                np.add.at(arrays[measure], (rows, cols), values[:, i])
+                arrays[measure].flush()
+
+    def clear_variety(self, variety_id: int):
+        """Zero a deleted variety's column (its rollup rows were cascaded away)"""
+        if not self.enabled:
+            return
+        with self._write_lock():
+            meta = self._load_meta()
+            if meta is None or variety_id not in meta["varieties"]:
+                return
+            col = meta["varieties"].index(variety_id)
+            arrays = self._map(meta, "r+")
+            for measure in MEASURES:
+                arrays[measure][:, col] = 0
+                arrays[measure].flush()
+
+    # Maintenance
+
+    def _database_totals(self, db: Session):
+        return db.query(
+            DailySalesRollup.sale_date,
+            DailySalesRollup.variety_id,
+            func.sum(DailySalesRollup.total_revenue).label("revenue"),
+            func.sum(DailySalesRollup.total_profit).label("profit"),
+            func.sum(DailySalesRollup.total_quantity).label("quantity"),
+            func.sum(DailySalesRollup.sales_count).label("sales_count")
+        ).group_by(DailySalesRollup.sale_date, DailySalesRollup.variety_id).all()
+
+    def _scatter(self, rows, epoch: date, varieties: List[int], shape) -> Dict[str, np.ndarray]:
+        column_of = {variety_id: col for col, variety_id in enumerate(varieties)}
+        day_index = np.fromiter(((row.sale_date - epoch).days for row in rows), dtype=np.intp, count=len(rows))
+        col_index = np.fromiter((column_of[row.variety_id] for row in rows), dtype=np.intp, count=len(rows))
+        dense = {}
+        for measure in MEASURES:
+            dense[measure] = np.zeros(shape)
+            values = np.fromiter((float(getattr(row, measure)) for row in rows), dtype=float, count=len(rows))
+            np.add.at(dense[measure], (day_index, col_index), values)
+        return dense
+
+    def _rebuild_locked(self, rows) -> Dict:
+        previous = self._load_meta()
+        today = date.today()
+        epoch = min((row.sale_date for row in rows), default=today)
+        last_day = max([row.sale_date for row in rows] + [today])
+        varieties = sorted({row.variety_id for row in rows})
+
+        meta = {
+            "generation": previous["generation"] + 1 if previous else 1,
+            "epoch": epoch.isoformat(),
+            "days": (last_day - epoch).days + 1 + DAY_BLOCK,
+            "varieties": varieties,
+            "variety_capacity": _round_up(len(varieties) + 1, VARIETY_BLOCK),
+        }
+        shape = (meta["days"], meta["variety_capacity"])
+        dense = self._scatter(rows, epoch, varieties, shape)
+        arrays = self._map(meta, "w+")
+        for measure in MEASURES:
+            arrays[measure][:] = dense[measure]
+            arrays[measure].flush()
+
+        self._write_meta(meta)
+        if previous:
+            self._remove_generation(previous["generation"])
+        return {"varieties": len(varieties), "days": meta["days"], "epoch": meta["epoch"]}
+
+    def rebuild(self, db: Session) -> Dict:
+        """Recreate the store from daily_sales_rollup"""
+        # Read under the lock so no apply() lands between the read and the swap
+        with self._write_lock():
+            return self._rebuild_locked(self._database_totals(db))
+
+    def ensure_built(self, db: Session):
+        """
+        Build the store on first start, or rebuild it when it no longer matches
+        daily_sales_rollup (e.g. a crash between a sale's commit and its apply).
+        Workers that start later find it built and in sync.
+        """
+        if not self.enabled:
+            return
+        with self._write_lock():
+            rows = self._database_totals(db)
+            if self._load_meta() is None:
+                self._rebuild_locked(rows)
+                return
+            report = self._compare(rows)
+            if not report["ok"]:
+                print(f"⚠️ Metrics store out of sync with daily_sales_rollup "
+                      f"({report.get('mismatches')}); rebuilding")
+                self._rebuild_locked(rows)
+
+    def verify(self, db: Session, tolerance: float = 0.005) -> Dict:
+        """Compare every cell of the store with daily_sales_rollup"""
+        if not self.enabled:
+            return {"ok": False, "error": "metrics store is not built"}
+        with self._write_lock():
+            return self._compare(self._database_totals(db), tolerance)
+
+    def _compare(self, rows, tolerance: float = 0.005) -> Dict:
+        current = self._current()
+        if current is None:
+            return {"ok": False, "error": "metrics store is not built"}
+        meta = current[0]
+
+        epoch = date.fromisoformat(meta["epoch"])
+        first_day = min([row.sale_date for row in rows] + [epoch])
+        last_day = max([row.sale_date for row in rows] + [epoch + timedelta(days=meta["days"] - 1)])
+        varieties = sorted(set(meta["varieties"]) | {row.variety_id for row in rows})
+
+        shape = ((last_day - first_day).days + 1, len(varieties))
+        expected = self._scatter(rows, first_day, varieties, shape)
+        _, stored = self.read(first_day, last_day, varieties)
+
+        mismatches = {}
+        max_diff = 0.0
+        for measure in MEASURES:
+            diff = np.abs(stored[measure] - expected[measure].T)
+            mismatches[measure] = int(np.count_nonzero(diff > tolerance))
+            max_diff = max(max_diff, float(diff.max()) if diff.size else 0.0)
+
+        return {
+            "ok": not any(mismatches.values()),
+            "cells_checked": shape[0] * shape[1],
+            "mismatches": mismatches,
+            "max_abs_diff": round(max_diff, 6),
+        }
+
+
+metrics_store = MetricsStore(os.getenv("METRICS_STORE_DIR") or None)
+
+
+if __name__ == "__main__":
+    # python metrics_store.py rebuild|verify (run from the app directory
+    # with METRICS_STORE_DIR set, e.g. after python rollup.py)
+    import sys
+    from database import SessionLocal
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    if not metrics_store.enabled:
+        sys.exit("METRICS_STORE_DIR is not set")
+
+    session = SessionLocal()
+    try:
+        if command == "rebuild":
+            print(f"Rebuilt metrics store: {metrics_store.rebuild(session)}")
+        elif command == "verify":
+            report = metrics_store.verify(session)
+            print(json.dumps(report, indent=2))
+            sys.exit(0 if report["ok"] else 1)
+        else:
+            sys.exit(f"Unknown command '{command}' (expected rebuild or verify)")
+    finally:
+        session.close()
@@ -0,0 +1,136 @@
+# app/migrations.py
+
+import time
+from sqlalchemy import select, insert, update, inspect, text
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+from models import Base, SchemaMigration, Sale, TableVersion
+
+
+def _create_indexes(conn, names):
+    """
+    Create the named indexes declared in models.py, skipping ones that exist
+    (and names no longer declared, such as those dropped by migration 5)
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in names:
+                index.create(conn, checkfirst=True)
+
+
+def _add_access_path_indexes(conn):
+    _create_indexes(conn, {
+        "ix_sales_variety_id",
+        "ix_sales_sale_date_variety_id",
+        "ix_sales_salesperson_name_sale_date",
+        "ix_supplier_inventory_variety_id",
+        "ix_supplier_inventory_supplier_name_supply_date",
+        "ix_supplier_returns_variety_id",
+        "ix_supplier_returns_supplier_name_return_date",
+        "ix_expenses_expense_date_category",
+        "ix_daily_sales_rollup_variety_id_sale_date",
+    })
+
+
+def _backfill_daily_sales_rollup(conn):
+    from rollup import rebuild_daily_sales_rollup
+    # Sale.revenue does not exist yet at this version
+    rebuild_daily_sales_rollup(
+        Session(bind=conn), revenue=Sale.selling_price * Sale.quantity
+    )
+
+
+def _add_sale_revenue(conn):
+    columns = {column["name"] for column in inspect(conn).get_columns("sales")}
+    if "revenue" not in columns:
+        conn.execute(text("ALTER TABLE sales ADD COLUMN revenue DECIMAL(16, 4)"))
+    conn.execute(
+        update(Sale.__table__)
+        .where(Sale.__table__.c.revenue.is_(None))
+        .values(revenue=Sale.__table__.c.selling_price * Sale.__table__.c.quantity)
+    )
+    _create_indexes(conn, {"ix_sales_sale_date_revenue_profit"})
+
+
+def _seed_table_versions(conn):
+    from change_versions import TRACKED_TABLES
+    existing = set(conn.execute(select(TableVersion.table_name)).scalars())
+    for table_name in TRACKED_TABLES:
+        if table_name not in existing:
+            conn.execute(insert(TableVersion).values(table_name=table_name, version=0))
+
+
+def _drop_unused_sales_indexes(conn):
+    # Reports and predictions read daily_sales_rollup; the remaining sales
+    # queries (paged list, by date, by salesperson) use the single-column indexes.
+    # Revenue totals come from the rollup too, so the (sale_date, revenue,
+    # profit) covering index from migration 3 no longer serves any read
+    existing = {index["name"] for index in inspect(conn).get_indexes("sales")}
+    for name in (
+        "ix_sales_sale_date_variety_id",
+        "ix_sales_salesperson_name_sale_date",
+        "ix_sales_sale_date_revenue_profit",
+    ):
+        if name in existing:
+            on_table = " ON sales" if conn.dialect.name == "mysql" else ""
+            conn.execute(text(f"DROP INDEX {name}{on_table}"))
+
+
+# Append new migrations at the end; never renumber or edit applied ones
+MIGRATIONS = [
+    (1, "Add foreign-key and composite access-path indexes", _add_access_path_indexes),
+    (2, "Backfill daily_sales_rollup from existing sales", _backfill_daily_sales_rollup),
+    (3, "Add persisted sales.revenue and backfill it", _add_sale_revenue),
+    (4, "Seed table_versions change counters", _seed_table_versions),
+    (5, "Drop sales composite indexes superseded by daily_sales_rollup", _drop_unused_sales_indexes),
+]
+
+# How long a starting worker waits for another worker's migration to finish
+LOCK_WAIT_SECONDS = 300
+
+
+def _apply(engine, version, description, migrate) -> bool:
+    """
+    Claim the version, then apply it in the same transaction. Returns False
+    when another process has already recorded it.
+    """
+    try:
+        with engine.begin() as conn:
+            # Inserted first: a worker starting at the same time blocks on this
+            # row and then fails its insert instead of running the step twice
+            conn.execute(insert(SchemaMigration).values(
+                version=version, description=description
+            ))
+            print(f"Applying migration {version}: {description}")
+            migrate(conn)
+        return True
+    except IntegrityError:
+        return False
+
+
+def run_migrations(engine):
+    """Apply every migration newer than the database's recorded version"""
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(SchemaMigration.version)).scalars())
+
+    for version, description, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while True:
+            try:
+                if not _apply(engine, version, description, migrate):
+                    print(f"Migration {version} was applied by another worker")
+                break
+            except OperationalError as e:
+                # SQLite gives up on its write lock after a few seconds while
+                # another worker is still migrating; wait for it to commit
+                if "locked" not in str(e.orig) or time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+
+
+if __name__ == "__main__":
+    # python migrations.py (run from the app directory)
+    from database import init_db
+    init_db()
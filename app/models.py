@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, Date, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, Date, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -53,6 +53,10 @@ class ClothVariety(Base):
 
 class SupplierInventory(Base):
     __tablename__ = "supplier_inventory"
+    __table_args__ = (
+        Index("ix_supplier_inventory_variety_id", "variety_id"),
+        Index("ix_supplier_inventory_supplier_name_supply_date", "supplier_name", "supply_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     supplier_name = Column(String(100), nullable=False, index=True)
@@ -73,6 +77,10 @@ class SupplierInventory(Base):
 
 class SupplierReturn(Base):
     __tablename__ = "supplier_returns"
+    __table_args__ = (
+        Index("ix_supplier_returns_variety_id", "variety_id"),
+        Index("ix_supplier_returns_supplier_name_return_date", "supplier_name", "return_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     supplier_name = Column(String(100), nullable=False, index=True)
@@ -94,6 +102,9 @@ class SupplierReturn(Base):
 
 class Sale(Base):
     __tablename__ = "sales"
+    __table_args__ = (
+        Index("ix_sales_variety_id", "variety_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     salesperson_name = Column(String(100), nullable=False, index=True)
@@ -107,12 +118,36 @@ class Sale(Base):
     selling_price = Column(DECIMAL(10, 2), nullable=False)
     cost_price = Column(DECIMAL(10, 2), nullable=False)
     profit = Column(DECIMAL(10, 2), nullable=False)
+    # selling_price * quantity, persisted so aggregates sum a column. Revenue
+    # totals are read from daily_sales_rollup, which is kept from this column
+    # line by line; only a full rollup rebuild sums it, so it has no index
+    revenue = Column(DECIMAL(16, 4), nullable=False)
     sale_date = Column(Date, nullable=False, index=True)
     sale_timestamp = Column(DateTime, server_default=func.now())
     
     # Relationships
     variety = relationship("ClothVariety", back_populates="sales")
 
+class DailySalesRollup(Base):
+    """Per-day sales totals, kept in step with the sales table by create/delete"""
+    __tablename__ = "daily_sales_rollup"
+    __table_args__ = (
+        Index("ix_daily_sales_rollup_variety_id_sale_date", "variety_id", "sale_date"),
+    )
+
+    sale_date = Column(Date, primary_key=True)
+    variety_id = Column(
+        Integer,
+        ForeignKey("cloth_varieties.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    salesperson_name = Column(String(100), primary_key=True)
+
+    total_revenue = Column(DECIMAL(16, 4), nullable=False, default=0)
+    total_profit = Column(DECIMAL(14, 2), nullable=False, default=0)
+    total_quantity = Column(DECIMAL(14, 2), nullable=False, default=0)
+    sales_count = Column(Integer, nullable=False, default=0)
+
 # app/models.py - ADD THIS TO YOUR EXISTING MODELS
 
 class ExpenseCategory(str, enum.Enum):
@@ -129,6 +164,9 @@ class ExpenseCategory(str, enum.Enum):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_expense_date_category", "expense_date", "category"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     category = Column(
@@ -142,4 +180,19 @@ class Expense(Base):
     amount = Column(DECIMAL(10, 2), nullable=False)
     expense_date = Column(Date, nullable=False, index=True)
     description = Column(Text)
-    created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime, server_default=func.now())
+
+class SchemaMigration(Base):
+    """One row per applied migration in migrations.py"""
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True)
+    description = Column(String(200), nullable=False)
+    applied_at = Column(DateTime, server_default=func.now())
+
+class TableVersion(Base):
+    """Change counter per table, bumped in the same transaction as each write"""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,79 @@
+# app/pagination.py
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+from typing import Optional, Tuple, List
+from datetime import date
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+
+def encode_cursor(row_date: date, row_id: int) -> str:
+    """Build an opaque cursor from the last row's (date, id) key"""
+    return f"{row_date.isoformat()}_{row_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Parse a cursor produced by encode_cursor"""
+    try:
+        date_part, id_part = cursor.split("_", 1)
+        return date.fromisoformat(date_part), int(id_part)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor '{cursor}'"
+        )
+
+
+def keyset_paginate(query, date_column, id_column, response: Response,
+                    start: Optional[date] = None, end: Optional[date] = None,
+                    cursor: Optional[str] = None, limit: Optional[int] = None,
+                    descending: bool = False) -> List:
+    """
+    Apply date-range filtering and keyset pagination on (date_column, id_column).
+
+    Pagination is opt-in: without limit or cursor every matching row is
+    returned, as before pagination existed. Otherwise returns one page of
+    rows (DEFAULT_PAGE_SIZE when only a cursor is given) and, when more rows
+    follow, sets the X-Next-Cursor response header to the key of the last
+    row returned.
+    """
+    if start is not None:
+        query = query.filter(date_column >= start)
+    if end is not None:
+        query = query.filter(date_column <= end)
+
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(or_(
+                date_column < cursor_date,
+                and_(date_column == cursor_date, id_column < cursor_id)
+            ))
+        else:
+            query = query.filter(or_(
+                date_column > cursor_date,
+                and_(date_column == cursor_date, id_column > cursor_id)
+            ))
+
+    if descending:
+        query = query.order_by(date_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(date_column, id_column)
+
+    if limit is None and not cursor:
+        return query.all()
+    limit = limit or DEFAULT_PAGE_SIZE
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(last, date_column.key), getattr(last, id_column.key)
+        )
+
+    return rows
@@ -0,0 +1,169 @@
+# app/report_cache.py
+
+import asyncio
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable
+from change_versions import current_versions
+
+_MISSING = object()
+
+# Tag for results computed from a rolling window ending today (predictions)
+RECENT_SALES = ("recent-sales",)
+
+
+class ReportCache:
+    """
+    In-process LRU cache with a TTL. Each entry carries tags such as
+    ("date", d) or ("month", y, m) so writes can drop exactly the
+    entries they affect. Each worker process holds its own cache; the
+    TTL bounds how stale another worker's entries can get.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._tags: Dict[Hashable, set] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[Hashable] = ()):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            tags = tuple(tags)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, *tags: Hashable):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._tags.clear()
+
+    def _drop(self, key: Hashable):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+report_cache = ReportCache(
+    max_entries=int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.getenv("REPORT_CACHE_TTL", "60")),
+)
+
+
+def cached_report(endpoint: str, tags: Callable[..., Iterable[Hashable]], versions: Iterable[str] = ()):
+    """
+    Cache a sync route's result by endpoint name and its non-db parameters.
+    tags receives the same parameters and returns the entry's invalidation tags.
+    versions names tables whose change counters join the key, so a write made
+    through another worker is seen at once; routes that send an ETag for those
+    tables must pass them, or the ETag could be fresh while the body is not.
+    """
+    versions = tuple(versions)
+
+    def decorator(func):
+        def cache_key(kwargs):
+            params = {name: value for name, value in kwargs.items() if name != "db"}
+            key = (endpoint, tuple(sorted(params.items())))
+            if versions:
+                key += (tuple(sorted(current_versions(kwargs["db"], *versions).items())),)
+            return key, params
+
+        if inspect.iscoroutinefunction(func):
+            # Async routes: the version lookup uses the sync session, so keep it off the loop
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key, params = await asyncio.to_thread(cache_key, kwargs) if versions else cache_key(kwargs)
+                result = report_cache.get(key)
+                if result is _MISSING:
+                    result = await func(*args, **kwargs)
+                    report_cache.set(key, result, tags(**params))
+                return result
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, params = cache_key(kwargs)
+            result = report_cache.get(key)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                report_cache.set(key, result, tags(**params))
+            return result
+        return wrapper
+    return decorator
+
+
+def cached_value(key: Hashable, compute: Callable[[], Any], tags: Iterable[Hashable] = ()):
+    """Return the cached value for key, computing and storing it on a miss"""
+    result = report_cache.get(key)
+    if result is _MISSING:
+        result = compute()
+        report_cache.set(key, result, tags)
+    return result
+
+
+def date_tags(day: date):
+    return [("date", day), ("month", day.year, day.month)]
+
+
+def invalidate_dates(days: Iterable[date], sales: bool = False):
+    """Drop cached reports for the given dates (and their months) after a write"""
+    tags = set()
+    for day in days:
+        tags.update(date_tags(day))
+    if sales:
+        tags.add(RECENT_SALES)
+    report_cache.invalidate(*tags)
@@ -0,0 +1,178 @@
+# app/rollup.py
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import Sale, DailySalesRollup
+
+CENT = Decimal("0.01")
+
+
+def _to_cents(value) -> Decimal:
+    """Round a value the same way a DECIMAL(10, 2) column stores it"""
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def line_revenue(selling_price, quantity) -> Decimal:
+    """Revenue of one sale line as persisted in Sale.revenue"""
+    return _to_cents(selling_price) * _to_cents(quantity)
+
+
+def _sale_key(sale: Sale):
+    return (sale.sale_date, sale.variety_id, sale.salesperson_name)
+
+
+def _key_filter(key):
+    sale_date, variety_id, salesperson_name = key
+    return (
+        DailySalesRollup.sale_date == sale_date,
+        DailySalesRollup.variety_id == variety_id,
+        DailySalesRollup.salesperson_name == salesperson_name,
+    )
+
+
+def _sale_totals(sale: Sale, sign: int):
+    """(revenue, profit, quantity, count) one sale contributes, negated when sign=-1"""
+    return (
+        Decimal(sale.revenue) * sign,
+        _to_cents(sale.profit) * sign,
+        _to_cents(sale.quantity) * sign,
+        sign,
+    )
+
+
+def _apply(db: Session, key, revenue, profit, quantity, count: int):
+    """Add the given totals to one rollup row, creating it for positive counts"""
+    deltas = {
+        DailySalesRollup.total_revenue: DailySalesRollup.total_revenue + revenue,
+        DailySalesRollup.total_profit: DailySalesRollup.total_profit + profit,
+        DailySalesRollup.total_quantity: DailySalesRollup.total_quantity + quantity,
+        DailySalesRollup.sales_count: DailySalesRollup.sales_count + count,
+    }
+
+    updated = db.query(DailySalesRollup).filter(*_key_filter(key)).update(
+        deltas, synchronize_session=False
+    )
+    if updated or count < 0:
+        return
+
+    sale_date, variety_id, salesperson_name = key
+    try:
+        with db.begin_nested():
+            db.add(DailySalesRollup(
+                sale_date=sale_date,
+                variety_id=variety_id,
+                salesperson_name=salesperson_name,
+                total_revenue=revenue,
+                total_profit=profit,
+                total_quantity=quantity,
+                sales_count=count
+            ))
+    except IntegrityError:
+        # A concurrent transaction created the row first - add to it instead
+        db.query(DailySalesRollup).filter(*_key_filter(key)).update(
+            deltas, synchronize_session=False
+        )
+
+
+def record_sale(db: Session, sale: Sale):
+    """Add a new sale to the rollup; call before committing the sale"""
+    _apply(db, _sale_key(sale), *_sale_totals(sale, 1))
+
+
+def record_sales(db: Session, sales: List[Sale]):
+    """Add many new sales, touching each rollup row once"""
+    grouped = {}
+    for sale in sales:
+        totals = _sale_totals(sale, 1)
+        key = _sale_key(sale)
+        if key in grouped:
+            grouped[key] = tuple(a + b for a, b in zip(grouped[key], totals))
+        else:
+            grouped[key] = totals
+
+    for key, totals in grouped.items():
+        _apply(db, key, *totals)
+
+
+def remove_sale(db: Session, sale: Sale):
+    """Remove a deleted sale from the rollup; call before committing the delete"""
+    key = _sale_key(sale)
+    _apply(db, key, *_sale_totals(sale, -1))
+    db.query(DailySalesRollup).filter(
+        *_key_filter(key), DailySalesRollup.sales_count <= 0
+    ).delete(synchronize_session=False)
+
+
+def metric_deltas(sales: List[Sale], sign: int = 1):
+    """
+    Per (sale_date, variety_id) totals of committed sales for the metrics store:
+    (sale_date, variety_id, revenue, profit, quantity, count) tuples.
+    """
+    grouped = {}
+    for sale in sales:
+        key = (sale.sale_date, sale.variety_id)
+        totals = [float(value) for value in _sale_totals(sale, sign)]
+        if key in grouped:
+            grouped[key] = [a + b for a, b in zip(grouped[key], totals)]
+        else:
+            grouped[key] = totals
+    return [(*key, *totals) for key, totals in grouped.items()]
+
+
+def rebuild_daily_sales_rollup(db: Session, revenue=None) -> int:
+    """
+    Recompute the whole rollup table from raw sales rows; returns rows written.
+    revenue: per-row revenue expression, defaults to the persisted Sale.revenue
+    """
+    if revenue is None:
+        revenue = Sale.revenue
+
+    db.query(DailySalesRollup).delete(synchronize_session=False)
+
+    totals = db.query(
+        Sale.sale_date,
+        Sale.variety_id,
+        Sale.salesperson_name,
+        func.sum(revenue),
+        func.sum(Sale.profit),
+        func.sum(Sale.quantity),
+        func.count(Sale.id)
+    ).group_by(Sale.sale_date, Sale.variety_id, Sale.salesperson_name)
+
+    db.execute(
+        insert(DailySalesRollup).from_select(
+            [
+                DailySalesRollup.sale_date,
+                DailySalesRollup.variety_id,
+                DailySalesRollup.salesperson_name,
+                DailySalesRollup.total_revenue,
+                DailySalesRollup.total_profit,
+                DailySalesRollup.total_quantity,
+                DailySalesRollup.sales_count,
+            ],
+            totals.statement
+        )
+    )
+    db.commit()
+    return db.query(func.count()).select_from(DailySalesRollup).scalar()
+
+
+if __name__ == "__main__":
+    # Rebuild on demand: python rollup.py (run from the app directory).
+    # Existing databases are backfilled once by migration 2 in migrations.py
+    from database import SessionLocal, init_db
+
+    from metrics_store import metrics_store
+
+    init_db()
+    session = SessionLocal()
+    try:
+        rows = rebuild_daily_sales_rollup(session)
+        print(f"Rebuilt daily_sales_rollup: {rows} rows")
+        if metrics_store.enabled:
+            print(f"Rebuilt metrics store: {metrics_store.rebuild(session)}")
+    finally:
+        session.close()
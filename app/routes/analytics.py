@@ -0,0 +1,207 @@
+# app/routes/analytics.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import date, timedelta
+from database import get_db
+from models import DailySalesRollup, ClothVariety, SupplierInventory, SupplierReturn, MeasurementUnit
+from analytics_engine import AnalyticsEngine
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+def _items_sold(quantity: float, sales_count: int, unit) -> float:
+    """Length-based sales count as one item per sale; piece-based ones by quantity"""
+    if unit in (MeasurementUnit.METERS, MeasurementUnit.YARDS):
+        return float(sales_count)
+    return quantity
+
+
+@router.get("/dashboard")
+def get_dashboard(
+    days: int = Query(30, ge=1, le=365, description="Days to include, ending today"),
+    db: Session = Depends(get_db)
+):
+    """KPIs, daily series and product/salesperson/supplier stats for the analytics dashboard"""
+
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days - 1)
+    in_range = (
+        DailySalesRollup.sale_date >= start_date,
+        DailySalesRollup.sale_date <= end_date
+    )
+
+    # Daily series
+    daily_rows = db.query(
+        DailySalesRollup.sale_date,
+        func.sum(DailySalesRollup.total_revenue).label('revenue'),
+        func.sum(DailySalesRollup.total_profit).label('profit'),
+        func.sum(DailySalesRollup.sales_count).label('sales')
+    ).filter(*in_range).group_by(DailySalesRollup.sale_date).all()
+    daily_by_date = {row.sale_date: row for row in daily_rows}
+
+    sales_data = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        row = daily_by_date.get(day)
+        sales_data.append({
+            "date": f"{day.strftime('%b')} {day.day}",
+            "dateKey": day.isoformat(),
+            "revenue": float(row.revenue) if row else 0,
+            "profit": float(row.profit) if row else 0,
+            "sales": int(row.sales) if row else 0
+        })
+
+    # Per product
+    product_rows = db.query(
+        ClothVariety.name,
+        ClothVariety.measurement_unit,
+        func.sum(DailySalesRollup.total_revenue).label('revenue'),
+        func.sum(DailySalesRollup.total_profit).label('profit'),
+        func.sum(DailySalesRollup.total_quantity).label('quantity'),
+        func.sum(DailySalesRollup.sales_count).label('sales')
+    ).join(
+        ClothVariety, ClothVariety.id == DailySalesRollup.variety_id
+    ).filter(*in_range).group_by(
+        ClothVariety.id, ClothVariety.name, ClothVariety.measurement_unit
+    ).all()
+
+    products = []
+    for row in product_rows:
+        revenue = float(row.revenue)
+        profit = float(row.profit)
+        quantity = float(row.quantity)
+        products.append({
+            "name": row.name,
+            "revenue": revenue,
+            "profit": profit,
+            "quantity": quantity,
+            "items_sold": _items_sold(quantity, int(row.sales), row.measurement_unit),
+            "measurement_unit": row.measurement_unit.value if row.measurement_unit else "pieces",
+            "margin": (profit / revenue * 100) if revenue > 0 else 0
+        })
+    products.sort(key=lambda p: p["revenue"], reverse=True)
+    top_products = products[:5]
+
+    # Per salesperson (split by unit so items sold follow the same rule)
+    salesperson_rows = db.query(
+        DailySalesRollup.salesperson_name,
+        ClothVariety.measurement_unit,
+        func.sum(DailySalesRollup.total_revenue).label('revenue'),
+        func.sum(DailySalesRollup.total_profit).label('profit'),
+        func.sum(DailySalesRollup.total_quantity).label('quantity'),
+        func.sum(DailySalesRollup.sales_count).label('sales')
+    ).join(
+        ClothVariety, ClothVariety.id == DailySalesRollup.variety_id
+    ).filter(*in_range).group_by(
+        DailySalesRollup.salesperson_name, ClothVariety.measurement_unit
+    ).all()
+
+    salesperson_stats = {}
+    for row in salesperson_rows:
+        person = salesperson_stats.setdefault(row.salesperson_name, {
+            "name": row.salesperson_name,
+            "transactions": 0,
+            "revenue": 0.0,
+            "profit": 0.0,
+            "quantity": 0.0,
+            "items_sold": 0.0,
+            "avgTransactionValue": 0
+        })
+        quantity = float(row.quantity)
+        person["transactions"] += int(row.sales)
+        person["revenue"] += float(row.revenue)
+        person["profit"] += float(row.profit)
+        person["quantity"] += quantity
+        person["items_sold"] += _items_sold(quantity, int(row.sales), row.measurement_unit)
+
+    for person in salesperson_stats.values():
+        person["avgTransactionValue"] = (
+            person["revenue"] / person["transactions"] if person["transactions"] > 0 else 0
+        )
+    salesperson_performance = sorted(
+        salesperson_stats.values(), key=lambda p: p["revenue"], reverse=True
+    )
+
+    # Suppliers
+    supplies = db.query(
+        SupplierInventory.supplier_name,
+        func.sum(SupplierInventory.total_amount).label('total')
+    ).filter(
+        SupplierInventory.supply_date >= start_date,
+        SupplierInventory.supply_date <= end_date
+    ).group_by(SupplierInventory.supplier_name).all()
+
+    returns = db.query(
+        SupplierReturn.supplier_name,
+        func.sum(SupplierReturn.total_amount).label('total')
+    ).filter(
+        SupplierReturn.return_date >= start_date,
+        SupplierReturn.return_date <= end_date
+    ).group_by(SupplierReturn.supplier_name).all()
+
+    supplier_stats = {}
+    for row in supplies:
+        supplier_stats.setdefault(row.supplier_name, {"name": row.supplier_name, "totalSupply": 0.0, "returns": 0.0})
+        supplier_stats[row.supplier_name]["totalSupply"] += float(row.total)
+    for row in returns:
+        supplier_stats.setdefault(row.supplier_name, {"name": row.supplier_name, "totalSupply": 0.0, "returns": 0.0})
+        supplier_stats[row.supplier_name]["returns"] += float(row.total)
+
+    for supplier in supplier_stats.values():
+        supplier["netAmount"] = supplier["totalSupply"] - supplier["returns"]
+        supplier["reliability"] = (
+            (supplier["totalSupply"] - supplier["returns"]) / supplier["totalSupply"] * 100
+            if supplier["totalSupply"] > 0 else 100
+        )
+    suppliers = sorted(supplier_stats.values(), key=lambda s: s["netAmount"], reverse=True)[:5]
+
+    # KPIs
+    total_revenue = sum(day["revenue"] for day in sales_data)
+    total_profit = sum(day["profit"] for day in sales_data)
+    total_sales = sum(day["sales"] for day in sales_data)
+    total_items_sold = sum(p["items_sold"] for p in products)
+
+    mid_point = days // 2
+    first_half_revenue = sum(day["revenue"] for day in sales_data[:mid_point])
+    second_half_revenue = sum(day["revenue"] for day in sales_data[mid_point:])
+    # No first-half revenue reads as 0% growth, as the dashboard always showed
+    growth_rate = (
+        AnalyticsEngine.calculate_growth_rate(second_half_revenue, first_half_revenue)
+        if first_half_revenue > 0 else 0
+    )
+
+    top_products_revenue = sum(p["revenue"] for p in top_products)
+    product_mix = [
+        {
+            "name": p["name"],
+            "value": (p["revenue"] / top_products_revenue * 100) if top_products_revenue > 0 else 0,
+            "amount": p["revenue"]
+        }
+        for p in top_products
+    ]
+
+    top_product = top_products[0] if top_products else None
+    top_product_share = (
+        top_product["revenue"] / total_revenue * 100 if top_product and total_revenue > 0 else 0
+    )
+
+    return {
+        "kpis": {
+            "totalRevenue": round(total_revenue),
+            "totalProfit": round(total_profit),
+            "totalSales": total_sales,
+            "totalItemsSold": total_items_sold,
+            "avgOrderValue": round(total_revenue / total_sales) if total_sales > 0 else 0,
+            "growthRate": round(growth_rate, 1),
+            "profitMargin": round(total_profit / total_revenue * 100, 1) if total_revenue > 0 else 0,
+            "topProduct": top_product["name"] if top_product else "N/A",
+            "topProductShare": round(top_product_share, 1)
+        },
+        "salesData": sales_data,
+        "topProducts": top_products,
+        "suppliers": suppliers,
+        "productMix": product_mix,
+        "salespersonPerformance": salesperson_performance
+    }
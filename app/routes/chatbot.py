@@ -1,12 +1,15 @@
 # app/routes/chatbot.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
-from database import get_db
-from chatbot_engine import BusinessChatbot, ChatbotTools
+import json
+from database import get_db, SessionLocal
+from chatbot_engine import BusinessChatbot, ChatbotTools, USE_TOOLS
+from llm_clients import llm_clients
 
 router = APIRouter(prefix="/chatbot", tags=["AI Chatbot"])
 
@@ -19,6 +22,8 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     message: str
     conversation_history: Optional[List[ChatMessage]] = []
+    # None = server default (CHATBOT_TOOLS); False sends the full business context instead
+    use_tools: Optional[bool] = None
 
 class ChatResponse(BaseModel):
     response: str
@@ -27,6 +32,7 @@ class ChatResponse(BaseModel):
     success: bool = True
     error: Optional[str] = None
     suggested_queries: Optional[List[str]] = None
+    usage: Optional[Dict] = None
 
 
 @router.post("/chat", response_model=ChatResponse)
@@ -35,8 +41,8 @@ async def chat_with_ai(request: ChatRequest, db: Session = Depends(get_db)):
     Chat with the AI business assistant
     """
     try:
-        # Initialize chatbot
-        chatbot = BusinessChatbot(db_session=db)
+        # Shared LLM client, built once at startup
+        chatbot = BusinessChatbot(db_session=db, llm=llm_clients.get("chat"))
         
         # Convert history to dict format
         history = [
@@ -45,7 +51,8 @@ async def chat_with_ai(request: ChatRequest, db: Session = Depends(get_db)):
         ] if request.conversation_history else []
         
         # Get AI response
-        result = await chatbot.chat(request.message, history)
+        use_tools = USE_TOOLS if request.use_tools is None else request.use_tools
+        result = await chatbot.chat(request.message, history, use_tools)
         
         # Add suggested queries
         suggested_queries = [
@@ -62,7 +69,8 @@ async def chat_with_ai(request: ChatRequest, db: Session = Depends(get_db)):
             model=result.get("model"),
             success=result.get("success", True),
             error=result.get("error"),
-            suggested_queries=suggested_queries if not history else None
+            suggested_queries=suggested_queries if not history else None,
+            usage=result.get("usage")
         )
         
     except Exception as e:
@@ -74,6 +82,67 @@ async def chat_with_ai(request: ChatRequest, db: Session = Depends(get_db)):
         )
 
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request, db: Session = Depends(get_db)):
+    """
+    Stream the AI reply as Server-Sent Events: "token" events with text
+    chunks, then one "done" event with timestamp, model, error and timings
+    """
+    chatbot = BusinessChatbot(db_session=db, llm=llm_clients.get("chat"))
+    history = [
+        {"role": msg.role, "content": msg.content}
+        for msg in request.conversation_history
+    ] if request.conversation_history else []
+    
+    use_tools = USE_TOOLS if request.use_tools is None else request.use_tools
+    
+    # Context is read here, before streaming starts and the session is released
+    messages = None
+    error = None
+    if chatbot.llm:
+        try:
+            messages = await chatbot.build_messages(request.message, history, use_tools)
+        except Exception as e:
+            error = str(e)
+    
+    async def events():
+        if messages is None:
+            yield _sse("done", {
+                "timestamp": datetime.now().isoformat(),
+                "success": False,
+                "error": error or BusinessChatbot.NOT_CONFIGURED["error"],
+                "response": BusinessChatbot.NOT_CONFIGURED["response"] if error is None else None
+            })
+            return
+        
+        # Tools query while the body streams, after the request's session is released
+        chatbot.db = SessionLocal()
+        replies = chatbot.stream_reply(messages, use_tools)
+        try:
+            async for event, data in replies:
+                if await http_request.is_disconnected():
+                    # Stop pulling from Gemini once nobody is listening
+                    break
+                if event == "token":
+                    data = {"text": data}
+                elif event == "tool":
+                    data = {"name": data}
+                yield _sse(event, data)
+        finally:
+            await replies.aclose()
+            chatbot.db.close()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/quick-stats")
 def get_quick_stats(db: Session = Depends(get_db)):
     """
@@ -169,7 +238,7 @@ def simple_query(request: ChatRequest, db: Session = Depends(get_db)):
     Useful when API keys are not configured
     """
     try:
-        chatbot = BusinessChatbot(db_session=db)
+        chatbot = BusinessChatbot(db_session=db, llm=llm_clients.get("chat"))
         intent = chatbot.parse_query_intent(request.message)
         response = chatbot.handle_simple_query(intent)
         
@@ -209,5 +278,6 @@ def chatbot_health():
         "openai_configured": openai_configured,
         "anthropic_configured": anthropic_configured,
         "ai_enabled": openai_configured or anthropic_configured,
-        "fallback_mode": not (openai_configured or anthropic_configured)
+        "fallback_mode": not (openai_configured or anthropic_configured),
+        "llm_clients": llm_clients.stats()
     }
\ No newline at end of file
@@ -1,16 +1,19 @@
 # app/routes/expenses.py - CREATE THIS NEW FILE
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional
 from datetime import date
 from decimal import Decimal
 from database import get_db
-from models import Expense, Sale
+from models import Expense, DailySalesRollup
 from schemas import (
     ExpenseCreate, ExpenseResponse, ExpenseSummary, FinancialReport
 )
+from report_cache import cached_report, invalidate_dates
+from change_versions import bump
+from pagination import keyset_paginate, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/expenses", tags=["Expense Management"])
 
@@ -19,14 +22,26 @@ def create_expense(expense: ExpenseCreate, db: Session = Depends(get_db)):
     """Record a new expense"""
     db_expense = Expense(**expense.model_dump())
     db.add(db_expense)
+    bump(db, "expenses")
     db.commit()
+    invalidate_dates([expense.expense_date])
     db.refresh(db_expense)
     return db_expense
 
 @router.get("/", response_model=List[ExpenseResponse])
-def get_all_expenses(db: Session = Depends(get_db)):
-    """Get all expenses"""
-    expenses = db.query(Expense).order_by(Expense.expense_date.desc()).all()
+def get_all_expenses(
+    response: Response,
+    start: Optional[date] = Query(None, description="First expense date to include"),
+    end: Optional[date] = Query(None, description="Last expense date to include"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit limit and cursor to get every row"),
+    db: Session = Depends(get_db)
+):
+    """Get expenses newest first; paged when limit or cursor is given"""
+    expenses = keyset_paginate(
+        db.query(Expense), Expense.expense_date, Expense.id, response,
+        start=start, end=end, cursor=cursor, limit=limit, descending=True
+    )
     return expenses
 
 @router.get("/date/{expense_date}", response_model=List[ExpenseResponse])
@@ -78,6 +93,7 @@ def get_expense_summary(expense_date: date, db: Session = Depends(get_db)):
     )
 
 @router.get("/financial-report/{year}/{month}", response_model=FinancialReport)
+@cached_report("expenses.financial_report", tags=lambda year, month: [("month", year, month)])
 def get_financial_report(year: int, month: int, db: Session = Depends(get_db)):
     """Get complete financial report for a month"""
     from calendar import monthrange
@@ -89,11 +105,11 @@ def get_financial_report(year: int, month: int, db: Session = Depends(get_db)):
     
     # Get sales data for the entire month
     sales_result = db.query(
-        func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-        func.sum(Sale.profit).label('profit')
+        func.sum(DailySalesRollup.total_revenue).label('revenue'),
+        func.sum(DailySalesRollup.total_profit).label('profit')
     ).filter(
-        Sale.sale_date >= start_date,
-        Sale.sale_date <= end_date
+        DailySalesRollup.sale_date >= start_date,
+        DailySalesRollup.sale_date <= end_date
     ).first()
     
     revenue = sales_result.revenue if sales_result.revenue else Decimal('0.00')
@@ -136,5 +152,7 @@ def delete_expense(expense_id: int, db: Session = Depends(get_db)):
         )
     
     db.delete(expense)
+    bump(db, "expenses")
     db.commit()
+    invalidate_dates([expense.expense_date])
     return None
\ No newline at end of file
@@ -0,0 +1,142 @@
+# app/routes/export.py
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from typing import Optional, Literal
+from datetime import date
+import csv
+import io
+import json
+from enum import Enum
+from database import SessionLocal
+from models import Sale, SupplierInventory, SupplierReturn, Expense, ClothVariety
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+# Rows fetched from the server-side cursor per round trip
+CHUNK_SIZE = 1000
+
+EXPORTS = {
+    "sales": {
+        "model": Sale,
+        "date_column": Sale.sale_date,
+        "columns": [
+            Sale.id, Sale.sale_date, Sale.salesperson_name, Sale.variety_id,
+            ClothVariety.name.label("variety_name"), Sale.quantity,
+            Sale.selling_price, Sale.cost_price, Sale.revenue, Sale.profit,
+            Sale.sale_timestamp,
+        ],
+    },
+    "supplier-inventory": {
+        "model": SupplierInventory,
+        "date_column": SupplierInventory.supply_date,
+        "columns": [
+            SupplierInventory.id, SupplierInventory.supply_date, SupplierInventory.supplier_name,
+            SupplierInventory.variety_id, ClothVariety.name.label("variety_name"),
+            SupplierInventory.quantity, SupplierInventory.price_per_item,
+            SupplierInventory.total_amount, SupplierInventory.created_at,
+        ],
+    },
+    "supplier-returns": {
+        "model": SupplierReturn,
+        "date_column": SupplierReturn.return_date,
+        "columns": [
+            SupplierReturn.id, SupplierReturn.return_date, SupplierReturn.supplier_name,
+            SupplierReturn.variety_id, ClothVariety.name.label("variety_name"),
+            SupplierReturn.quantity, SupplierReturn.price_per_item,
+            SupplierReturn.total_amount, SupplierReturn.reason, SupplierReturn.created_at,
+        ],
+    },
+    "expenses": {
+        "model": Expense,
+        "date_column": Expense.expense_date,
+        "columns": [
+            Expense.id, Expense.expense_date, Expense.category, Expense.amount,
+            Expense.description, Expense.created_at,
+        ],
+    },
+}
+
+
+def _build_statement(dataset: str, start: Optional[date], end: Optional[date]):
+    config = EXPORTS[dataset]
+    model = config["model"]
+    date_column = config["date_column"]
+
+    stmt = select(*config["columns"]).select_from(model)
+    if hasattr(model, "variety_id"):
+        stmt = stmt.join(ClothVariety, ClothVariety.id == model.variety_id)
+    if start is not None:
+        stmt = stmt.where(date_column >= start)
+    if end is not None:
+        stmt = stmt.where(date_column <= end)
+    return stmt.order_by(date_column, model.id)
+
+
+def _plain_value(value):
+    # Enums such as ExpenseCategory export as their stored value
+    return value.value if isinstance(value, Enum) else value
+
+
+def _json_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _stream_rows(dataset: str, start: Optional[date], end: Optional[date], fmt: str):
+    """
+    Yield the export chunk by chunk. The session is opened here rather than
+    through get_db because the body is produced after the route returns.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            _build_statement(dataset, start, end),
+            execution_options={"yield_per": CHUNK_SIZE}
+        )
+        keys = list(result.keys())
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(keys)
+            yield buffer.getvalue()
+            for partition in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                for row in partition:
+                    writer.writerow([_plain_value(value) for value in row])
+                yield buffer.getvalue()
+        else:
+            for partition in result.partitions():
+                yield "".join(
+                    json.dumps(
+                        {key: _plain_value(value) for key, value in zip(keys, row)},
+                        default=_json_value
+                    ) + "\n"
+                    for row in partition
+                )
+    finally:
+        db.close()
+
+
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: Literal["sales", "supplier-inventory", "supplier-returns", "expenses"],
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    start: Optional[date] = Query(None, description="First date to include"),
+    end: Optional[date] = Query(None, description="Last date to include"),
+):
+    """Stream a full or date-bounded export with constant memory"""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"{dataset}_{start or 'all'}_{end or 'all'}.{format}"
+
+    return StreamingResponse(
+        _stream_rows(dataset, start, end, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
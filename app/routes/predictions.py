@@ -1,19 +1,25 @@
 # app/routes/predictions.py
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from typing import List, Optional
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+import numpy as np
 from database import get_db
-from models import Sale, SupplierInventory, ClothVariety
-from analytics_engine import AnalyticsEngine
+from models import ClothVariety
+from analytics_engine import AnalyticsEngine, ANALYTICS_BACKEND
+from forecast_cache import forecast_cache, series_fingerprint
+from daily_series import load_daily_series
+from analytics_pool import analytics_pool
+from report_cache import cached_report, RECENT_SALES
 
 router = APIRouter(prefix="/predictions", tags=["Predictive Analytics"])
 
 @router.get("/revenue-forecast")
-def forecast_revenue(
+@cached_report("predictions.revenue_forecast", tags=lambda **_: [RECENT_SALES])
+async def forecast_revenue(
     days_ahead: int = Query(30, ge=7, le=90, description="Days to forecast (7-90)"),
     db: Session = Depends(get_db)
 ):
@@ -23,26 +29,20 @@ def forecast_revenue(
     end_date = date.today()
     start_date = end_date - timedelta(days=90)
     
-    # Query daily sales aggregated
-    daily_sales = db.query(
-        Sale.sale_date,
-        func.sum(Sale.selling_price * Sale.quantity).label('revenue')
-    ).filter(
-        Sale.sale_date >= start_date,
-        Sale.sale_date <= end_date
-    ).group_by(Sale.sale_date).order_by(Sale.sale_date).all()
+    series = await run_in_threadpool(load_daily_series, db, start_date, end_date)
+    first = series.first_sale_column()
+    revenues = series.revenue[0, first:]
     
-    # Prepare data for forecasting
+    # Calendar days from the first sale, with zero revenue on days without sales
     historical_data = [
-        {
-            "date": str(sale.sale_date),
-            "revenue": float(sale.revenue)
-        }
-        for sale in daily_sales
+        {"date": str(day), "revenue": float(revenue)}
+        for day, revenue in zip(series.dates()[first:], revenues)
     ]
     
-    # Generate forecast
-    forecast_result = AnalyticsEngine.forecast_revenue(historical_data, days_ahead)
+    if series.days_with_sales()[0] < 7:
+        forecast_result = AnalyticsEngine.insufficient_forecast()
+    else:
+        forecast_result = await AnalyticsEngine.forecast_series_async(revenues, end_date, days_ahead)
     
     return {
         "historical_data": historical_data[-30:],  # Last 30 days
@@ -58,8 +58,108 @@ def forecast_revenue(
     }
 
 
+async def _forecast_demand(db: Session, varieties, days_ahead: int) -> List[dict]:
+    """
+    Demand forecast entries for the given (id, name) varieties from one
+    variety x day series and one batch fit. Each product is fitted from its
+    first sale, so a variety gets the same answer alone or with the rest.
+    """
+    end_date = date.today()
+    start_date = end_date - timedelta(days=90)
+    
+    # variety x day matrix, zero on days without sales
+    series = await run_in_threadpool(
+        load_daily_series, db, start_date, end_date, "variety", [variety.id for variety in varieties]
+    )
+    quantities = series.quantity
+    days_sold = series.days_with_sales()
+    first_sold = np.array([series.first_sale_column(row) for row in range(len(varieties))], dtype=np.intp)
+    
+    forecast_dates = [
+        (end_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(1, days_ahead + 1)
+    ]
+    
+    async def build_products():
+        # Same 7-sale-day minimum as the revenue forecast
+        active_rows = np.flatnonzero(days_sold >= 7)
+        if len(active_rows):
+            fit = await analytics_pool.run_async(
+                AnalyticsEngine.demand_forecast_batch,
+                quantities[active_rows], days_ahead, first_sold[active_rows]
+            )
+        fit_index = {int(row): i for i, row in enumerate(active_rows)}
+    
+        products = []
+        for row, variety in enumerate(varieties):
+            if row not in fit_index:
+                products.append({
+                    "variety_id": variety.id,
+                    "variety_name": variety.name,
+                    "message": "Insufficient sales history for this product",
+                    "forecast": []
+                })
+                continue
+        
+            i = fit_index[row]
+            predictions = fit["predictions"][i]
+            confidence = AnalyticsEngine.confidence_level(float(fit["r_squared"][i]))
+            avg_daily_sales = float(quantities[row].sum()) / int(days_sold[row])
+            reorder_point = AnalyticsEngine.calculate_reorder_point(avg_daily_sales)
+        
+            products.append({
+                "variety_id": variety.id,
+                "variety_name": variety.name,
+                "forecast": [
+                    {
+                        "date": forecast_date,
+                        "predicted_quantity": int(pred),
+                        "confidence": confidence
+                    }
+                    for forecast_date, pred in zip(forecast_dates, predictions)
+                ],
+                "confidence": confidence,
+                "analytics": {
+                    "avg_daily_sales": round(avg_daily_sales, 2),
+                    "total_predicted_demand": int(predictions.sum()),
+                    "reorder_point": reorder_point,
+                    "recommendation": f"Reorder when stock falls below {reorder_point} units"
+                }
+            })
+        return products
+    
+    # Unchanged history and catalog reuse the previous fit
+    key = series_fingerprint(
+        "product_demand", quantities, days_sold,
+        [[variety.id, variety.name] for variety in varieties],
+        forecast_dates, ANALYTICS_BACKEND
+    )
+    return await forecast_cache.get_or_compute_async(key, build_products)
+
+
+@router.get("/product-demand")
+@cached_report("predictions.product_demand_all", tags=lambda **_: [RECENT_SALES])
+async def predict_all_product_demand(
+    days_ahead: int = Query(30, ge=7, le=90),
+    db: Session = Depends(get_db)
+):
+    """Predict demand for every product in one request"""
+    
+    varieties = await run_in_threadpool(
+        lambda: db.query(ClothVariety.id, ClothVariety.name).order_by(ClothVariety.id).all()
+    )
+    products = await _forecast_demand(db, varieties, days_ahead)
+    
+    return {
+        "products": products,
+        "total_products": len(products),
+        "forecast_period_days": days_ahead,
+        "generated_at": datetime.now().isoformat()
+    }
+
+
 @router.get("/product-demand/{variety_id}")
-def predict_product_demand(
+@cached_report("predictions.product_demand", tags=lambda **_: [RECENT_SALES])
+async def predict_product_demand(
     variety_id: int,
     days_ahead: int = Query(30, ge=7, le=90),
     db: Session = Depends(get_db)
@@ -67,67 +167,19 @@ def predict_product_demand(
     """Predict demand for a specific product"""
     
     # Check if variety exists
-    variety = db.query(ClothVariety).filter(ClothVariety.id == variety_id).first()
+    variety = await run_in_threadpool(
+        lambda: db.query(ClothVariety.id, ClothVariety.name).filter(ClothVariety.id == variety_id).first()
+    )
     if not variety:
         return {"error": "Variety not found"}
     
-    # Get historical sales for this product
-    end_date = date.today()
-    start_date = end_date - timedelta(days=90)
-    
-    daily_sales = db.query(
-        Sale.sale_date,
-        func.sum(Sale.quantity).label('quantity_sold')
-    ).filter(
-        Sale.variety_id == variety_id,
-        Sale.sale_date >= start_date,
-        Sale.sale_date <= end_date
-    ).group_by(Sale.sale_date).order_by(Sale.sale_date).all()
-    
-    if len(daily_sales) < 7:
-        return {
-            "variety_name": variety.name,
-            "message": "Insufficient sales history for this product",
-            "forecast": []
-        }
-    
-    # Prepare data
-    historical_data = [
-        {"date": str(sale.sale_date), "revenue": float(sale.quantity_sold)}
-        for sale in daily_sales
-    ]
-    
-    # Generate forecast (using revenue field but it's actually quantity)
-    forecast_result = AnalyticsEngine.forecast_revenue(historical_data, days_ahead)
-    
-    # Calculate reorder point
-    total_qty = sum(sale.quantity_sold for sale in daily_sales)
-    avg_daily_sales = total_qty / len(daily_sales)
-    reorder_point = AnalyticsEngine.calculate_reorder_point(avg_daily_sales)
-    
-    return {
-        "variety_id": variety_id,
-        "variety_name": variety.name,
-        "forecast": [
-            {
-                "date": f["date"],
-                "predicted_quantity": int(f["predicted_revenue"]),
-                "confidence": f["confidence_level"]
-            }
-            for f in forecast_result["forecast"]
-        ],
-        "confidence": forecast_result["confidence"],
-        "analytics": {
-            "avg_daily_sales": round(avg_daily_sales, 2),
-            "total_predicted_demand": int(forecast_result["total_predicted"]),
-            "reorder_point": reorder_point,
-            "recommendation": f"Reorder when stock falls below {reorder_point} units"
-        }
-    }
+    # Same fit as the all-products forecast, for one row
+    return (await _forecast_demand(db, [variety], days_ahead))[0]
 
 
 @router.get("/sales-trends")
-def analyze_sales_trends(
+@cached_report("predictions.sales_trends", tags=lambda **_: [RECENT_SALES])
+async def analyze_sales_trends(
     days: int = Query(30, ge=7, le=180),
     db: Session = Depends(get_db)
 ):
@@ -137,64 +189,39 @@ def analyze_sales_trends(
     start_date = end_date - timedelta(days=days)
     
     # Get daily sales
-    daily_sales = db.query(
-        Sale.sale_date,
-        func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-        func.sum(Sale.profit).label('profit'),
-        func.count(Sale.id).label('transaction_count')
-    ).filter(
-        Sale.sale_date >= start_date,
-        Sale.sale_date <= end_date
-    ).group_by(Sale.sale_date).order_by(Sale.sale_date).all()
-    
-    if len(daily_sales) < 7:
-        return {"error": "Insufficient data for trend analysis"}
+    series = await run_in_threadpool(load_daily_series, db, start_date, end_date)
     
-    # Prepare data
-    revenues = [float(sale.revenue) for sale in daily_sales]
-    profits = [float(sale.profit) for sale in daily_sales]
+    if series.days_with_sales()[0] < 7:
+        return {"error": "Insufficient data for trend analysis"}
     
-    # Detect trends
-    revenue_trend = AnalyticsEngine.detect_trend(revenues)
-    profit_trend = AnalyticsEngine.detect_trend(profits)
+    # Calendar days from the first sale, zero on days without sales
+    first = series.first_sale_column()
+    revenues = series.revenue[0, first:]
+    profits = series.profit[0, first:]
     
-    # Calculate moving averages
-    revenue_ma = AnalyticsEngine.calculate_moving_average(revenues, window=7)
-    
-    # Detect seasonality
-    sales_data = [
-        {"date": sale.sale_date, "value": float(sale.revenue)}
-        for sale in daily_sales
-    ]
-    seasonality = AnalyticsEngine.calculate_seasonality(sales_data)
-    
-    # Calculate growth rates
-    if len(revenues) >= 14:
-        first_half = revenues[:len(revenues)//2]
-        second_half = revenues[len(revenues)//2:]
-        growth_rate = AnalyticsEngine.calculate_growth_rate(
-            sum(second_half), sum(first_half)
-        )
-    else:
-        growth_rate = 0
+    # Trends, seasonality and growth (in the analytics process pool)
+    trends = await analytics_pool.run_async(
+        AnalyticsEngine.analyze_trends, revenues, profits, series.weekdays()[first:]
+    )
     
     return {
         "period": f"{days} days",
-        "revenue_trend": revenue_trend,
-        "profit_trend": profit_trend,
-        "growth_rate": round(growth_rate, 2),
-        "seasonality": seasonality,
+        "revenue_trend": trends["revenue_trend"],
+        "profit_trend": trends["profit_trend"],
+        "growth_rate": round(trends["growth_rate"], 2),
+        "seasonality": trends["seasonality"],
         "summary": {
-            "total_revenue": sum(revenues),
-            "total_profit": sum(profits),
-            "avg_daily_revenue": round(sum(revenues) / len(revenues), 2),
-            "avg_daily_profit": round(sum(profits) / len(profits), 2),
-            "total_transactions": sum(sale.transaction_count for sale in daily_sales)
+            "total_revenue": float(revenues.sum()),
+            "total_profit": float(profits.sum()),
+            "avg_daily_revenue": round(float(revenues.mean()), 2),
+            "avg_daily_profit": round(float(profits.mean()), 2),
+            "total_transactions": int(series.sales_count.sum())
         }
     }
 
 
 @router.get("/product-performance")
+@cached_report("predictions.product_performance", tags=lambda **_: [RECENT_SALES])
 def analyze_product_performance(
     days: int = Query(30, ge=7, le=180),
     db: Session = Depends(get_db)
@@ -205,36 +232,32 @@ def analyze_product_performance(
     start_date = end_date - timedelta(days=days)
     
     # Get sales by variety
-    product_sales = db.query(
-        Sale.variety_id,
-        func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-        func.sum(Sale.profit).label('profit'),
-        func.sum(Sale.quantity).label('quantity_sold'),
-        func.count(Sale.id).label('sales_count')
-    ).filter(
-        Sale.sale_date >= start_date,
-        Sale.sale_date <= end_date
-    ).group_by(Sale.variety_id).all()
+    series = load_daily_series(db, start_date, end_date, "variety")
+    revenues = series.revenue.sum(axis=1)
+    profits = series.profit.sum(axis=1)
+    quantities = series.quantity.sum(axis=1)
+    sales_counts = series.sales_count.sum(axis=1)
     
     # Get variety details
     varieties = {v.id: v.name for v in db.query(ClothVariety).all()}
     
     # Calculate metrics
     products = []
-    for sale in product_sales:
-        revenue = float(sale.revenue)
-        profit = float(sale.profit)
+    for row, variety_id in enumerate(series.keys):
+        revenue = float(revenues[row])
+        profit = float(profits[row])
+        sales_count = int(sales_counts[row])
         margin = (profit / revenue * 100) if revenue > 0 else 0
         
         products.append({
-            "variety_id": sale.variety_id,
-            "variety_name": varieties.get(sale.variety_id, f"Product {sale.variety_id}"),
+            "variety_id": variety_id,
+            "variety_name": varieties.get(variety_id, f"Product {variety_id}"),
             "revenue": round(revenue, 2),
             "profit": round(profit, 2),
-            "quantity_sold": sale.quantity_sold,
-            "sales_count": sale.sales_count,
+            "quantity_sold": round(float(quantities[row]), 2),
+            "sales_count": sales_count,
             "profit_margin": round(margin, 2),
-            "avg_sale_value": round(revenue / sale.sales_count, 2) if sale.sales_count > 0 else 0
+            "avg_sale_value": round(revenue / sales_count, 2) if sales_count > 0 else 0
         })
     
     # Sort by revenue
@@ -267,58 +290,56 @@ def analyze_product_performance(
     }
 
 
-@router.get("/smart-insights")
-def get_smart_insights(
-    days: int = Query(30, ge=7, le=90),
-    db: Session = Depends(get_db)
-):
-    """Generate AI-powered business insights and recommendations"""
-    
-    end_date = date.today()
-    start_date = end_date - timedelta(days=days)
-    
-    # Get sales data
-    daily_sales = db.query(
-        Sale.sale_date,
-        func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-        func.sum(Sale.profit).label('profit')
-    ).filter(
-        Sale.sale_date >= start_date,
-        Sale.sale_date <= end_date
-    ).group_by(Sale.sale_date).order_by(Sale.sale_date).all()
-    
+def _insight_inputs(db: Session, start_date: date, end_date: date):
+    """Daily sales rows and per-product totals that generate_insights consumes"""
+    series = load_daily_series(db, start_date, end_date)
+    first = series.first_sale_column()
     sales_data = [
-        {"date": sale.sale_date, "revenue": float(sale.revenue), "profit": float(sale.profit)}
-        for sale in daily_sales
+        {"date": day, "revenue": float(revenue), "profit": float(profit)}
+        for day, revenue, profit in zip(
+            series.dates()[first:], series.revenue[0, first:], series.profit[0, first:]
+        )
     ]
     
-    # Get product data
-    product_sales = db.query(
-        Sale.variety_id,
-        func.sum(Sale.selling_price * Sale.quantity).label('revenue'),
-        func.sum(Sale.profit).label('profit')
-    ).filter(
-        Sale.sale_date >= start_date,
-        Sale.sale_date <= end_date
-    ).group_by(Sale.variety_id).all()
+    product_series = load_daily_series(db, start_date, end_date, "variety")
+    product_revenue = product_series.revenue.sum(axis=1)
+    product_profit = product_series.profit.sum(axis=1)
     
     varieties = {v.id: v.name for v in db.query(ClothVariety).all()}
     
     product_data = [
         {
-            "name": varieties.get(sale.variety_id, f"Product {sale.variety_id}"),
-            "revenue": float(sale.revenue),
-            "profit": float(sale.profit),
-            "margin": (float(sale.profit) / float(sale.revenue) * 100) if sale.revenue > 0 else 0
+            "name": varieties.get(variety_id, f"Product {variety_id}"),
+            "revenue": float(product_revenue[row]),
+            "profit": float(product_profit[row]),
+            "margin": (float(product_profit[row]) / float(product_revenue[row]) * 100) if product_revenue[row] > 0 else 0
         }
-        for sale in product_sales
+        for row, variety_id in enumerate(product_series.keys)
     ]
+    return sales_data, product_data
+
+
+@router.get("/smart-insights")
+@cached_report("predictions.smart_insights", tags=lambda **_: [RECENT_SALES])
+async def get_smart_insights(
+    days: int = Query(30, ge=7, le=90),
+    db: Session = Depends(get_db)
+):
+    """Generate AI-powered business insights and recommendations"""
+    
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days)
+    
+    # Get sales and product data
+    sales_data, product_data = await run_in_threadpool(_insight_inputs, db, start_date, end_date)
     
     # Get inventory data (placeholder)
     inventory_data = []
     
     # Generate insights
-    insights = AnalyticsEngine.generate_insights(sales_data, inventory_data, product_data)
+    insights = await analytics_pool.run_async(
+        AnalyticsEngine.generate_insights, sales_data, inventory_data, product_data
+    )
     
     return {
         "period": f"{days} days",
@@ -329,6 +350,7 @@ def get_smart_insights(
 
 
 @router.get("/reorder-recommendations")
+@cached_report("predictions.reorder_recommendations", tags=lambda **_: [RECENT_SALES])
 def get_reorder_recommendations(
     db: Session = Depends(get_db)
 ):
@@ -338,34 +360,28 @@ def get_reorder_recommendations(
     end_date = date.today()
     start_date = end_date - timedelta(days=30)
     
-    product_sales = db.query(
-        Sale.variety_id,
-        func.sum(Sale.quantity).label('total_quantity'),
-        func.count(func.distinct(Sale.sale_date)).label('days_sold')
-    ).filter(
-        Sale.sale_date >= start_date,
-        Sale.sale_date <= end_date
-    ).group_by(Sale.variety_id).all()
+    series = load_daily_series(db, start_date, end_date, "variety")
+    total_quantities = series.quantity.sum(axis=1)
+    days_sold = series.days_with_sales()
     
     # Get variety details
     varieties = {v.id: v for v in db.query(ClothVariety).all()}
     
     recommendations = []
-    for sale in product_sales:
-        variety = varieties.get(sale.variety_id)
+    for row, variety_id in enumerate(series.keys):
+        variety = varieties.get(variety_id)
         if not variety:
             continue
         
-        # Convert Decimal to float for calculations
-        total_quantity = float(sale.total_quantity) if sale.total_quantity else 0
-        days_sold_count = sale.days_sold if sale.days_sold else 1
+        total_quantity = float(total_quantities[row])
+        days_sold_count = int(days_sold[row]) or 1
         
         avg_daily_sales = total_quantity / days_sold_count
         reorder_point = AnalyticsEngine.calculate_reorder_point(avg_daily_sales)
         optimal_order_qty = int(reorder_point * 2)  # Order enough for 2 cycles
         
         recommendations.append({
-            "variety_id": sale.variety_id,
+            "variety_id": variety_id,
             "variety_name": variety.name,
             "avg_daily_sales": round(avg_daily_sales, 2),
             "reorder_point": reorder_point,
@@ -1,35 +1,29 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import date
 from decimal import Decimal
 from database import get_db
-from models import SupplierInventory, SupplierReturn, Sale
-from schemas import DailyReport, DailySupplierSummary, DailySalesSummary
+from models import SupplierInventory, SupplierReturn, DailySalesRollup, ClothVariety
+from report_cache import cached_report
+from change_versions import etag_for
+from schemas import (
+    DailyReport, DailySupplierSummary, DailySalesSummary, RangeReport,
+    RangeVarietyBreakdown, RangeSalespersonBreakdown
+)
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
-@router.get("/daily/{report_date}", response_model=DailyReport)
-def get_daily_report(report_date: date, db: Session = Depends(get_db)):
-    """Get complete daily report including supplier and sales data"""
-    
-    # Supplier Summary
-    supply_result = db.query(
-        func.sum(SupplierInventory.total_amount).label('total'),
-        func.count(SupplierInventory.id).label('count')
-    ).filter(SupplierInventory.supply_date == report_date).first()
-    
-    total_supply = supply_result.total if supply_result.total else Decimal('0.00')
-    supply_count = supply_result.count if supply_result.count else 0
-    
-    return_result = db.query(
-        func.sum(SupplierReturn.total_amount).label('total'),
-        func.count(SupplierReturn.id).label('count')
-    ).filter(SupplierReturn.return_date == report_date).first()
-    
-    total_returns = return_result.total if return_result.total else Decimal('0.00')
-    return_count = return_result.count if return_result.count else 0
-    
+DAILY_REPORT_TABLES = ("sales", "supplier_inventory", "supplier_returns", "cloth_varieties")
+PROFIT_REPORT_TABLES = ("sales", "cloth_varieties")
+
+def _build_daily_report(report_date: date, supply, returned, sold) -> DailyReport:
+    """
+    Assemble one day's DailyReport from aggregate rows: supply and returned
+    carry total/count, sold carries the rollup sums. Any row may be None.
+    """
+    total_supply = supply.total if supply and supply.total else Decimal('0.00')
+    total_returns = returned.total if returned and returned.total else Decimal('0.00')
     net_amount = total_supply - total_returns
     
     supplier_summary = DailySupplierSummary(
@@ -37,29 +31,16 @@ def get_daily_report(report_date: date, db: Session = Depends(get_db)):
         total_supply=total_supply,
         total_returns=total_returns,
         net_amount=net_amount,
-        supply_count=supply_count,
-        return_count=return_count
+        supply_count=supply.count if supply and supply.count else 0,
+        return_count=returned.count if returned and returned.count else 0
     )
     
-    # Sales Summary
-    sales_result = db.query(
-        func.sum(Sale.selling_price * Sale.quantity).label('total_sales'),
-        func.sum(Sale.profit).label('total_profit'),
-        func.sum(Sale.quantity).label('total_quantity'),
-        func.count(Sale.id).label('sales_count')
-    ).filter(Sale.sale_date == report_date).first()
-    
-    total_sales = sales_result.total_sales if sales_result.total_sales else Decimal('0.00')
-    total_profit = sales_result.total_profit if sales_result.total_profit else Decimal('0.00')
-    total_quantity = sales_result.total_quantity if sales_result.total_quantity else 0
-    sales_count = sales_result.sales_count if sales_result.sales_count else 0
-    
     sales_summary = DailySalesSummary(
         date=report_date,
-        total_sales_amount=total_sales,
-        total_profit=total_profit,
-        total_quantity_sold=total_quantity,
-        sales_count=sales_count
+        total_sales_amount=sold.total_sales if sold and sold.total_sales else Decimal('0.00'),
+        total_profit=sold.total_profit if sold and sold.total_profit else Decimal('0.00'),
+        total_quantity_sold=sold.total_quantity if sold and sold.total_quantity else 0,
+        sales_count=sold.sales_count if sold and sold.sales_count else 0
     )
     
     return DailyReport(
@@ -69,28 +50,60 @@ def get_daily_report(report_date: date, db: Session = Depends(get_db)):
         net_inventory_value=net_amount
     )
 
-@router.get("/profit/{report_date}")
+@router.get("/daily/{report_date}", response_model=DailyReport,
+            dependencies=[Depends(etag_for(*DAILY_REPORT_TABLES))])
+@cached_report("reports.daily", tags=lambda report_date: [("date", report_date)], versions=DAILY_REPORT_TABLES)
+def get_daily_report(report_date: date, db: Session = Depends(get_db)):
+    """Get complete daily report including supplier and sales data"""
+    
+    # Supplier Summary
+    supply_result = db.query(
+        func.sum(SupplierInventory.total_amount).label('total'),
+        func.count(SupplierInventory.id).label('count')
+    ).filter(SupplierInventory.supply_date == report_date).first()
+    
+    return_result = db.query(
+        func.sum(SupplierReturn.total_amount).label('total'),
+        func.count(SupplierReturn.id).label('count')
+    ).filter(SupplierReturn.return_date == report_date).first()
+    
+    # Sales Summary
+    sales_result = db.query(
+        func.sum(DailySalesRollup.total_revenue).label('total_sales'),
+        func.sum(DailySalesRollup.total_profit).label('total_profit'),
+        func.sum(DailySalesRollup.total_quantity).label('total_quantity'),
+        func.sum(DailySalesRollup.sales_count).label('sales_count')
+    ).filter(DailySalesRollup.sale_date == report_date).first()
+    
+    return _build_daily_report(report_date, supply_result, return_result, sales_result)
+
+@router.get("/profit/{report_date}", dependencies=[Depends(etag_for(*PROFIT_REPORT_TABLES))])
+@cached_report("reports.profit", tags=lambda report_date: [("date", report_date)], versions=PROFIT_REPORT_TABLES)
 def get_profit_report(report_date: date, db: Session = Depends(get_db)):
     """Get detailed profit breakdown for a specific date"""
     
     # Get profit by variety
     profit_by_variety = db.query(
-        Sale.variety_id,
-        func.sum(Sale.profit).label('total_profit'),
-        func.sum(Sale.quantity).label('total_quantity')
-    ).filter(Sale.sale_date == report_date).group_by(Sale.variety_id).all()
+        DailySalesRollup.variety_id,
+        func.sum(DailySalesRollup.total_profit).label('total_profit'),
+        func.sum(DailySalesRollup.total_quantity).label('total_quantity')
+    ).filter(
+        DailySalesRollup.sale_date == report_date
+    ).group_by(DailySalesRollup.variety_id).all()
     
     # Get profit by salesperson
     profit_by_salesperson = db.query(
-        Sale.salesperson_name,
-        func.sum(Sale.profit).label('total_profit'),
-        func.sum(Sale.quantity).label('total_quantity')
-    ).filter(Sale.sale_date == report_date).group_by(Sale.salesperson_name).all()
+        DailySalesRollup.salesperson_name,
+        func.sum(DailySalesRollup.total_profit).label('total_profit'),
+        func.sum(DailySalesRollup.total_quantity).label('total_quantity')
+    ).filter(
+        DailySalesRollup.sale_date == report_date
+    ).group_by(DailySalesRollup.salesperson_name).all()
     
     # Calculate total profit
     total_profit_result = db.query(
-        func.sum(Sale.profit).label('total_profit')
-    ).filter(Sale.sale_date == report_date).first()
+        func.sum(DailySalesRollup.total_profit).label('total_profit')
+    ).filter(DailySalesRollup.sale_date == report_date).first()
     
     total_profit = total_profit_result.total_profit if total_profit_result.total_profit else Decimal('0.00')
     
@@ -114,3 +127,142 @@ def get_profit_report(report_date: date, db: Session = Depends(get_db)):
             for item in profit_by_salesperson
         ]
     }
+
+@router.get("/range", response_model=RangeReport)
+def get_range_report(
+    start: date = Query(..., description="First date of the range"),
+    end: date = Query(..., description="Last date of the range"),
+    include_variety: bool = Query(False, description="Add per-variety sales and profit"),
+    include_salesperson: bool = Query(False, description="Add per-salesperson sales and profit"),
+    db: Session = Depends(get_db)
+):
+    """Get per-day and total supply, returns, sales and profit for a date range"""
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be on or after start"
+        )
+
+    # One grouped query per table
+    supplies = db.query(
+        SupplierInventory.supply_date.label('day'),
+        func.sum(SupplierInventory.total_amount).label('total'),
+        func.count(SupplierInventory.id).label('count')
+    ).filter(
+        SupplierInventory.supply_date >= start,
+        SupplierInventory.supply_date <= end
+    ).group_by(SupplierInventory.supply_date).all()
+
+    returns = db.query(
+        SupplierReturn.return_date.label('day'),
+        func.sum(SupplierReturn.total_amount).label('total'),
+        func.count(SupplierReturn.id).label('count')
+    ).filter(
+        SupplierReturn.return_date >= start,
+        SupplierReturn.return_date <= end
+    ).group_by(SupplierReturn.return_date).all()
+
+    sales = db.query(
+        DailySalesRollup.sale_date.label('day'),
+        func.sum(DailySalesRollup.total_revenue).label('total_sales'),
+        func.sum(DailySalesRollup.total_profit).label('total_profit'),
+        func.sum(DailySalesRollup.total_quantity).label('total_quantity'),
+        func.sum(DailySalesRollup.sales_count).label('sales_count')
+    ).filter(
+        DailySalesRollup.sale_date >= start,
+        DailySalesRollup.sale_date <= end
+    ).group_by(DailySalesRollup.sale_date).all()
+
+    supply_by_day = {row.day: row for row in supplies}
+    returns_by_day = {row.day: row for row in returns}
+    sales_by_day = {row.day: row for row in sales}
+
+    days = sorted(set(supply_by_day) | set(returns_by_day) | set(sales_by_day))
+    daily = [
+        _build_daily_report(day, supply_by_day.get(day), returns_by_day.get(day), sales_by_day.get(day))
+        for day in days
+    ]
+
+    # Range totals are folded from the per-day rows, no extra queries
+    supplier_summary = DailySupplierSummary(
+        date=start,
+        total_supply=sum((d.supplier_summary.total_supply for d in daily), Decimal('0.00')),
+        total_returns=sum((d.supplier_summary.total_returns for d in daily), Decimal('0.00')),
+        net_amount=sum((d.supplier_summary.net_amount for d in daily), Decimal('0.00')),
+        supply_count=sum(d.supplier_summary.supply_count for d in daily),
+        return_count=sum(d.supplier_summary.return_count for d in daily)
+    )
+    sales_summary = DailySalesSummary(
+        date=start,
+        total_sales_amount=sum((d.sales_summary.total_sales_amount for d in daily), Decimal('0.00')),
+        total_profit=sum((d.sales_summary.total_profit for d in daily), Decimal('0.00')),
+        total_quantity_sold=sum((d.sales_summary.total_quantity_sold for d in daily), Decimal('0')),
+        sales_count=sum(d.sales_summary.sales_count for d in daily)
+    )
+
+    profit_by_variety = None
+    if include_variety:
+        rows = db.query(
+            DailySalesRollup.variety_id,
+            ClothVariety.name.label('variety_name'),
+            func.sum(DailySalesRollup.total_revenue).label('total_sales'),
+            func.sum(DailySalesRollup.total_profit).label('total_profit'),
+            func.sum(DailySalesRollup.total_quantity).label('total_quantity'),
+            func.sum(DailySalesRollup.sales_count).label('sales_count')
+        ).join(
+            ClothVariety, ClothVariety.id == DailySalesRollup.variety_id
+        ).filter(
+            DailySalesRollup.sale_date >= start,
+            DailySalesRollup.sale_date <= end
+        ).group_by(
+            DailySalesRollup.variety_id, ClothVariety.name
+        ).order_by(func.sum(DailySalesRollup.total_revenue).desc()).all()
+
+        profit_by_variety = [
+            RangeVarietyBreakdown(
+                variety_id=row.variety_id,
+                variety_name=row.variety_name,
+                total_sales=row.total_sales,
+                total_profit=row.total_profit,
+                total_quantity=row.total_quantity,
+                sales_count=row.sales_count
+            )
+            for row in rows
+        ]
+
+    profit_by_salesperson = None
+    if include_salesperson:
+        rows = db.query(
+            DailySalesRollup.salesperson_name,
+            func.sum(DailySalesRollup.total_revenue).label('total_sales'),
+            func.sum(DailySalesRollup.total_profit).label('total_profit'),
+            func.sum(DailySalesRollup.total_quantity).label('total_quantity'),
+            func.sum(DailySalesRollup.sales_count).label('sales_count')
+        ).filter(
+            DailySalesRollup.sale_date >= start,
+            DailySalesRollup.sale_date <= end
+        ).group_by(
+            DailySalesRollup.salesperson_name
+        ).order_by(func.sum(DailySalesRollup.total_revenue).desc()).all()
+
+        profit_by_salesperson = [
+            RangeSalespersonBreakdown(
+                salesperson_name=row.salesperson_name,
+                total_sales=row.total_sales,
+                total_profit=row.total_profit,
+                total_quantity=row.total_quantity,
+                sales_count=row.sales_count
+            )
+            for row in rows
+        ]
+
+    return RangeReport(
+        start_date=start,
+        end_date=end,
+        supplier_summary=supplier_summary,
+        sales_summary=sales_summary,
+        net_inventory_value=supplier_summary.net_amount,
+        daily=daily,
+        profit_by_variety=profit_by_variety,
+        profit_by_salesperson=profit_by_salesperson
+    )
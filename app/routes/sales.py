@@ -1,26 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import func, select
+from typing import List, Optional
 from datetime import date
 from decimal import Decimal
-from database import get_db
-from models import Sale, ClothVariety
-from schemas import SaleCreate, SaleResponse, DailySalesSummary, SalespersonSummary
+from database import get_async_db
+from models import Sale, ClothVariety, DailySalesRollup
+from pydantic import ValidationError
+from schemas import (
+    SaleCreate, SaleResponse, DailySalesSummary, SalespersonSummary,
+    BulkSaleRequest, BulkSaleResponse, BulkSaleRowError
+)
+from rollup import record_sale, record_sales, remove_sale, line_revenue, metric_deltas
+from report_cache import invalidate_dates
+from change_versions import bump, async_etag_for
+from metrics_store import metrics_store
+from pagination import keyset_paginate, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/sales", tags=["Sales Management"])
 
-@router.post("/", response_model=SaleResponse, status_code=status.HTTP_201_CREATED)
-def create_sale(sale: SaleCreate, db: Session = Depends(get_db)):
-    """Record a new sale - expects total amounts, stores per-unit prices"""
-    # Check if variety exists
-    variety = db.query(ClothVariety).filter(ClothVariety.id == sale.variety_id).first()
-    if not variety:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Cloth variety with ID {sale.variety_id} not found"
-        )
-    
+def _build_sale(sale: SaleCreate) -> Sale:
+    """Turn a SaleCreate (total amounts) into a Sale row with per-unit prices"""
     # Convert total amounts to per-unit prices
     # Keep quantity as Decimal to preserve precision (e.g., 45.5)
     quantity = Decimal(str(sale.quantity))
@@ -43,42 +45,139 @@ def create_sale(sale: SaleCreate, db: Session = Depends(get_db)):
         selling_price=selling_per_unit,  # Store per-unit price
         cost_price=cost_per_unit,        # Store per-unit price
         profit=total_profit,
+        revenue=line_revenue(selling_per_unit, quantity),
         sale_date=sale.sale_date
     )
+    return db_sale
+
+@router.post("/", response_model=SaleResponse, status_code=status.HTTP_201_CREATED)
+async def create_sale(sale: SaleCreate, db: AsyncSession = Depends(get_async_db)):
+    """Record a new sale - expects total amounts, stores per-unit prices"""
+    # Check if variety exists
+    variety = await db.get(ClothVariety, sale.variety_id)
+    if not variety:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cloth variety with ID {sale.variety_id} not found"
+        )
     
+    db_sale = _build_sale(sale)
+
     db.add(db_sale)
-    db.commit()
-    db.refresh(db_sale)
-    return db_sale
+    await db.run_sync(record_sale, db_sale)
+    await db.run_sync(bump, "sales")
+    await db.commit()
+    invalidate_dates([db_sale.sale_date], sales=True)
+    await asyncio.to_thread(metrics_store.apply, metric_deltas([db_sale]))
+
+    # Reload with the variety attached; lazy loads are not allowed under asyncio
+    result = await db.execute(
+        select(Sale).options(joinedload(Sale.variety))
+        .where(Sale.id == db_sale.id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+@router.post("/bulk", response_model=BulkSaleResponse, status_code=status.HTTP_201_CREATED)
+async def create_sales_bulk(request: BulkSaleRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Record many sales in one transaction (e.g. an end-of-day POS upload).
+    Invalid rows are reported by index and skipped; valid rows are inserted together.
+    """
+    errors = []
+    valid = []
+    for index, row in enumerate(request.sales):
+        try:
+            valid.append((index, SaleCreate.model_validate(row)))
+        except ValidationError as e:
+            errors.append(BulkSaleRowError(
+                index=index,
+                detail=e.errors(include_url=False, include_context=False)
+            ))
+
+    # One query for every referenced variety instead of one per row
+    variety_ids = {sale.variety_id for _, sale in valid}
+    known_ids = set((await db.execute(
+        select(ClothVariety.id).where(ClothVariety.id.in_(variety_ids))
+    )).scalars()) if variety_ids else set()
+
+    new_sales = []
+    for index, sale in valid:
+        if sale.variety_id not in known_ids:
+            errors.append(BulkSaleRowError(
+                index=index,
+                detail=f"Cloth variety with ID {sale.variety_id} not found"
+            ))
+            continue
+        new_sales.append(_build_sale(sale))
+
+    if new_sales:
+        # A single flush batches the INSERTs (executemany / insertmanyvalues)
+        db.add_all(new_sales)
+        await db.flush()
+        await db.run_sync(record_sales, new_sales)
+        await db.run_sync(bump, "sales")
+        await db.commit()
+        invalidate_dates({sale.sale_date for sale in new_sales}, sales=True)
+        await asyncio.to_thread(metrics_store.apply, metric_deltas(new_sales))
 
-@router.get("/", response_model=List[SaleResponse])
-def get_all_sales(db: Session = Depends(get_db)):
-    """Get all sales records"""
-    sales = db.query(Sale).all()
+    errors.sort(key=lambda error: error.index)
+    return BulkSaleResponse(
+        created_count=len(new_sales),
+        failed_count=len(errors),
+        sale_ids=[sale.id for sale in new_sales],
+        errors=errors
+    )
+
+@router.get("/", response_model=List[SaleResponse],
+            dependencies=[Depends(async_etag_for("sales", "cloth_varieties"))])
+async def get_all_sales(
+    response: Response,
+    start: Optional[date] = Query(None, description="First sale date to include"),
+    end: Optional[date] = Query(None, description="Last sale date to include"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit limit and cursor to get every row"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get sales records in (sale_date, id) order; paged when limit or cursor is given"""
+    sales = await db.run_sync(lambda session: keyset_paginate(
+        session.query(Sale).options(joinedload(Sale.variety)), Sale.sale_date, Sale.id, response,
+        start=start, end=end, cursor=cursor, limit=limit
+    ))
     return sales
 
-@router.get("/date/{sale_date}", response_model=List[SaleResponse])
-def get_sales_by_date(sale_date: date, db: Session = Depends(get_db)):
+@router.get("/date/{sale_date}", response_model=List[SaleResponse],
+            dependencies=[Depends(async_etag_for("sales", "cloth_varieties"))])
+async def get_sales_by_date(sale_date: date, db: AsyncSession = Depends(get_async_db)):
     """Get all sales for a specific date"""
-    sales = db.query(Sale).filter(Sale.sale_date == sale_date).all()
-    return sales
+    result = await db.execute(
+        select(Sale).options(joinedload(Sale.variety)).where(
+            Sale.sale_date == sale_date
+        )
+    )
+    return result.scalars().all()
 
 @router.get("/salesperson/{salesperson_name}", response_model=List[SaleResponse])
-def get_sales_by_salesperson(salesperson_name: str, db: Session = Depends(get_db)):
+async def get_sales_by_salesperson(salesperson_name: str, db: AsyncSession = Depends(get_async_db)):
     """Get all sales by a specific salesperson"""
-    sales = db.query(Sale).filter(Sale.salesperson_name == salesperson_name).all()
-    return sales
+    result = await db.execute(
+        select(Sale).options(joinedload(Sale.variety)).where(
+            Sale.salesperson_name == salesperson_name
+        )
+    )
+    return result.scalars().all()
 
-@router.get("/daily-summary/{sale_date}", response_model=DailySalesSummary)
-def get_daily_sales_summary(sale_date: date, db: Session = Depends(get_db)):
+@router.get("/daily-summary/{sale_date}", response_model=DailySalesSummary,
+            dependencies=[Depends(async_etag_for("sales"))])
+async def get_daily_sales_summary(sale_date: date, db: AsyncSession = Depends(get_async_db)):
     """Get sales summary for a specific date"""
     
-    result = db.query(
-        func.sum(Sale.selling_price * Sale.quantity).label('total_sales'),
-        func.sum(Sale.profit).label('total_profit'),
-        func.sum(Sale.quantity).label('total_quantity'),
-        func.count(Sale.id).label('sales_count')
-    ).filter(Sale.sale_date == sale_date).first()
+    result = (await db.execute(select(
+        func.sum(DailySalesRollup.total_revenue).label('total_sales'),
+        func.sum(DailySalesRollup.total_profit).label('total_profit'),
+        func.sum(DailySalesRollup.total_quantity).label('total_quantity'),
+        func.sum(DailySalesRollup.sales_count).label('sales_count')
+    ).where(DailySalesRollup.sale_date == sale_date))).first()
     
     total_sales = result.total_sales if result.total_sales else Decimal('0.00')
     total_profit = result.total_profit if result.total_profit else Decimal('0.00')
@@ -94,18 +193,18 @@ def get_daily_sales_summary(sale_date: date, db: Session = Depends(get_db)):
     )
 
 @router.get("/salesperson-summary/{salesperson_name}/{sale_date}", response_model=SalespersonSummary)
-def get_salesperson_summary(salesperson_name: str, sale_date: date, db: Session = Depends(get_db)):
+async def get_salesperson_summary(salesperson_name: str, sale_date: date, db: AsyncSession = Depends(get_async_db)):
     """Get sales summary for a specific salesperson on a specific date"""
     
-    result = db.query(
-        func.sum(Sale.selling_price * Sale.quantity).label('total_sales'),
-        func.sum(Sale.profit).label('total_profit'),
-        func.sum(Sale.quantity).label('total_items'),
-        func.count(Sale.id).label('sales_count')
-    ).filter(
-        Sale.salesperson_name == salesperson_name,
-        Sale.sale_date == sale_date
-    ).first()
+    result = (await db.execute(select(
+        func.sum(DailySalesRollup.total_revenue).label('total_sales'),
+        func.sum(DailySalesRollup.total_profit).label('total_profit'),
+        func.sum(DailySalesRollup.total_quantity).label('total_items'),
+        func.sum(DailySalesRollup.sales_count).label('sales_count')
+    ).where(
+        DailySalesRollup.salesperson_name == salesperson_name,
+        DailySalesRollup.sale_date == sale_date
+    ))).first()
     
     total_sales = result.total_sales if result.total_sales else Decimal('0.00')
     total_profit = result.total_profit if result.total_profit else Decimal('0.00')
@@ -122,15 +221,19 @@ def get_salesperson_summary(salesperson_name: str, sale_date: date, db: Session
     )
 
 @router.delete("/{sale_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_sale(sale_id: int, db: Session = Depends(get_db)):
+async def delete_sale(sale_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a sale record"""
-    sale = db.query(Sale).filter(Sale.id == sale_id).first()
+    sale = await db.get(Sale, sale_id)
     if not sale:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Sale with ID {sale_id} not found"
         )
     
-    db.delete(sale)
-    db.commit()
+    await db.delete(sale)
+    await db.run_sync(remove_sale, sale)
+    await db.run_sync(bump, "sales")
+    await db.commit()
+    invalidate_dates([sale.sale_date], sales=True)
+    await asyncio.to_thread(metrics_store.apply, metric_deltas([sale], sign=-1))
     return None
\ No newline at end of file
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional
 from datetime import date
 from decimal import Decimal
 from database import get_db
@@ -11,6 +11,9 @@ from schemas import (
     SupplierReturnCreate, SupplierReturnResponse,
     DailySupplierSummary
 )
+from report_cache import cached_report, invalidate_dates
+from change_versions import bump, etag_for
+from pagination import keyset_paginate, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/supplier", tags=["Supplier Management"])
 
@@ -34,20 +37,36 @@ def add_supplier_inventory(inventory: SupplierInventoryCreate, db: Session = Dep
         total_amount=total_amount
     )
     db.add(db_inventory)
+    bump(db, "supplier_inventory")
     db.commit()
+    invalidate_dates([inventory.supply_date])
     db.refresh(db_inventory)
     return db_inventory
 
 @router.get("/inventory", response_model=List[SupplierInventoryResponse])
-def get_all_inventory(db: Session = Depends(get_db)):
-    """Get all supplier inventory records"""
-    inventories = db.query(SupplierInventory).all()
+def get_all_inventory(
+    response: Response,
+    start: Optional[date] = Query(None, description="First supply date to include"),
+    end: Optional[date] = Query(None, description="Last supply date to include"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit limit and cursor to get every row"),
+    db: Session = Depends(get_db)
+):
+    """Get supplier inventory records in (supply_date, id) order; paged when limit or cursor is given"""
+    inventories = keyset_paginate(
+        db.query(SupplierInventory).options(joinedload(SupplierInventory.variety)),
+        SupplierInventory.supply_date, SupplierInventory.id, response,
+        start=start, end=end, cursor=cursor, limit=limit
+    )
     return inventories
 
-@router.get("/inventory/date/{supply_date}", response_model=List[SupplierInventoryResponse])
+@router.get("/inventory/date/{supply_date}", response_model=List[SupplierInventoryResponse],
+            dependencies=[Depends(etag_for("supplier_inventory", "cloth_varieties"))])
 def get_inventory_by_date(supply_date: date, db: Session = Depends(get_db)):
     """Get supplier inventory for a specific date"""
-    inventories = db.query(SupplierInventory).filter(
+    inventories = db.query(SupplierInventory).options(
+        joinedload(SupplierInventory.variety)
+    ).filter(
         SupplierInventory.supply_date == supply_date
     ).all()
     return inventories
@@ -63,7 +82,9 @@ def delete_inventory(inventory_id: int, db: Session = Depends(get_db)):
         )
     
     db.delete(inventory)
+    bump(db, "supplier_inventory")
     db.commit()
+    invalidate_dates([inventory.supply_date])
     return None
 
 # Supplier Return Endpoints
@@ -86,20 +107,36 @@ def add_supplier_return(return_item: SupplierReturnCreate, db: Session = Depends
         total_amount=total_amount
     )
     db.add(db_return)
+    bump(db, "supplier_returns")
     db.commit()
+    invalidate_dates([return_item.return_date])
     db.refresh(db_return)
     return db_return
 
 @router.get("/returns", response_model=List[SupplierReturnResponse])
-def get_all_returns(db: Session = Depends(get_db)):
-    """Get all supplier return records"""
-    returns = db.query(SupplierReturn).all()
+def get_all_returns(
+    response: Response,
+    start: Optional[date] = Query(None, description="First return date to include"),
+    end: Optional[date] = Query(None, description="Last return date to include"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit limit and cursor to get every row"),
+    db: Session = Depends(get_db)
+):
+    """Get supplier return records in (return_date, id) order; paged when limit or cursor is given"""
+    returns = keyset_paginate(
+        db.query(SupplierReturn).options(joinedload(SupplierReturn.variety)),
+        SupplierReturn.return_date, SupplierReturn.id, response,
+        start=start, end=end, cursor=cursor, limit=limit
+    )
     return returns
 
-@router.get("/returns/date/{return_date}", response_model=List[SupplierReturnResponse])
+@router.get("/returns/date/{return_date}", response_model=List[SupplierReturnResponse],
+            dependencies=[Depends(etag_for("supplier_returns", "cloth_varieties"))])
 def get_returns_by_date(return_date: date, db: Session = Depends(get_db)):
     """Get supplier returns for a specific date"""
-    returns = db.query(SupplierReturn).filter(
+    returns = db.query(SupplierReturn).options(
+        joinedload(SupplierReturn.variety)
+    ).filter(
         SupplierReturn.return_date == return_date
     ).all()
     return returns
@@ -115,7 +152,9 @@ def delete_return(return_id: int, db: Session = Depends(get_db)):
         )
     
     db.delete(return_record)
+    bump(db, "supplier_returns")
     db.commit()
+    invalidate_dates([return_record.return_date])
     return None
 
 # Daily Summary Endpoint
@@ -155,6 +194,7 @@ def get_daily_supplier_summary(summary_date: date, db: Session = Depends(get_db)
 
 # Supplier-wise Summary
 @router.get("/supplier-summary/{summary_date}")
+@cached_report("supplier.supplier_summary", tags=lambda summary_date: [("date", summary_date)])
 def get_supplier_wise_summary(summary_date: date, db: Session = Depends(get_db)):
     """Get summary grouped by supplier for a specific date"""
     
@@ -2,9 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from database import get_db
-from models import ClothVariety
+from models import ClothVariety, DailySalesRollup
 from schemas import ClothVarietyCreate, ClothVarietyResponse, ClothVarietyUpdate
 from models import MeasurementUnit
+from report_cache import report_cache
+from change_versions import bump, etag_for, TRACKED_TABLES
+from metrics_store import metrics_store
 
 router = APIRouter(prefix="/varieties", tags=["Cloth Varieties"])
 
@@ -21,17 +24,21 @@ def create_variety(variety: ClothVarietyCreate, db: Session = Depends(get_db)):
     
     db_variety = ClothVariety(**variety.model_dump())
     db.add(db_variety)
+    bump(db, "cloth_varieties")
     db.commit()
+    report_cache.clear()
     db.refresh(db_variety)
     return db_variety
 
-@router.get("/", response_model=List[ClothVarietyResponse])
+@router.get("/", response_model=List[ClothVarietyResponse],
+            dependencies=[Depends(etag_for("cloth_varieties"))])
 def get_all_varieties(db: Session = Depends(get_db)):
     """Get all cloth varieties"""
     varieties = db.query(ClothVariety).all()
     return varieties
 
-@router.get("/{variety_id}", response_model=ClothVarietyResponse)
+@router.get("/{variety_id}", response_model=ClothVarietyResponse,
+            dependencies=[Depends(etag_for("cloth_varieties"))])
 def get_variety(variety_id: int, db: Session = Depends(get_db)):
     """Get a specific cloth variety by ID"""
     variety = db.query(ClothVariety).filter(ClothVariety.id == variety_id).first()
@@ -53,7 +60,17 @@ def delete_variety(variety_id: int, db: Session = Depends(get_db)):
         )
     
     db.delete(variety)
+    # The rollup has no ORM relationship and SQLite does not enforce its
+    # ON DELETE CASCADE, so its rows are removed here explicitly
+    db.query(DailySalesRollup).filter(
+        DailySalesRollup.variety_id == variety_id
+    ).delete(synchronize_session=False)
+    # Cascaded sales/supply rows change along with the variety
+    bump(db, *TRACKED_TABLES)
     db.commit()
+    # Cascaded sales/supply rows and variety names appear in every report
+    report_cache.clear()
+    metrics_store.clear_variety(variety_id)
     return None
 
 
@@ -106,7 +123,9 @@ def update_variety(
     for field, value in update_data.items():
         setattr(db_variety, field, value)
 
+    bump(db, "cloth_varieties")
     db.commit()
+    report_cache.clear()
     db.refresh(db_variety)
 
     return db_variety
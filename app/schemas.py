@@ -3,7 +3,7 @@
 from pydantic import BaseModel, Field, field_validator
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional, Literal, Dict
+from typing import Optional, Literal, Dict, List, Any
 from models import MeasurementUnit
 
 # Cloth Variety Schemas
@@ -100,6 +100,20 @@ class SaleResponse(SaleBase):
     class Config:
         from_attributes = True
 
+class BulkSaleRequest(BaseModel):
+    # Rows are validated one by one so a bad row doesn't reject the batch
+    sales: List[Dict[str, Any]] = Field(..., min_length=1, max_length=2000)
+
+class BulkSaleRowError(BaseModel):
+    index: int
+    detail: Any
+
+class BulkSaleResponse(BaseModel):
+    created_count: int
+    failed_count: int
+    sale_ids: List[int]
+    errors: List[BulkSaleRowError]
+
 # Summary Schemas
 class DailySupplierSummary(BaseModel):
     date: date
@@ -122,6 +136,31 @@ class DailyReport(BaseModel):
     sales_summary: DailySalesSummary
     net_inventory_value: Decimal
 
+class RangeVarietyBreakdown(BaseModel):
+    variety_id: int
+    variety_name: str
+    total_sales: Decimal
+    total_profit: Decimal
+    total_quantity: Decimal
+    sales_count: int
+
+class RangeSalespersonBreakdown(BaseModel):
+    salesperson_name: str
+    total_sales: Decimal
+    total_profit: Decimal
+    total_quantity: Decimal
+    sales_count: int
+
+class RangeReport(BaseModel):
+    start_date: date
+    end_date: date
+    supplier_summary: DailySupplierSummary  # totals over the range, dated start_date
+    sales_summary: DailySalesSummary        # totals over the range, dated start_date
+    net_inventory_value: Decimal
+    daily: List[DailyReport]                # only days with any activity
+    profit_by_variety: Optional[List[RangeVarietyBreakdown]] = None
+    profit_by_salesperson: Optional[List[RangeSalespersonBreakdown]] = None
+
 class SalespersonSummary(BaseModel):
     salesperson_name: str
     date: date
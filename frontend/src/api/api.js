@@ -16,13 +16,13 @@ export const updateVariety = (id, data) => api.put(`/varieties/${id}`, data);
 export const deleteVariety = (id) => api.delete(`/varieties/${id}`);
 
 // Supplier Inventory
-export const getSupplierInventory = () => api.get('/supplier/inventory');
+export const getSupplierInventory = (params) => api.get('/supplier/inventory', { params });
 export const getSupplierInventoryByDate = (date) => api.get(`/supplier/inventory/date/${date}`);
 export const createSupplierInventory = (data) => api.post('/supplier/inventory', data);
 export const deleteSupplierInventory = (id) => api.delete(`/supplier/inventory/${id}`);
 
 // Supplier Returns
-export const getSupplierReturns = () => api.get('/supplier/returns');
+export const getSupplierReturns = (params) => api.get('/supplier/returns', { params });
 export const getSupplierReturnsByDate = (date) => api.get(`/supplier/returns/date/${date}`);
 export const createSupplierReturn = (data) => api.post('/supplier/returns', data);
 export const deleteSupplierReturn = (id) => api.delete(`/supplier/returns/${id}`);
@@ -32,7 +32,7 @@ export const getSupplierDailySummary = (date) => api.get(`/supplier/daily-summar
 export const getSupplierWiseSummary = (date) => api.get(`/supplier/supplier-summary/${date}`);
 
 // Sales
-export const getSales = () => api.get('/sales/');
+export const getSales = (params) => api.get('/sales/', { params });
 export const getSalesByDate = (date) => api.get(`/sales/date/${date}`);
 export const createSale = (data) => api.post('/sales/', data);
 export const deleteSale = (id) => api.delete(`/sales/${id}`);
@@ -46,7 +46,7 @@ export const getDailyReport = (date) => api.get(`/reports/daily/${date}`);
 export const getProfitReport = (date) => api.get(`/reports/profit/${date}`);
 
 // Expenses
-export const getExpenses = () => api.get('/expenses/');
+export const getExpenses = (params) => api.get('/expenses/', { params });
 export const getExpensesByDate = (date) => api.get(`/expenses/date/${date}`);
 export const getExpensesByMonth = (year, month) => api.get(`/expenses/month/${year}/${month}`);
 export const createExpense = (data) => api.post('/expenses/', data);
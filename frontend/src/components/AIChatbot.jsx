@@ -164,7 +164,7 @@ const AIChatbot = () => {
     setIsLoading(true);
 
     try {
-      const response = await fetch(`${API_BASE_URL}/chatbot/chat`, {
+      const response = await fetch(`${API_BASE_URL}/chatbot/chat/stream`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -173,20 +173,69 @@ const AIChatbot = () => {
         })
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const data = await response.json();
-
-      const aiMessage = {
-        role: 'assistant',
-        content: data.response,
-        timestamp: data.timestamp,
-        model: data.model
+      // Show the reply as it streams in; replace the spinner on the first token
+      let started = false;
+      const updateReply = (patch) => {
+        setMessages(prev => {
+          const next = [...prev];
+          next[next.length - 1] = { ...next[next.length - 1], ...patch(next[next.length - 1]) };
+          return next;
+        });
       };
 
-      setMessages(prev => [...prev, aiMessage]);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let done = null;
+
+      while (true) {
+        const { value, done: finished } = await reader.read();
+        if (finished) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // SSE events are separated by a blank line
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+
+        for (const raw of events) {
+          const event = raw.match(/^event: (.*)$/m)?.[1];
+          const data = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || '{}');
+
+          if (event === 'token') {
+            if (!started) {
+              started = true;
+              setMessages(prev => [...prev, {
+                role: 'assistant',
+                content: '',
+                timestamp: new Date().toISOString(),
+                streaming: true
+              }]);
+            }
+            updateReply(msg => ({ content: msg.content + data.text }));
+          } else if (event === 'done') {
+            done = data;
+          }
+        }
+      }
+
+      if (!started) {
+        // Nothing streamed: not configured, or failed before the first token
+        setMessages(prev => [...prev, {
+          role: 'assistant',
+          content: done?.response || `I couldn't get a reply right now${done?.error ? ` (${done.error})` : ''}.`,
+          timestamp: done?.timestamp || new Date().toISOString(),
+          isError: !done?.success
+        }]);
+      } else {
+        updateReply(() => ({
+          streaming: false,
+          ...(done && { timestamp: done.timestamp, model: done.model, isError: !done.success })
+        }));
+      }
     } catch (error) {
       console.error('Error sending message:', error);
       const errorMessage = {
@@ -299,7 +348,7 @@ const AIChatbot = () => {
             ))}
 
             {/* Loading Indicator */}
-            {isLoading && (
+            {isLoading && !messages[messages.length - 1]?.streaming && (
               <div className="flex justify-start animate-fadeIn">
                 <div className="flex gap-2">
                   <div className="w-8 h-8 rounded-full bg-linear-to-br from-gray-700 to-gray-900 flex items-center justify-center">
@@ -8,6 +8,7 @@ const ProductDemandPredictor = () => {
   const [varieties, setVarieties] = useState([]);
   const [selectedVariety, setSelectedVariety] = useState(null);
   const [demandForecast, setDemandForecast] = useState(null);
+  const [forecastsByVariety, setForecastsByVariety] = useState({});
   const [loading, setLoading] = useState(false);
   const [forecastDays, setForecastDays] = useState(30);
 
@@ -30,17 +31,20 @@ const ProductDemandPredictor = () => {
     }
   };
 
-  const loadDemandForecast = async () => {
-    if (!selectedVariety) return;
-    
+  // One request forecasts every variety; switching products is then a local lookup
+  const loadDemandForecasts = async () => {
     setLoading(true);
     try {
       const response = await fetch(
-        `${API_BASE_URL}/predictions/product-demand/${selectedVariety}?days_ahead=${forecastDays}`
+        `${API_BASE_URL}/predictions/product-demand?days_ahead=${forecastDays}`
       );
       if (response.ok) {
         const data = await response.json();
-        setDemandForecast(data);
+        const byVariety = {};
+        data.products.forEach((product) => {
+          byVariety[product.variety_id] = product;
+        });
+        setForecastsByVariety(byVariety);
       }
     } catch (error) {
       console.error('Error loading demand forecast:', error);
@@ -50,10 +54,12 @@ const ProductDemandPredictor = () => {
   };
 
   useEffect(() => {
-    if (selectedVariety) {
-      loadDemandForecast();
-    }
-  }, [selectedVariety, forecastDays]);
+    loadDemandForecasts();
+  }, [forecastDays]);
+
+  useEffect(() => {
+    setDemandForecast(selectedVariety ? forecastsByVariety[selectedVariety] || null : null);
+  }, [selectedVariety, forecastsByVariety]);
 
   const getConfidenceBadge = (confidence) => {
     const colors = {
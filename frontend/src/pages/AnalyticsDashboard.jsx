@@ -4,296 +4,14 @@ import { TrendingUp, TrendingDown, DollarSign, ShoppingCart, Package, Award, Ale
 
 const API_BASE_URL = 'http://localhost:8000';
 
-// Helper function to get item count
-const getItemCount = (quantity, unit) => {
-  if (unit === 'meters' || unit === 'yards') return 1;
-  return parseFloat(quantity);
-};
-
-const getDateRange = (days) => {
-  const end = new Date();
-  const start = new Date();
-  start.setDate(start.getDate() - days + 1);
-  
-  start.setHours(0, 0, 0, 0);
-  end.setHours(23, 59, 59, 999);
-  
-  return { startDate: start, endDate: end };
-};
-
+// KPIs, series and per-product/salesperson/supplier stats are aggregated server-side
 const fetchRealAnalytics = async (days) => {
   try {
-    const { startDate, endDate } = getDateRange(days);
-
-    const [salesRes, inventoryRes, returnsRes, varietiesRes] = await Promise.all([
-      fetch(`${API_BASE_URL}/sales/`),
-      fetch(`${API_BASE_URL}/supplier/inventory`),
-      fetch(`${API_BASE_URL}/supplier/returns`),
-      fetch(`${API_BASE_URL}/varieties/`)
-    ]);
-
-    if (!salesRes.ok || !inventoryRes.ok || !returnsRes.ok || !varietiesRes.ok) {
+    const res = await fetch(`${API_BASE_URL}/analytics/dashboard?days=${days}`);
+    if (!res.ok) {
       throw new Error('Failed to fetch data');
     }
-
-    const [allSales, allInventory, allReturns, varieties] = await Promise.all([
-      salesRes.json(),
-      inventoryRes.json(),
-      returnsRes.json(),
-      varietiesRes.json()
-    ]);
-
-    // Filter data based on date range
-    const sales = allSales.filter(s => {
-      const saleDate = new Date(s.sale_date);
-      saleDate.setHours(0, 0, 0, 0);
-      return saleDate >= startDate && saleDate <= endDate;
-    });
-
-    const inventory = allInventory.filter(i => {
-      const supplyDate = new Date(i.supply_date);
-      supplyDate.setHours(0, 0, 0, 0);
-      return supplyDate >= startDate && supplyDate <= endDate;
-    });
-
-    const returns = allReturns.filter(r => {
-      const returnDate = new Date(r.return_date);
-      returnDate.setHours(0, 0, 0, 0);
-      return returnDate >= startDate && returnDate <= endDate;
-    });
-
-    console.log(`📊 Analyzing ${days} days:`, {
-      totalSales: sales.length,
-      dateRange: `${startDate.toLocaleDateString()} to ${endDate.toLocaleDateString()}`
-    });
-
-    // Create variety map
-    const varietyMap = {};
-    varieties.forEach(v => {
-      varietyMap[v.id] = v;
-    });
-
-    // CORRECT CALCULATION - Match Reports page logic
-    // Calculate totals EXACTLY like the backend does
-    const totalRevenue = sales.reduce((sum, sale) => 
-      sum + (parseFloat(sale.selling_price) * parseFloat(sale.quantity)), 0
-    );
-
-    const totalProfit = sales.reduce((sum, sale) => 
-      sum + parseFloat(sale.profit), 0
-    );
-
-    const totalSales = sales.length;
-
-    const totalItemsSold = sales.reduce((sum, sale) => {
-      const variety = varietyMap[sale.variety_id];
-      return sum + getItemCount(sale.quantity, variety?.measurement_unit || 'pieces');
-    }, 0);
-
-    const avgOrderValue = totalSales > 0 ? totalRevenue / totalSales : 0;
-    const profitMargin = totalRevenue > 0 ? (totalProfit / totalRevenue) * 100 : 0;
-
-    // Growth calculation
-    const midPoint = Math.floor(days / 2);
-    const midDate = new Date(startDate);
-    midDate.setDate(midDate.getDate() + midPoint);
-
-    const firstHalfSales = sales.filter(s => new Date(s.sale_date) < midDate);
-    const secondHalfSales = sales.filter(s => new Date(s.sale_date) >= midDate);
-
-    const firstHalfRevenue = firstHalfSales.reduce((sum, s) =>
-      sum + (parseFloat(s.selling_price) * parseFloat(s.quantity)), 0
-    );
-    const secondHalfRevenue = secondHalfSales.reduce((sum, s) =>
-      sum + (parseFloat(s.selling_price) * parseFloat(s.quantity)), 0
-    );
-
-    const growthRate = firstHalfRevenue > 0
-      ? ((secondHalfRevenue - firstHalfRevenue) / firstHalfRevenue) * 100
-      : 0;
-
-    // FIXED: Sales trend data - Initialize with zeros
-    const salesByDate = {};
-    
-    // Fix timezone issue: use the date string directly without converting
-    for (let d = new Date(startDate); d <= endDate; d.setDate(d.getDate() + 1)) {
-      const year = d.getFullYear();
-      const month = String(d.getMonth() + 1).padStart(2, '0');
-      const day = String(d.getDate()).padStart(2, '0');
-      const dateKey = `${year}-${month}-${day}`; // YYYY-MM-DD format
-      
-      salesByDate[dateKey] = { 
-        date: d.toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
-        dateKey: dateKey,
-        revenue: 0, 
-        profit: 0, 
-        sales: 0 
-      };
-    }
-
-    // CRITICAL FIX: Calculate revenue exactly like Reports page
-    sales.forEach(sale => {
-      const dateKey = sale.sale_date;
-      if (salesByDate[dateKey]) {
-        // Match the backend calculation exactly
-        const saleRevenue = parseFloat(sale.selling_price) * parseFloat(sale.quantity);
-        const saleProfit = parseFloat(sale.profit);
-        
-        salesByDate[dateKey].revenue += saleRevenue;
-        salesByDate[dateKey].profit += saleProfit;
-        salesByDate[dateKey].sales += 1;
-      }
-    });
-
-    const salesData = Object.values(salesByDate).sort((a, b) => 
-      new Date(a.dateKey) - new Date(b.dateKey)
-    );
-
-    // Debug: Log a few sample dates
-    console.log('📈 Sample sales data:', salesData.slice(-5).map(d => ({
-      date: d.date,
-      revenue: d.revenue.toFixed(2),
-      profit: d.profit.toFixed(2)
-    })));
-
-    // Product stats
-    const productStats = {};
-    sales.forEach(sale => {
-      const variety = varietyMap[sale.variety_id];
-      const name = variety ? variety.name : `Product ${sale.variety_id}`;
-
-      if (!productStats[name]) {
-        productStats[name] = {
-          name,
-          revenue: 0,
-          profit: 0,
-          quantity: 0,
-          items_sold: 0,
-          measurement_unit: variety?.measurement_unit || 'pieces',
-          margin: 0
-        };
-      }
-
-      const revenue = parseFloat(sale.selling_price) * parseFloat(sale.quantity);
-      const profit = parseFloat(sale.profit);
-
-      productStats[name].revenue += revenue;
-      productStats[name].profit += profit;
-      productStats[name].quantity += parseFloat(sale.quantity);
-      productStats[name].items_sold += getItemCount(sale.quantity, variety?.measurement_unit || 'pieces');
-    });
-
-    Object.values(productStats).forEach(product => {
-      product.margin = product.revenue > 0 ? (product.profit / product.revenue) * 100 : 0;
-    });
-
-    const topProducts = Object.values(productStats)
-      .sort((a, b) => b.revenue - a.revenue)
-      .slice(0, 5);
-
-    // Salesperson performance
-    const salespersonStats = {};
-    sales.forEach(sale => {
-      const variety = varietyMap[sale.variety_id];
-      const name = sale.salesperson_name;
-
-      if (!salespersonStats[name]) {
-        salespersonStats[name] = {
-          name,
-          transactions: 0,
-          revenue: 0,
-          profit: 0,
-          quantity: 0,
-          items_sold: 0,
-          avgTransactionValue: 0
-        };
-      }
-
-      const revenue = parseFloat(sale.selling_price) * parseFloat(sale.quantity);
-      const profit = parseFloat(sale.profit);
-
-      salespersonStats[name].transactions += 1;
-      salespersonStats[name].revenue += revenue;
-      salespersonStats[name].profit += profit;
-      salespersonStats[name].quantity += parseFloat(sale.quantity);
-      salespersonStats[name].items_sold += getItemCount(sale.quantity, variety?.measurement_unit || 'pieces');
-    });
-
-    Object.values(salespersonStats).forEach(person => {
-      person.avgTransactionValue = person.transactions > 0
-        ? person.revenue / person.transactions
-        : 0;
-    });
-
-    const salespersonPerformance = Object.values(salespersonStats)
-      .sort((a, b) => b.revenue - a.revenue);
-
-    // Supplier performance
-    const supplierStats = {};
-
-    inventory.forEach(inv => {
-      const name = inv.supplier_name;
-      if (!supplierStats[name]) {
-        supplierStats[name] = { name, totalSupply: 0, returns: 0, netAmount: 0, reliability: 0 };
-      }
-      supplierStats[name].totalSupply += parseFloat(inv.total_amount);
-    });
-
-    returns.forEach(ret => {
-      const name = ret.supplier_name;
-      if (!supplierStats[name]) {
-        supplierStats[name] = { name, totalSupply: 0, returns: 0, netAmount: 0, reliability: 0 };
-      }
-      supplierStats[name].returns += parseFloat(ret.total_amount);
-    });
-
-    Object.values(supplierStats).forEach(supplier => {
-      supplier.netAmount = supplier.totalSupply - supplier.returns;
-      supplier.reliability = supplier.totalSupply > 0
-        ? ((supplier.totalSupply - supplier.returns) / supplier.totalSupply) * 100
-        : 100;
-    });
-
-    const suppliers = Object.values(supplierStats)
-      .sort((a, b) => b.netAmount - a.netAmount)
-      .slice(0, 5);
-
-    // Product mix
-    const totalRevenueByProduct = topProducts.reduce((sum, p) => sum + p.revenue, 0);
-    const productMix = topProducts.map(product => ({
-      name: product.name,
-      value: totalRevenueByProduct > 0 ? (product.revenue / totalRevenueByProduct) * 100 : 0,
-      amount: product.revenue
-    }));
-
-    const topProduct = topProducts.length > 0 ? topProducts[0] : null;
-    const topProductShare = topProduct && totalRevenue > 0 ? (topProduct.revenue / totalRevenue) * 100 : 0;
-
-    console.log('✅ Final KPIs:', {
-      totalRevenue: totalRevenue.toFixed(2),
-      totalProfit: totalProfit.toFixed(2),
-      totalSales,
-      dataPoints: salesData.length
-    });
-
-    return {
-      kpis: {
-        totalRevenue: Math.round(totalRevenue),
-        totalProfit: Math.round(totalProfit),
-        totalSales,
-        totalItemsSold,
-        avgOrderValue: Math.round(avgOrderValue),
-        growthRate: parseFloat(growthRate.toFixed(1)),
-        profitMargin: parseFloat(profitMargin.toFixed(1)),
-        topProduct: topProduct ? topProduct.name : 'N/A',
-        topProductShare: parseFloat(topProductShare.toFixed(1))
-      },
-      salesData,
-      topProducts,
-      suppliers,
-      productMix,
-      salespersonPerformance
-    };
+    return await res.json();
   } catch (error) {
     console.error('❌ Error fetching analytics:', error);
     throw error;
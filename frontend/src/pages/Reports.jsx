@@ -58,114 +58,51 @@ export default function Reports() {
   const loadRangeReport = async () => {
     setLoading(true);
     try {
-      const [allSales, allInventory, allReturns] = await Promise.all([
-        api.get('/sales/'),
-        api.get('/supplier/inventory'),
-        api.get('/supplier/returns')
-      ]);
-
-      const filteredSales = allSales.filter(sale => {
-        const saleDate = new Date(sale.sale_date);
-        return saleDate >= new Date(startDate) && saleDate <= new Date(endDate);
-      });
-
-      const filteredInventory = allInventory.filter(inv => {
-        const invDate = new Date(inv.supply_date);
-        return invDate >= new Date(startDate) && invDate <= new Date(endDate);
+      const params = new URLSearchParams({
+        start: startDate,
+        end: endDate,
+        include_variety: 'true',
+        include_salesperson: 'true'
       });
-
-      const filteredReturns = allReturns.filter(ret => {
-        const retDate = new Date(ret.return_date);
-        return retDate >= new Date(startDate) && retDate <= new Date(endDate);
-      });
-
-      const totalRevenue = filteredSales.reduce((sum, sale) =>
-        sum + (parseFloat(sale.selling_price) * sale.quantity), 0
-      );
-
-      const totalProfit = filteredSales.reduce((sum, sale) =>
-        sum + parseFloat(sale.profit), 0
-      );
-
-      const totalItemsSold = filteredSales.reduce((sum, sale) =>
-        sum + sale.quantity, 0
-      );
-
-      const totalSupply = filteredInventory.reduce((sum, inv) =>
-        sum + parseFloat(inv.total_amount), 0
-      );
-
-      const totalReturns = filteredReturns.reduce((sum, ret) =>
-        sum + parseFloat(ret.total_amount), 0
-      );
-
-      const salesBySalesperson = filteredSales.reduce((acc, sale) => {
-        const name = sale.salesperson_name;
-        if (!acc[name]) {
-          acc[name] = {
-            name,
-            revenue: 0,
-            profit: 0,
-            transactions: 0,
-            itemsSold: 0
-          };
-        }
-        acc[name].revenue += parseFloat(sale.selling_price) * sale.quantity;
-        acc[name].profit += parseFloat(sale.profit);
-        acc[name].transactions += 1;
-        acc[name].itemsSold += sale.quantity;
-        return acc;
-      }, {});
-
-      const salespersonData = Object.values(salesBySalesperson)
-        .sort((a, b) => b.revenue - a.revenue);
-
-      const productStats = filteredSales.reduce((acc, sale) => {
-        const varietyName = sale.variety?.name || `Product ${sale.variety_id}`;
-        if (!acc[varietyName]) {
-          acc[varietyName] = {
-            name: varietyName,
-            revenue: 0,
-            profit: 0,
-            quantity: 0
-          };
-        }
-        acc[varietyName].revenue += parseFloat(sale.selling_price) * sale.quantity;
-        acc[varietyName].profit += parseFloat(sale.profit);
-        acc[varietyName].quantity += sale.quantity;
-        return acc;
-      }, {});
-
-      const topProducts = Object.values(productStats)
-        .sort((a, b) => b.revenue - a.revenue)
-        .slice(0, 10);
-
-      const dailyBreakdown = filteredSales.reduce((acc, sale) => {
-        const date = sale.sale_date;
-        if (!acc[date]) {
-          acc[date] = {
-            date,
-            revenue: 0,
-            profit: 0,
-            transactions: 0
-          };
-        }
-        acc[date].revenue += parseFloat(sale.selling_price) * sale.quantity;
-        acc[date].profit += parseFloat(sale.profit);
-        acc[date].transactions += 1;
-        return acc;
-      }, {});
-
-      const dailyData = Object.values(dailyBreakdown)
-        .sort((a, b) => new Date(a.date) - new Date(b.date));
+      const report = await api.get(`/reports/range?${params}`);
+
+      const totalRevenue = parseFloat(report.sales_summary.total_sales_amount);
+      const totalProfit = parseFloat(report.sales_summary.total_profit);
+      const transactionCount = report.sales_summary.sales_count;
+      const totalSupply = parseFloat(report.supplier_summary.total_supply);
+      const totalReturns = parseFloat(report.supplier_summary.total_returns);
+
+      const salespersonData = report.profit_by_salesperson.map(person => ({
+        name: person.salesperson_name,
+        revenue: parseFloat(person.total_sales),
+        profit: parseFloat(person.total_profit),
+        transactions: person.sales_count,
+        itemsSold: parseFloat(person.total_quantity)
+      }));
+
+      const topProducts = report.profit_by_variety.slice(0, 10).map(product => ({
+        name: product.variety_name,
+        revenue: parseFloat(product.total_sales),
+        profit: parseFloat(product.total_profit),
+        quantity: parseFloat(product.total_quantity)
+      }));
+
+      const dailyData = report.daily
+        .filter(day => day.sales_summary.sales_count > 0)
+        .map(day => ({
+          date: day.date,
+          revenue: parseFloat(day.sales_summary.total_sales_amount),
+          profit: parseFloat(day.sales_summary.total_profit),
+          transactions: day.sales_summary.sales_count
+        }));
 
       setRangeReport({
         summary: {
           totalRevenue,
           totalProfit,
-          totalItemsSold,
-          transactionCount: filteredSales.length,
-          avgTransactionValue: filteredSales.length > 0 ? totalRevenue / filteredSales.length : 0,
+          totalItemsSold: parseFloat(report.sales_summary.total_quantity_sold),
+          transactionCount,
+          avgTransactionValue: transactionCount > 0 ? totalRevenue / transactionCount : 0,
           profitMargin: totalRevenue > 0 ? (totalProfit / totalRevenue) * 100 : 0,
           totalSupply,
           totalReturns,
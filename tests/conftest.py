@@ -0,0 +1,205 @@
+# tests/conftest.py
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+
+# The app reads its settings at import time and imports its modules flat
+# from app/, so both must be in place before anything from it is imported.
+# Empty values win over a developer's .env (load_dotenv does not override).
+_db_path = os.path.join(tempfile.mkdtemp(prefix="cloth-sales-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+os.environ["METRICS_STORE_DIR"] = ""
+os.environ["FORECAST_CACHE_DIR"] = ""
+os.environ["ANALYTICS_POOL_WORKERS"] = "0"
+os.environ["GOOGLE_API_KEY"] = ""
+sys.path.insert(0, APP_DIR)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from main import app
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Test client with the lifespan run, so tables and migrations exist"""
+    from fastapi.testclient import TestClient
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db(client):
+    from database import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def statements():
+    """SQL statements sent by either engine while the test runs"""
+    from sqlalchemy import event
+    from database import engine, async_engine
+
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    yield executed
+    for target in engines:
+        event.remove(target, "before_cursor_execute", record)
+
+
+def add_varieties(db, count: int, prefix: str):
+    """count distinct varieties, so per-row relationship loads cannot share one"""
+    from models import ClothVariety
+    varieties = [ClothVariety(name=f"{prefix} {i}") for i in range(count)]
+    db.add_all(varieties)
+    db.commit()
+    return varieties
+
+
+def add_sales(db, day: date, count: int, prefix: str):
+    from models import Sale
+    for variety in add_varieties(db, count, prefix):
+        db.add(Sale(
+            salesperson_name="Test", variety_id=variety.id, quantity=Decimal("2"),
+            selling_price=Decimal("150"), cost_price=Decimal("100"), profit=Decimal("100"),
+            revenue=Decimal("300"), sale_date=day
+        ))
+    db.commit()
+
+
+def add_supplier_inventory(db, day: date, count: int, prefix: str):
+    from models import SupplierInventory
+    for variety in add_varieties(db, count, prefix):
+        db.add(SupplierInventory(
+            supplier_name="Test Supplier", variety_id=variety.id, quantity=Decimal("10"),
+            price_per_item=Decimal("80"), total_amount=Decimal("800"), supply_date=day
+        ))
+    db.commit()
+
+
+def add_supplier_returns(db, day: date, count: int, prefix: str):
+    from models import SupplierReturn
+    for variety in add_varieties(db, count, prefix):
+        db.add(SupplierReturn(
+            supplier_name="Test Supplier", variety_id=variety.id, quantity=Decimal("1"),
+            price_per_item=Decimal("80"), total_amount=Decimal("80"), return_date=day,
+            reason="Damaged"
+        ))
+    db.commit()
+
+
+def post_sale(client, variety_id: int, day: date, amount: str = "300.00", quantity: float = 2):
+    """Record a sale through the API, so the rollup and caches see it"""
+    response = client.post("/sales/", json={
+        "salesperson_name": "Test", "variety_id": variety_id, "quantity": quantity,
+        "selling_price": amount, "cost_price": "100.00", "sale_date": day.isoformat()
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.fixture
+def use_llm(client, monkeypatch):
+    """Install an LLM stand-in as the shared chat client for one test"""
+    from llm_clients import llm_clients
+
+    def install(llm):
+        monkeypatch.setitem(llm_clients._clients, "chat", llm)
+        return llm
+    return install
+
+
+class ScriptedLLM:
+    """
+    Stand-in for the Gemini client that plays back one scripted reply (a list
+    of AIMessageChunks, see reply_chunks) per call, streamed chunk by chunk or
+    merged for ainvoke. Records each call's messages and bound tool names.
+    """
+
+    def __init__(self, *replies, delay: float = 0.0):
+        self.replies = list(replies)
+        self.delay = delay
+        self.calls = []
+        self.chunks_sent = 0
+        self.stream_closed = False
+
+    def bind_tools(self, tools):
+        return _BoundLLM(self, [tool.name for tool in tools])
+
+    async def ainvoke(self, messages, tools=()):
+        self.calls.append((list(messages), list(tools)))
+        chunks = self.replies.pop(0)
+        await asyncio.sleep(self.delay)
+        reply = chunks[0]
+        for chunk in chunks[1:]:
+            reply = reply + chunk
+        return reply
+
+    async def astream(self, messages, tools=()):
+        self.calls.append((list(messages), list(tools)))
+        try:
+            for chunk in self.replies.pop(0):
+                await asyncio.sleep(self.delay)
+                self.chunks_sent += 1
+                yield chunk
+        finally:
+            self.stream_closed = True
+
+
+class _BoundLLM:
+    def __init__(self, llm: ScriptedLLM, tools):
+        self.llm = llm
+        self.tools = tools
+
+    def ainvoke(self, messages):
+        return self.llm.ainvoke(messages, self.tools)
+
+    def astream(self, messages):
+        return self.llm.astream(messages, self.tools)
+
+
+def reply_chunks(*texts, tool_calls=(), usage=None):
+    """One scripted reply: text chunks, then (name, args) tool calls, then token usage"""
+    from langchain_core.messages import AIMessageChunk
+    chunks = [AIMessageChunk(content=text) for text in texts]
+    for index, (name, args) in enumerate(tool_calls):
+        chunks.append(AIMessageChunk(content="", tool_call_chunks=[
+            {"name": name, "args": json.dumps(args), "id": f"call-{index}", "index": index}
+        ]))
+    if usage is not None:
+        prompt_tokens, completion_tokens = usage
+        chunks.append(AIMessageChunk(content="", usage_metadata={
+            "input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }))
+    return chunks
+
+
+def sse_events(body: str):
+    """(event, data) pairs of a text/event-stream body"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
@@ -0,0 +1,250 @@
+# tests/test_analytics_engine.py
+
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+import analytics_engine
+from analytics_engine import AnalyticsEngine
+
+FUTURE_PERIODS = 30
+
+SERIES = {
+    "constant": np.full(20, 5.0),
+    "zeros": np.zeros(20),
+    "one_point": np.array([4.0]),
+    "two_points": np.array([3.0, 7.0]),
+    "three_points": np.array([3.0, 7.0, 4.0]),
+    "noisy": 100 + 2.5 * np.arange(60) + np.random.default_rng(0).normal(0, 15, 60),
+    "falling": np.maximum(80 - 3.0 * np.arange(40), 0) + np.random.default_rng(1).uniform(0, 5, 40),
+}
+
+
+@pytest.fixture
+def sklearn_backend(monkeypatch):
+    """Make the optional sklearn plug-in callable without ANALYTICS_BACKEND=sklearn"""
+    pytest.importorskip("sklearn")
+    from sklearn.linear_model import LinearRegression
+    from sklearn.preprocessing import PolynomialFeatures
+    from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+    for name, value in (("LinearRegression", LinearRegression),
+                        ("PolynomialFeatures", PolynomialFeatures),
+                        ("r2_score", r2_score),
+                        ("mean_absolute_error", mean_absolute_error),
+                        ("mean_squared_error", mean_squared_error)):
+        monkeypatch.setattr(analytics_engine, name, value, raising=False)
+
+
+# A quadratic through two points has no unique fit (forecasts only use it from 14 points)
+CASES = [(name, False) for name in SERIES] + [(name, True) for name in SERIES if name != "two_points"]
+
+
+@pytest.mark.parametrize("name, use_polynomial", CASES)
+def test_numpy_backend_matches_sklearn(sklearn_backend, name, use_polynomial):
+    y = SERIES[name]
+    x = np.arange(len(y), dtype=float)
+
+    expected = AnalyticsEngine.linear_regression_forecast_sklearn(x, y, FUTURE_PERIODS, use_polynomial)
+    actual = AnalyticsEngine.linear_regression_forecast_numpy(x, y, FUTURE_PERIODS, use_polynomial)
+
+    assert actual["model_type"] == expected["model_type"]
+    for key in ("predictions", "r_squared", "mae", "rmse", "coefficients", "intercept"):
+        if key in expected:
+            assert actual[key] == pytest.approx(expected[key], rel=1e-7, abs=1e-7), key
+
+
+def test_numpy_backend_is_faster_than_sklearn(sklearn_backend):
+    y = SERIES["noisy"]
+    x = np.arange(len(y), dtype=float)
+    calls = 200
+
+    timings = {}
+    for name, fit in (("numpy", AnalyticsEngine.linear_regression_forecast_numpy),
+                      ("sklearn", AnalyticsEngine.linear_regression_forecast_sklearn)):
+        fit(x, y, FUTURE_PERIODS, True)
+        started = time.perf_counter()
+        for _ in range(calls):
+            fit(x, y, FUTURE_PERIODS, True)
+        timings[name] = (time.perf_counter() - started) / calls
+
+    # Import cost in a fresh interpreter: sklearn used to load with the module
+    imports = {}
+    for name, modules in (("numpy", "numpy"),
+                          ("sklearn", "sklearn.linear_model, sklearn.preprocessing, sklearn.metrics")):
+        code = f"import time; t = time.perf_counter(); import {modules}; print(time.perf_counter() - t)"
+        imports[name] = float(subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout)
+
+    for name in timings:
+        print(f"{name:>7}: {timings[name] * 1e6:8.1f} us per quadratic fit, "
+              f"import {imports[name] * 1000:.0f} ms")
+    assert timings["numpy"] < timings["sklearn"]
+
+
+# List-based implementations the vectorized primitives replaced (the
+# no-sklearn paths), kept here as the reference for their outputs
+
+def baseline_moving_average(data, window=7):
+    if len(data) < window:
+        return data
+    result = []
+    for i in range(len(data)):
+        if i < window - 1:
+            result.append(data[i])
+        else:
+            result.append(sum(data[i - window + 1:i + 1]) / window)
+    return result
+
+
+def baseline_exponential_moving_average(data, alpha=0.3):
+    if not data:
+        return []
+    ema = [data[0]]
+    for value in data[1:]:
+        ema.append(alpha * value + (1 - alpha) * ema[-1])
+    return ema
+
+
+def baseline_detect_trend(data):
+    if len(data) < 2:
+        return {"trend": "insufficient_data", "strength": 0, "confidence": 0}
+    x = list(range(len(data)))
+    x_mean = sum(x) / len(x)
+    y_mean = sum(data) / len(data)
+    numerator = sum((x[i] - x_mean) * (data[i] - y_mean) for i in range(len(data)))
+    denominator = sum((x[i] - x_mean) ** 2 for i in range(len(data)))
+    slope = numerator / denominator
+    y_pred = [slope * x[i] + (y_mean - slope * x_mean) for i in range(len(data))]
+    ss_res = sum((data[i] - y_pred[i]) ** 2 for i in range(len(data)))
+    ss_tot = sum((data[i] - y_mean) ** 2 for i in range(len(data)))
+    r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+    threshold = y_mean * 0.01
+    trend = "upward" if slope > threshold else "downward" if slope < -threshold else "stable"
+    strength = min(abs(slope / y_mean) * 100, 100) if y_mean != 0 else 0
+    return {
+        "trend": trend,
+        "strength": round(strength, 2),
+        "slope": round(slope, 2),
+        "confidence": round(r_squared * 100, 2)
+    }
+
+
+def baseline_seasonality(data, period=7):
+    if len(data) < period * 2:
+        return {"has_seasonality": False, "pattern": {}}
+    period_data = {}
+    for item in data:
+        period_data.setdefault(item["date"].weekday(), []).append(item["value"])
+    pattern = {}
+    std_pattern = {}
+    for day, values in period_data.items():
+        pattern[day] = sum(values) / len(values)
+        variance = sum((v - pattern[day]) ** 2 for v in values) / len(values)
+        std_pattern[day] = variance ** 0.5
+    avg = sum(pattern.values()) / len(pattern)
+    variation = sum(abs(v - avg) for v in pattern.values()) / len(pattern)
+    has_seasonality = (variation / avg > 0.1) if avg > 0 else False
+    days_map = {0: "Monday", 1: "Tuesday", 2: "Wednesday", 3: "Thursday",
+                4: "Friday", 5: "Saturday", 6: "Sunday"}
+    return {
+        "has_seasonality": has_seasonality,
+        "pattern": {days_map[k]: round(v, 2) for k, v in pattern.items()},
+        "std_deviation": {days_map[k]: round(v, 2) for k, v in std_pattern.items()},
+        "best_day": days_map[max(pattern, key=lambda k: pattern[k])],
+        "worst_day": days_map[min(pattern, key=lambda k: pattern[k])]
+    }
+
+
+PRIMITIVE_SERIES = {
+    "empty": [],
+    "one_point": [4.0],
+    "short": [3.0, 7.0, 4.0],
+    "constant": [5.0] * 20,
+    "zeros": [0.0] * 20,
+    "integers": [float(v) for v in np.random.default_rng(2).integers(0, 50, 45)],
+    "noisy": (100 + 2.5 * np.arange(60) + np.random.default_rng(0).normal(0, 15, 60)).tolist(),
+    "falling": [80.0 - 3 * i for i in range(25)],
+}
+
+
+@pytest.mark.parametrize("name", PRIMITIVE_SERIES)
+def test_moving_averages_match_the_list_versions(name):
+    data = PRIMITIVE_SERIES[name]
+    # cumsum and per-window sums may differ in the last bit for non-integer data
+    assert AnalyticsEngine.calculate_moving_average(data) == pytest.approx(
+        baseline_moving_average(data), rel=1e-12, abs=1e-12
+    )
+    assert AnalyticsEngine.exponential_moving_average(data) == baseline_exponential_moving_average(data)
+
+
+@pytest.mark.parametrize("name", [name for name, data in PRIMITIVE_SERIES.items() if data])
+def test_detect_trend_matches_the_list_version(name):
+    data = PRIMITIVE_SERIES[name]
+    assert AnalyticsEngine.detect_trend(data) == pytest.approx(baseline_detect_trend(data))
+
+
+def test_nearly_constant_series_has_no_trend():
+    # mean([0.1] * 10) is not exactly 0.1; the rounding noise is not a trend
+    assert AnalyticsEngine.detect_trend([0.1] * 10) == {
+        "trend": "stable", "strength": 0, "slope": 0.0, "confidence": 0
+    }
+
+
+def test_batches_match_row_by_row_results():
+    rows = [PRIMITIVE_SERIES[name][:20] for name in ("constant", "zeros", "integers", "noisy", "falling")]
+    batch = np.array(rows)
+
+    assert AnalyticsEngine.moving_average_batch(batch) == pytest.approx(
+        np.array([baseline_moving_average(row) for row in rows]), rel=1e-12, abs=1e-12
+    )
+    assert AnalyticsEngine.exponential_moving_average_batch(batch).tolist() == [
+        baseline_exponential_moving_average(row) for row in rows
+    ]
+    assert AnalyticsEngine.detect_trend_batch(batch) == [
+        pytest.approx(baseline_detect_trend(row)) for row in rows
+    ]
+
+
+def _dated(values, weekdays_used=range(7)):
+    """{"date", "value"} items on consecutive days that fall on weekdays_used"""
+    from datetime import date, timedelta
+    days = (date(2024, 1, 1) + timedelta(days=offset) for offset in range(10 * len(values)))
+    days = [day for day in days if day.weekday() in weekdays_used][:len(values)]
+    return [{"date": day, "value": value} for day, value in zip(days, values)]
+
+
+SEASONALITY_CASES = {
+    "short": _dated([10.0] * 13),
+    "constant": _dated([10.0] * 28),
+    "weekend_peak": _dated([30.0 if i % 7 in (5, 6) else 10.0 + i % 3 for i in range(35)]),
+    "empty_buckets": _dated([float(v) for v in np.random.default_rng(3).integers(5, 40, 18)], (0, 2, 4)),
+    "zeros": _dated([0.0] * 21),
+}
+
+
+@pytest.mark.parametrize("name", SEASONALITY_CASES)
+def test_seasonality_matches_the_list_version(name):
+    data = SEASONALITY_CASES[name]
+    assert AnalyticsEngine.calculate_seasonality(data) == baseline_seasonality(data)
+
+
+def test_weekday_profile_batch_matches_per_series_seasonality():
+    rows = [SEASONALITY_CASES[name] for name in ("constant", "weekend_peak")]
+    length = min(len(row) for row in rows)
+    values = np.array([[item["value"] for item in row[:length]] for row in rows])
+    weekdays = np.array([item["date"].weekday() for item in rows[0][:length]])
+
+    profile = AnalyticsEngine.weekday_profile_batch(values, weekdays)
+    for row, data in enumerate(rows):
+        expected = baseline_seasonality(data[:length])
+        assert bool(profile["has_seasonality"][row]) == expected["has_seasonality"]
+        means = {
+            day: round(float(profile["mean"][row][number]), 2)
+            for number, day in enumerate(["Monday", "Tuesday", "Wednesday", "Thursday",
+                                          "Friday", "Saturday", "Sunday"])
+        }
+        assert means == expected["pattern"]
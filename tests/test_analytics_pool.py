@@ -0,0 +1,77 @@
+# tests/test_analytics_pool.py
+
+import asyncio
+import time
+from datetime import date
+
+import httpx
+import numpy as np
+
+from conftest import add_varieties
+
+FORECASTS = 2
+FORECAST_SECONDS = 2.0
+SALES = 40
+
+
+def burn(seconds: float) -> int:
+    """Pure-Python CPU work that holds the GIL for `seconds`, like a model fit"""
+    deadline = time.perf_counter() + seconds
+    steps = 0
+    while time.perf_counter() < deadline:
+        steps += 1
+    return steps
+
+
+def _sale_latencies(app, pool, variety_id: int, day: date):
+    """Latencies of POST /sales/ sent while FORECASTS burn jobs run through pool"""
+    sale = {
+        "salesperson_name": "Test", "variety_id": variety_id, "quantity": 1,
+        "selling_price": "150.00", "cost_price": "100.00", "sale_date": day.isoformat()
+    }
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            # Spawned workers take a moment to come up; do not time that
+            await pool.run_async(burn, 0)
+            forecasts = [
+                asyncio.create_task(pool.run_async(burn, FORECAST_SECONDS)) for _ in range(FORECASTS)
+            ]
+            await asyncio.sleep(0.1)
+
+            # Only time sales sent while the forecasts are still running
+            latencies = []
+            while len(latencies) < SALES and not all(forecast.done() for forecast in forecasts):
+                started = time.perf_counter()
+                response = await http.post("/sales/", json=sale)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 201
+
+            await asyncio.gather(*forecasts)
+            assert len(latencies) >= 10, "forecasts ended before enough sales were timed"
+            return latencies
+
+    return asyncio.run(scenario())
+
+
+def test_pooled_forecasts_do_not_stall_sales_entry(app, client, db):
+    from analytics_pool import AnalyticsPool
+
+    variety = add_varieties(db, 1, "pool-latency")[0]
+    results = {}
+    for name, workers in (("inline", 0), ("pool", FORECASTS)):
+        pool = AnalyticsPool(workers=workers, max_pending=FORECASTS * 2, timeout=30)
+        pool.start()
+        try:
+            latencies = _sale_latencies(app, pool, variety.id, date(2013, 6, 1))
+        finally:
+            pool.shutdown()
+        results[name] = float(np.percentile(latencies, 99))
+
+    for name, p99 in results.items():
+        print(f"{name:>6}: p99 POST /sales/ latency {p99 * 1000:.1f} ms "
+              f"with {FORECASTS} forecasts running")
+
+    # Forecasts in worker processes leave the GIL to the server process
+    assert results["pool"] < FORECAST_SECONDS / 4
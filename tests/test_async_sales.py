@@ -0,0 +1,66 @@
+# tests/test_async_sales.py
+
+import asyncio
+import time
+from datetime import date
+
+import anyio
+import anyio.to_thread
+import httpx
+import pytest
+
+from conftest import add_sales, add_supplier_inventory
+
+# Sync routes run on Starlette's threadpool; HOLD_SECONDS of blocking work on
+# every one of its THREADS stands in for chat/forecast calls at the evening rush
+THREADS = 2
+HOLD_SECONDS = 1.0
+REQUESTS = 20
+
+
+def test_missing_async_engine_fails_at_startup(monkeypatch):
+    import database
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+    monkeypatch.setattr(database, "ASYNC_ENGINE_ERROR", "no driver")
+    with pytest.raises(RuntimeError, match="no driver"):
+        database.require_async_engine()
+
+
+async def _timed_burst(http, path: str):
+    """Send REQUESTS concurrent GETs; returns (seconds, requests per second)"""
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(http.get(path) for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - started
+    assert all(response.status_code == 200 for response in responses)
+    return elapsed, REQUESTS / elapsed
+
+
+def test_async_routes_keep_serving_while_the_threadpool_is_busy(app, client, db):
+    day = date(2012, 5, 1)
+    add_sales(db, day, 5, "bench-async")
+    add_supplier_inventory(db, day, 5, "bench-sync")
+    async_path = f"/sales/?start={day}&end={day}"
+    sync_path = f"/supplier/inventory?start={day}&end={day}"
+
+    async def scenario():
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADS
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            results = {}
+            for name, path in (("async", async_path), ("sync", sync_path)):
+                async with anyio.create_task_group() as busy:
+                    for _ in range(THREADS):
+                        busy.start_soon(anyio.to_thread.run_sync, time.sleep, HOLD_SECONDS)
+                    await asyncio.sleep(0.05)
+                    results[name] = await _timed_burst(http, path)
+            return results
+
+    results = asyncio.run(scenario())
+    for name, (elapsed, throughput) in results.items():
+        print(f"{name:>5}: {REQUESTS} requests in {elapsed:.3f}s ({throughput:.1f} req/s)")
+
+    async_elapsed, _ = results["async"]
+    sync_elapsed, _ = results["sync"]
+    # Sync requests wait for a free thread; async ones do not need one
+    assert sync_elapsed >= HOLD_SECONDS * 0.8
+    assert async_elapsed < HOLD_SECONDS / 2
@@ -0,0 +1,67 @@
+# tests/test_chatbot_concurrency.py
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+# The chat path builds LangChain message objects around the (fake) model
+pytest.importorskip("langchain.messages")
+
+
+class SlowLLM:
+    """Stand-in for the Gemini client whose replies take `delay` seconds"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.started = asyncio.Event()
+
+    async def ainvoke(self, messages):
+        self.started.set()
+        await asyncio.sleep(self.delay)
+        return type("Reply", (), {"content": "slow answer", "usage_metadata": None, "tool_calls": []})()
+
+    def invoke(self, messages):
+        raise AssertionError("the chat path must not call the blocking invoke()")
+
+
+@pytest.fixture
+def slow_llm(client, monkeypatch):
+    from llm_clients import llm_clients
+    llm = SlowLLM(delay=1.0)
+    monkeypatch.setitem(llm_clients._clients, "chat", llm)
+    return llm
+
+
+def test_slow_llm_does_not_block_other_requests(app, slow_llm):
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            chat = asyncio.create_task(
+                http.post("/chatbot/chat", json={"message": "How are sales?", "use_tools": False})
+            )
+            await asyncio.wait_for(slow_llm.started.wait(), 5)
+
+            started = time.perf_counter()
+            health = await http.get("/health")
+            elapsed = time.perf_counter() - started
+
+            assert health.status_code == 200
+            assert not chat.done(), "chat finished before the other request was served"
+            assert elapsed < slow_llm.delay / 2
+            return await chat
+
+    reply = asyncio.run(scenario())
+    assert reply.status_code == 200
+    assert reply.json()["response"] == "slow answer"
+
+
+def test_llm_call_times_out(client, slow_llm, monkeypatch):
+    import chatbot_engine
+    monkeypatch.setattr(chatbot_engine, "LLM_TIMEOUT", 0.1)
+
+    response = client.post("/chatbot/chat", json={"message": "How are sales?", "use_tools": False})
+    assert response.status_code == 200
+    assert response.json()["error"] == "timeout"
+    assert response.json()["success"] is False
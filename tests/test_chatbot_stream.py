@@ -0,0 +1,76 @@
+# tests/test_chatbot_stream.py
+
+import asyncio
+
+import pytest
+
+from conftest import ScriptedLLM, reply_chunks, sse_events
+
+# The chat path builds LangChain message objects around the (fake) model
+pytest.importorskip("langchain.messages")
+
+CHUNK_DELAY = 0.05
+
+
+def test_stream_sends_tokens_then_one_done_event(client, use_llm):
+    use_llm(ScriptedLLM(reply_chunks("Sales ", "are ", "up.", usage=(120, 8)), delay=CHUNK_DELAY))
+
+    response = client.post("/chatbot/chat/stream", json={"message": "How are sales?", "use_tools": False})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = sse_events(response.text)
+    assert [event for event, _ in events] == ["token", "token", "token", "done"]
+    assert "".join(data["text"] for event, data in events if event == "token") == "Sales are up."
+
+    done = events[-1][1]
+    assert done["success"] is True and done["error"] is None
+    # The first token waits for one chunk, the whole reply for all four
+    assert CHUNK_DELAY * 1000 <= done["time_to_first_token_ms"] < done["total_ms"]
+    assert done["total_ms"] >= 4 * CHUNK_DELAY * 1000
+    assert (done["usage"]["prompt_tokens"], done["usage"]["completion_tokens"]) == (120, 8)
+    print(f"time to first token {done['time_to_first_token_ms']} ms, "
+          f"whole reply {done['total_ms']} ms")
+
+
+def test_stream_stops_pulling_from_the_llm_when_the_client_disconnects(client, use_llm, db):
+    from routes.chatbot import ChatRequest, chat_stream
+
+    llm = use_llm(ScriptedLLM(reply_chunks(*[f"word{i} " for i in range(50)])))
+
+    class DisconnectingRequest:
+        """Reports the client gone after two events were sent"""
+
+        def __init__(self):
+            self.checks = 0
+
+        async def is_disconnected(self):
+            self.checks += 1
+            return self.checks > 2
+
+    async def scenario():
+        request = ChatRequest(message="How are sales?", use_tools=False)
+        response = await chat_stream(request, DisconnectingRequest(), db)
+        return [chunk async for chunk in response.body_iterator]
+
+    body = asyncio.run(scenario())
+
+    assert len(body) == 2
+    assert all(chunk.startswith("event: token") for chunk in body)
+    assert llm.stream_closed
+    assert llm.chunks_sent == 3
+
+
+def test_stalled_stream_ends_with_a_timeout_event(client, use_llm, monkeypatch):
+    import chatbot_engine
+    monkeypatch.setattr(chatbot_engine, "LLM_TIMEOUT", 0.1)
+    llm = use_llm(ScriptedLLM(reply_chunks("never sent"), delay=1.0))
+
+    response = client.post("/chatbot/chat/stream", json={"message": "How are sales?", "use_tools": False})
+
+    events = sse_events(response.text)
+    assert [event for event, _ in events] == ["done"]
+    assert events[0][1]["success"] is False
+    assert events[0][1]["error"] == "timeout"
+    assert events[0][1]["time_to_first_token_ms"] is None
+    assert llm.stream_closed
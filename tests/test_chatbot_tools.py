@@ -0,0 +1,116 @@
+# tests/test_chatbot_tools.py
+
+import json
+from datetime import date
+
+import pytest
+
+from conftest import ScriptedLLM, add_varieties, post_sale, reply_chunks, sse_events
+
+# The chat path builds LangChain message objects around the (fake) model
+pytest.importorskip("langchain.messages")
+
+TOOL_ROUND = (("get_top_products", {"limit": 3, "days": 7}),)
+
+
+@pytest.fixture
+def best_seller(client, db):
+    """A variety that sold today, so the top-products tool has data"""
+    variety = add_varieties(db, 1, "chat-tools")[0]
+    post_sale(client, variety.id, date.today(), "9000000.00")
+    return variety.name
+
+
+def _tool_results(messages):
+    return [message for message in messages if type(message).__name__ == "ToolMessage"]
+
+
+def test_chat_answers_with_the_result_of_a_tool_call(client, use_llm, best_seller):
+    llm = use_llm(ScriptedLLM(
+        reply_chunks(tool_calls=TOOL_ROUND, usage=(300, 10)),
+        reply_chunks(f"Your best seller is {best_seller}.", usage=(380, 12)),
+    ))
+
+    response = client.post("/chatbot/chat", json={"message": "Top products?", "use_tools": True}).json()
+
+    assert response["success"] is True
+    assert response["response"] == f"Your best seller is {best_seller}."
+    usage = response["usage"]
+    assert usage["mode"] == "tools"
+    assert usage["tool_calls"] == ["get_top_products"]
+    assert usage["llm_calls"] == 2
+    assert (usage["prompt_tokens"], usage["completion_tokens"]) == (680, 22)
+
+    first_messages, first_tools = llm.calls[0]
+    assert "get_top_products" in first_tools
+    assert not _tool_results(first_messages)
+    second_messages, _ = llm.calls[1]
+    [result] = _tool_results(second_messages)
+    assert result.tool_call_id == "call-0"
+    assert best_seller in [product["name"] for product in json.loads(result.content)]
+
+
+def test_stream_reports_the_tool_call_before_the_answer(client, use_llm, best_seller):
+    llm = use_llm(ScriptedLLM(
+        reply_chunks(tool_calls=TOOL_ROUND),
+        reply_chunks("Your best seller is ", best_seller, "."),
+    ))
+
+    response = client.post("/chatbot/chat/stream", json={"message": "Top products?", "use_tools": True})
+
+    events = sse_events(response.text)
+    assert [event for event, _ in events] == ["tool", "token", "token", "token", "done"]
+    assert events[0][1] == {"name": "get_top_products"}
+    assert events[-1][1]["usage"]["tool_calls"] == ["get_top_products"]
+    assert len(_tool_results(llm.calls[1][0])) == 1
+
+
+def test_unknown_tool_is_reported_back_to_the_model(client, use_llm):
+    llm = use_llm(ScriptedLLM(
+        reply_chunks(tool_calls=(("drop_tables", {}),)),
+        reply_chunks("I can't do that."),
+    ))
+
+    response = client.post("/chatbot/chat", json={"message": "Delete everything", "use_tools": True}).json()
+
+    assert response["success"] is True
+    [result] = _tool_results(llm.calls[1][0])
+    assert json.loads(result.content) == {"error": "Unknown tool 'drop_tables'"}
+
+
+def test_the_last_round_must_answer_without_tools(client, use_llm, monkeypatch):
+    import chatbot_engine
+    monkeypatch.setattr(chatbot_engine, "MAX_TOOL_ROUNDS", 1)
+    llm = use_llm(ScriptedLLM(reply_chunks(tool_calls=TOOL_ROUND), reply_chunks("Done.")))
+
+    client.post("/chatbot/chat", json={"message": "Top products?", "use_tools": True})
+
+    assert [tools != [] for _, tools in llm.calls] == [True, False]
+
+
+def test_use_tools_false_sends_the_business_context_instead(client, use_llm):
+    llm = use_llm(ScriptedLLM(reply_chunks("Business is steady.")))
+
+    response = client.post("/chatbot/chat", json={"message": "How is business?", "use_tools": False}).json()
+
+    assert response["response"] == "Business is steady."
+    assert response["usage"]["mode"] == "context"
+    assert response["usage"]["tool_calls"] == []
+    [(messages, tools)] = llm.calls
+    assert tools == []
+    assert "DATA ACCESS" not in messages[0].content
+
+
+def test_tool_mode_sends_a_smaller_prompt(client, use_llm, best_seller):
+    llm = use_llm(ScriptedLLM(reply_chunks("a"), reply_chunks("b")))
+
+    prompt_chars = {}
+    for use_tools in (False, True):
+        client.post("/chatbot/chat", json={"message": "How is business?", "use_tools": use_tools})
+        messages, _ = llm.calls[-1]
+        prompt_chars["tools" if use_tools else "context"] = sum(len(message.content) for message in messages)
+
+    # Roughly four characters per token for English text
+    for mode, chars in prompt_chars.items():
+        print(f"{mode:>7}: {chars} prompt characters (~{chars // 4} tokens) before any tool call")
+    assert prompt_chars["tools"] < prompt_chars["context"]
@@ -0,0 +1,44 @@
+# tests/test_etags.py
+
+from datetime import date
+
+import pytest
+
+from conftest import add_varieties, post_sale
+
+ROUTES = ["/reports/daily/{day}", "/sales/date/{day}", "/sales/daily-summary/{day}"]
+
+
+@pytest.mark.parametrize("case, route", enumerate(ROUTES))
+def test_matching_etag_skips_the_route_body(client, db, statements, case, route):
+    day = date(2015, 1, 1 + case)
+    variety = add_varieties(db, 1, f"etag-skip-{case}")[0]
+    post_sale(client, variety.id, day)
+    path = route.format(day=day.isoformat())
+
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    statements.clear()
+    again = client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.content == b""
+    # Only the change counters were read, none of the report's tables
+    assert statements and all("table_versions" in statement for statement in statements), statements
+
+
+@pytest.mark.parametrize("case, route", enumerate(ROUTES))
+def test_a_write_to_a_tracked_table_changes_the_etag(client, db, case, route):
+    day = date(2015, 2, 1 + case)
+    variety = add_varieties(db, 1, f"etag-write-{case}")[0]
+    post_sale(client, variety.id, day)
+    path = route.format(day=day.isoformat())
+
+    etag = client.get(path).headers["ETag"]
+    post_sale(client, variety.id, day)
+
+    after = client.get(path, headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
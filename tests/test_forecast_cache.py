@@ -0,0 +1,88 @@
+# tests/test_forecast_cache.py
+
+import asyncio
+
+import numpy as np
+
+from forecast_cache import ForecastCache, series_fingerprint
+
+
+class Counter:
+    """compute() stand-in that records how often it ran"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"forecast": [1.5, 2.5], "call": self.calls}
+
+
+def test_fingerprint_follows_the_series_and_options():
+    series = np.arange(10, dtype=float)
+    key = series_fingerprint("demo", series, 30)
+
+    assert key == series_fingerprint("demo", series.copy(), 30)
+    assert key != series_fingerprint("demo", series + 1, 30)
+    assert key != series_fingerprint("demo", series, 60)
+    assert key != series_fingerprint("demo", series.astype(np.float32), 30)
+
+
+def test_repeat_lookup_is_a_hit_and_returns_a_copy():
+    cache = ForecastCache(max_entries=4)
+    compute = Counter()
+
+    first = cache.get_or_compute("key", compute)
+    first["forecast"].append(99)
+    second = cache.get_or_compute("key", compute)
+
+    assert compute.calls == 1
+    assert second == {"forecast": [1.5, 2.5], "call": 1}
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_async_lookup_shares_entries_with_the_sync_one():
+    cache = ForecastCache(max_entries=4)
+    compute = Counter()
+
+    async def compute_async():
+        return compute()
+
+    cache.get_or_compute("key", compute)
+    assert asyncio.run(cache.get_or_compute_async("key", compute_async))["call"] == 1
+    assert compute.calls == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ForecastCache(max_entries=2)
+    compute = Counter()
+    cache.get_or_compute("a", compute)
+    cache.get_or_compute("b", compute)
+    cache.get_or_compute("a", compute)
+    cache.get_or_compute("c", compute)
+
+    assert cache.stats()["evictions"] == 1
+    cache.get_or_compute("a", compute)
+    assert compute.calls == 3
+    cache.get_or_compute("b", compute)
+    assert compute.calls == 4
+
+
+def test_results_survive_a_restart_on_disk(tmp_path):
+    compute = Counter()
+    ForecastCache(max_entries=4, directory=str(tmp_path)).get_or_compute("key", compute)
+    assert (tmp_path / "key.json").exists()
+
+    restarted = ForecastCache(max_entries=4, directory=str(tmp_path))
+    assert restarted.get_or_compute("key", compute) == {"forecast": [1.5, 2.5], "call": 1}
+    assert compute.calls == 1
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_unreadable_disk_entry_is_recomputed(tmp_path):
+    (tmp_path / "key.json").write_text("{not json")
+    compute = Counter()
+
+    cache = ForecastCache(max_entries=4, directory=str(tmp_path))
+    assert cache.get_or_compute("key", compute)["call"] == 1
+    assert compute.calls == 1
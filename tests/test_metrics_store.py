@@ -0,0 +1,102 @@
+# tests/test_metrics_store.py
+
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from conftest import add_varieties, post_sale
+
+# Variety ids no test creates, for deltas written straight to the store
+FAKE_VARIETY = 900001
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A store in tmp_path that the sales and variety routes write to, as with METRICS_STORE_DIR=tmp_path"""
+    from metrics_store import MetricsStore
+    store = MetricsStore(str(tmp_path))
+    for module in ("routes.sales", "routes.varieties"):
+        monkeypatch.setattr(f"{module}.metrics_store", store)
+    return store
+
+
+def _covered(store):
+    status = store.status()
+    epoch = date.fromisoformat(status["epoch"])
+    return epoch, epoch + timedelta(days=status["days"] - 1)
+
+
+def test_apply_adds_deltas_that_read_returns(store, db):
+    store.rebuild(db)
+    day = date.today() - timedelta(days=3)
+
+    store.apply([(day, FAKE_VARIETY, 10.0, 4.0, 2.0, 1.0), (day, FAKE_VARIETY, 5.0, 1.0, 1.0, 1.0)])
+
+    keys, arrays = store.read(day - timedelta(days=1), day, [FAKE_VARIETY])
+    assert keys == [FAKE_VARIETY]
+    assert arrays["revenue"].tolist() == [[0.0, 15.0]]
+    assert arrays["profit"].tolist() == [[0.0, 5.0]]
+    assert arrays["quantity"].tolist() == [[0.0, 3.0]]
+    assert arrays["sales_count"].tolist() == [[0.0, 2.0]]
+
+
+def test_store_grows_past_its_days_and_variety_capacity(store, db, tmp_path):
+    from metrics_store import DAY_BLOCK, VARIETY_BLOCK
+
+    store.rebuild(db)
+    epoch, covered_end = _covered(store)
+    before = store.status()
+    day = epoch + timedelta(days=1)
+    store.apply([(day, FAKE_VARIETY, 7.0, 3.0, 1.0, 1.0)])
+    varieties, snapshot = store.read(epoch, covered_end)
+
+    older, later = epoch - timedelta(days=400), covered_end + timedelta(days=5)
+    new_varieties = [FAKE_VARIETY + 1 + i for i in range(VARIETY_BLOCK)]
+    store.apply(
+        [(older, FAKE_VARIETY, 1.0, 1.0, 1.0, 1.0), (later, FAKE_VARIETY, 2.0, 1.0, 1.0, 1.0)]
+        + [(day, variety_id, 1.0, 1.0, 1.0, 1.0) for variety_id in new_varieties]
+    )
+
+    after = store.status()
+    new_epoch, new_end = _covered(store)
+    assert after["generation"] > before["generation"]
+    assert (epoch - new_epoch).days % DAY_BLOCK == 0 and new_epoch <= older
+    assert new_end >= later
+    assert after["variety_capacity"] > before["variety_capacity"]
+
+    # Data written before the copy is still where it was
+    _, copied = store.read(epoch, covered_end, varieties)
+    for measure, values in snapshot.items():
+        assert np.array_equal(copied[measure], values), measure
+
+    _, grown = store.read(older, later, [FAKE_VARIETY])
+    revenue = grown["revenue"][0]
+    assert revenue[0] == 1.0 and revenue[-1] == 2.0 and revenue[(day - older).days] == 7.0
+
+    # Only the current generation's files are left
+    generations = {name.split(".")[1] for name in os.listdir(tmp_path) if name.endswith(".f8")}
+    assert generations == {str(after["generation"])}
+
+
+def test_verify_follows_route_writes_and_ensure_built_repairs_drift(store, client, db):
+    store.rebuild(db)
+    assert store.verify(db)["ok"]
+
+    day = date(2017, 4, 1)
+    kept, deleted = add_varieties(db, 2, "metrics-store")
+    post_sale(client, kept.id, day, "300.00")
+    post_sale(client, deleted.id, day, "500.00")
+    assert store.verify(db)["ok"]
+
+    assert client.delete(f"/varieties/{deleted.id}").status_code == 204
+    assert store.verify(db)["ok"]
+
+    # A lost or stray delta is caught, and repaired at the next start
+    store.apply([(day, kept.id, 100.0, 0.0, 0.0, 0.0)])
+    report = store.verify(db)
+    assert not report["ok"] and report["mismatches"]["revenue"] == 1
+
+    store.ensure_built(db)
+    assert store.verify(db)["ok"]
@@ -0,0 +1,72 @@
+# tests/test_predictions.py
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from conftest import add_varieties
+
+
+def _quantities(days: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.round(5 + 0.2 * np.arange(days) + rng.uniform(0, 3, days))
+
+
+@pytest.mark.parametrize("history_days", [8, 13, 14, 30])
+def test_demand_batch_matches_the_single_series_forecast(history_days):
+    from analytics_engine import AnalyticsEngine
+
+    days_ahead = 30
+    total_days = 40
+    rows = np.zeros((3, total_days))
+    starts = np.array([total_days - history_days, 0, total_days - history_days], dtype=np.intp)
+    for row, start in enumerate(starts):
+        rows[row, start:] = _quantities(total_days - start, seed=row)
+
+    batch = AnalyticsEngine.demand_forecast_batch(rows, days_ahead, starts)
+
+    for row, start in enumerate(starts):
+        single = AnalyticsEngine._fit_series_forecast(rows[row, start:], None, days_ahead, True)
+        expected = [point["predicted_revenue"] for point in single["forecast"]]
+        assert batch["predictions"][row] == pytest.approx(expected, abs=0.006)
+        assert round(float(batch["r_squared"][row]), 3) == pytest.approx(single["r_squared"], abs=0.001)
+
+
+def test_short_history_is_fitted_with_a_line():
+    from analytics_engine import AnalyticsEngine, POLYNOMIAL_MIN_POINTS
+
+    # Accelerating sales over a few days: a quadratic would extrapolate steeply
+    quantities = np.array([[1, 1, 2, 3, 5, 8, 13, 21, 34, 55]], dtype=float)
+    assert quantities.shape[1] < POLYNOMIAL_MIN_POINTS
+
+    predictions = AnalyticsEngine.demand_forecast_batch(quantities, 90)["predictions"][0]
+    steps = np.diff(predictions)
+    assert steps == pytest.approx(np.full_like(steps, steps[0]))
+
+
+def test_single_product_demand_matches_the_all_products_entry(client, db):
+    today = date.today()
+    histories = {"long": 60, "short": 10, "none": 3}
+    varieties = dict(zip(histories, add_varieties(db, len(histories), "demand-parity")))
+
+    sales = []
+    for seed, (name, days) in enumerate(histories.items()):
+        for offset, quantity in enumerate(_quantities(days, seed)):
+            sales.append({
+                "salesperson_name": "Test", "variety_id": varieties[name].id,
+                "quantity": float(quantity), "selling_price": "500.00", "cost_price": "100.00",
+                "sale_date": (today - timedelta(days=days - offset)).isoformat()
+            })
+    response = client.post("/sales/bulk", json={"sales": sales})
+    assert response.json()["failed_count"] == 0
+
+    everything = client.get("/predictions/product-demand?days_ahead=30").json()
+    by_id = {product["variety_id"]: product for product in everything["products"]}
+
+    for name, variety in varieties.items():
+        single = client.get(f"/predictions/product-demand/{variety.id}?days_ahead=30").json()
+        assert single == by_id[variety.id], name
+
+    assert by_id[varieties["none"].id]["forecast"] == []
+    assert len(by_id[varieties["short"].id]["forecast"]) == 30
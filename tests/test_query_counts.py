@@ -0,0 +1,35 @@
+# tests/test_query_counts.py
+
+from datetime import date
+
+import pytest
+
+from conftest import add_sales, add_supplier_inventory, add_supplier_returns
+
+# (route, seed function); each case gets its own dates so cases do not see each other's rows
+ROUTES = [
+    ("/sales/?start={day}&end={day}", add_sales),
+    ("/sales/date/{day}", add_sales),
+    ("/supplier/inventory?start={day}&end={day}", add_supplier_inventory),
+    ("/supplier/inventory/date/{day}", add_supplier_inventory),
+    ("/supplier/returns?start={day}&end={day}", add_supplier_returns),
+    ("/supplier/returns/date/{day}", add_supplier_returns),
+]
+
+
+@pytest.mark.parametrize("case, route, seed", [(i, *route) for i, route in enumerate(ROUTES)])
+def test_list_routes_use_a_fixed_number_of_queries(client, db, statements, case, route, seed):
+    counts = {}
+    for rows, day in ((2, date(2001 + case, 1, 1)), (25, date(2001 + case, 1, 2))):
+        seed(db, day, rows, f"qc{case}-{rows}")
+        path = route.format(day=day.isoformat())
+        # Warm up first: a fresh pool connection may run setup statements
+        client.get(path)
+
+        statements.clear()
+        response = client.get(path)
+        assert response.status_code == 200
+        assert len(response.json()) == rows
+        counts[rows] = len(statements)
+
+    assert counts[2] == counts[25], f"{route} issued {counts} statements for 2 vs 25 rows"
@@ -0,0 +1,80 @@
+# tests/test_query_plans.py
+
+from datetime import date, timedelta
+
+from sqlalchemy import func, inspect
+
+# Hot queries mirror routes/reports.py, routes/sales.py and daily_series.py,
+# whose queries the prediction routes go through
+DAY = date(2024, 3, 15)
+
+
+def query_plan(db, query) -> str:
+    """SQLite EXPLAIN QUERY PLAN details for an ORM query, one step per line"""
+    compiled = query.statement.compile(
+        dialect=db.bind.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = tuple(
+        value.isoformat() if isinstance(value, date) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_report_rollup_range_uses_primary_key(db):
+    from models import DailySalesRollup
+    plan = query_plan(db, db.query(
+        DailySalesRollup.sale_date,
+        func.sum(DailySalesRollup.total_revenue)
+    ).filter(
+        DailySalesRollup.sale_date >= DAY - timedelta(days=90),
+        DailySalesRollup.sale_date <= DAY
+    ).group_by(DailySalesRollup.sale_date))
+    assert "SEARCH daily_sales_rollup USING INDEX sqlite_autoindex_daily_sales_rollup_1" in plan, plan
+
+
+def test_per_variety_series_uses_variety_date_index(db):
+    from models import DailySalesRollup
+    plan = query_plan(db, db.query(
+        DailySalesRollup.sale_date,
+        func.sum(DailySalesRollup.total_quantity)
+    ).filter(
+        DailySalesRollup.sale_date >= DAY - timedelta(days=90),
+        DailySalesRollup.sale_date <= DAY,
+        DailySalesRollup.variety_id.in_([7])
+    ).group_by(DailySalesRollup.sale_date, DailySalesRollup.variety_id))
+    assert "ix_daily_sales_rollup_variety_id_sale_date" in plan, plan
+
+
+def test_daily_report_supplier_queries_use_date_indexes(db):
+    from models import SupplierInventory, SupplierReturn
+    for model, column in (
+        (SupplierInventory, SupplierInventory.supply_date),
+        (SupplierReturn, SupplierReturn.return_date),
+    ):
+        plan = query_plan(db, db.query(func.sum(model.total_amount)).filter(column == DAY))
+        assert f"SEARCH {model.__tablename__} USING INDEX" in plan, plan
+
+
+def test_sales_by_date_and_paged_list_use_sale_date_index(db):
+    from models import Sale
+    by_date = query_plan(db, db.query(Sale).filter(Sale.sale_date == DAY))
+    assert "ix_sales_sale_date" in by_date, by_date
+
+    # Keyset pages order by (sale_date, id); the index already yields that order
+    page = query_plan(db, db.query(Sale).filter(
+        Sale.sale_date >= DAY - timedelta(days=30), Sale.sale_date <= DAY
+    ).order_by(Sale.sale_date, Sale.id).limit(501))
+    assert "ix_sales_sale_date" in page, page
+    assert "TEMP B-TREE" not in page, page
+
+
+def test_superseded_sales_composite_indexes_are_dropped(db):
+    names = {index["name"] for index in inspect(db.bind).get_indexes("sales")}
+    assert "ix_sales_variety_id" in names
+    assert not names & {
+        "ix_sales_sale_date_variety_id",
+        "ix_sales_salesperson_name_sale_date",
+        "ix_sales_sale_date_revenue_profit",
+    }
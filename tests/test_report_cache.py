@@ -0,0 +1,74 @@
+# tests/test_report_cache.py
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import report_cache as report_cache_module
+from conftest import add_varieties, post_sale
+from report_cache import ReportCache, RECENT_SALES, _MISSING, date_tags, report_cache
+
+
+def test_invalidate_drops_only_entries_with_the_tag():
+    cache = ReportCache(max_entries=10, ttl_seconds=60)
+    day, other_day = date(2016, 1, 1), date(2016, 2, 1)
+    cache.set("day", 1, date_tags(day))
+    cache.set("other day", 2, date_tags(other_day))
+    cache.set("forecast", 3, [RECENT_SALES])
+
+    cache.invalidate(("month", 2016, 1))
+
+    assert cache.get("day") is _MISSING
+    assert cache.get("other day") == 2
+    assert cache.get("forecast") == 3
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ReportCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is _MISSING
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(report_cache_module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    cache = ReportCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", 1)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is _MISSING
+
+
+def _cached_daily_reports(day: date):
+    return [key for key in report_cache._entries
+            if key[0] == "reports.daily" and key[1] == (("report_date", day),)]
+
+
+def test_a_sale_drops_cached_reports_for_its_date_only(client, db):
+    day, other_day = date(2016, 3, 1), date(2016, 3, 2)
+    variety = add_varieties(db, 1, "report-cache")[0]
+    post_sale(client, variety.id, day, "300.00")
+    post_sale(client, variety.id, other_day, "300.00")
+
+    for report_date in (day, other_day):
+        client.get(f"/reports/daily/{report_date}")
+    hits = report_cache.hits
+    client.get(f"/reports/daily/{day}")
+    assert report_cache.hits == hits + 1
+    assert _cached_daily_reports(day) and _cached_daily_reports(other_day)
+
+    post_sale(client, variety.id, day, "200.00")
+
+    assert not _cached_daily_reports(day)
+    assert _cached_daily_reports(other_day)
+    summary = client.get(f"/reports/daily/{day}").json()["sales_summary"]
+    assert Decimal(summary["total_sales_amount"]) == Decimal("500")
@@ -0,0 +1,20 @@
+# tests/test_reports.py
+
+from datetime import date
+
+from conftest import add_supplier_inventory, add_supplier_returns, add_varieties, post_sale
+
+
+def test_range_report_days_match_the_daily_report(client, db):
+    first, second = date(2014, 2, 3), date(2014, 2, 4)
+    add_supplier_inventory(db, first, 3, "range-supply")
+    add_supplier_returns(db, first, 1, "range-returns")
+    variety = add_varieties(db, 1, "range-sales")[0]
+    post_sale(client, variety.id, first, "300.00")
+    post_sale(client, variety.id, second, "450.00")
+
+    report = client.get(f"/reports/range?start={first}&end={second}").json()
+
+    assert [day["date"] for day in report["daily"]] == [first.isoformat(), second.isoformat()]
+    for day in report["daily"]:
+        assert day == client.get(f"/reports/daily/{day['date']}").json()
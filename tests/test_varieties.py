@@ -0,0 +1,29 @@
+# tests/test_varieties.py
+
+from datetime import date
+from decimal import Decimal
+
+from conftest import add_varieties, post_sale
+
+
+def test_deleting_a_variety_removes_its_sales_from_the_daily_report(client, db):
+    day = date(2011, 3, 1)
+    kept, deleted = add_varieties(db, 2, "delete-variety")
+    post_sale(client, kept.id, day, "300.00")
+    post_sale(client, deleted.id, day, "500.00")
+
+    before = client.get(f"/reports/daily/{day}").json()["sales_summary"]
+    assert Decimal(before["total_sales_amount"]) == Decimal("800")
+    assert before["sales_count"] == 2
+
+    assert client.delete(f"/varieties/{deleted.id}").status_code == 204
+
+    after = client.get(f"/reports/daily/{day}").json()["sales_summary"]
+    assert Decimal(after["total_sales_amount"]) == Decimal("300")
+    assert after["sales_count"] == 1
+
+    from models import DailySalesRollup
+    db.expire_all()
+    assert db.query(DailySalesRollup).filter(
+        DailySalesRollup.variety_id == deleted.id
+    ).count() == 0